@@ -2,7 +2,13 @@
 Lab 6 Task 1: Thread-Safe Counter
 Fix the race condition in BrokenCounter using three different approaches.
 """
+import multiprocessing
+import os
+import sys
 import threading
+import time
+import weakref
+from multiprocessing import shared_memory
 
 class BrokenCounter:
     """This counter has a race condition - DO NOT MODIFY."""
@@ -17,19 +23,264 @@ class BrokenCounter:
         return self.count
 
 
-class FixedCounterLock:
+class CounterBatch:
+    """
+    Buffers counter updates in the calling thread and applies them in bulk.
+
+    Obtained from a counter's batch() method. Updates accumulate in a plain
+    local total and are handed to the counter with a single add() call,
+    either every flush_every operations or when the batch is closed, so a
+    hot loop pays one lock acquisition per flush instead of one per event.
+
+    A batch belongs to the thread that created it and must not be shared.
+    Pending updates are always flushed on exit, even if the block raises.
+
+    Example:
+        with counter.batch(flush_every=500) as b:
+            for _ in events:
+                b.increment()
+    """
+
+    def __init__(self, counter, flush_every=1000):
+        """
+        Initialize a batch for a counter.
+
+        Args:
+            counter: Counter exposing add(n)
+            flush_every (int): Flush after this many buffered operations
+                (None = only flush on exit)
+        """
+        self._counter = counter
+        self._flush_every = flush_every
+        self._pending = 0
+        self._ops = 0
+
+    def increment(self):
+        """Buffer an increment by 1."""
+        self.add(1)
+
+    def decrement(self):
+        """Buffer a decrement by 1."""
+        self.add(-1)
+
+    def add(self, n):
+        """
+        Buffer an update of n.
+
+        Args:
+            n (int): Amount to add (may be negative)
+        """
+        self._pending += n
+        self._ops += 1
+        if self._flush_every is not None and self._ops >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        """Apply all buffered updates to the counter."""
+        if self._pending:
+            self._counter.add(self._pending)
+        self._pending = 0
+        self._ops = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+
+class InstrumentedLock:
+    """
+    Wraps a Lock or RLock and records how it is used.
+
+    Counters only swap this in when created with instrumented=True, so the
+    default code path keeps using a bare lock with no extra overhead.
+
+    Every statistic is updated while the wrapped lock is held, so the
+    bookkeeping needs no lock of its own. For an RLock only the outermost
+    acquire/release pair of each thread is counted as one operation.
+
+    Recorded statistics:
+    - acquisitions: number of (outermost) acquisitions
+    - contended: acquisitions that could not get the lock immediately
+    - wait_time / max_wait_time: seconds spent blocked in acquire()
+    - hold_time / max_hold_time: seconds between acquire and release
+    - per_thread_ops: acquisitions keyed by thread name
+    """
+
+    def __init__(self, lock=None):
+        """
+        Initialize the instrumented lock.
+
+        Args:
+            lock: Lock or RLock to wrap (default: a new threading.Lock)
+        """
+        self._lock = lock if lock is not None else threading.Lock()
+        self._local = threading.local()
+        self._acquisitions = 0
+        self._contended = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._hold_time = 0.0
+        self._max_hold_time = 0.0
+        self._per_thread_ops = {}
+
+    def acquire(self):
+        """Acquire the wrapped lock, recording wait time and contention."""
+        if self._lock.acquire(blocking=False):
+            contended = False
+            waited = 0.0
+        else:
+            start = time.perf_counter()
+            self._lock.acquire()
+            contended = True
+            waited = time.perf_counter() - start
+
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth:
+            return True
+
+        self._acquisitions += 1
+        if contended:
+            self._contended += 1
+            self._wait_time += waited
+            if waited > self._max_wait_time:
+                self._max_wait_time = waited
+        name = threading.current_thread().name
+        self._per_thread_ops[name] = self._per_thread_ops.get(name, 0) + 1
+        self._local.hold_start = time.perf_counter()
+        return True
+
+    def release(self):
+        """Release the wrapped lock, recording how long it was held."""
+        self._local.depth -= 1
+        if not self._local.depth:
+            held = time.perf_counter() - self._local.hold_start
+            self._hold_time += held
+            if held > self._max_hold_time:
+                self._max_hold_time = held
+        self._lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def stats(self):
+        """
+        Return a snapshot of the recorded statistics.
+
+        Returns:
+            dict: Statistics described in the class docstring, plus
+            contention_rate (contended / acquisitions)
+        """
+        with self._lock:
+            acquisitions = self._acquisitions
+            return {
+                "acquisitions": acquisitions,
+                "contended": self._contended,
+                "contention_rate": self._contended / acquisitions if acquisitions else 0.0,
+                "wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+                "hold_time": self._hold_time,
+                "max_hold_time": self._max_hold_time,
+                "per_thread_ops": dict(self._per_thread_ops),
+            }
+
+
+def _make_lock(lock, instrumented):
+    """Return lock itself, or an InstrumentedLock around it if requested."""
+    return InstrumentedLock(lock) if instrumented else lock
+
+
+class _CounterMixin:
+    """Bulk-update and statistics helpers shared by the task1 counters."""
+
+    def stats(self):
+        """
+        Return lock-contention statistics for this counter.
+
+        Returns:
+            dict: InstrumentedLock.stats() if the counter was created with
+            instrumented=True, otherwise an empty dict
+        """
+        lock = getattr(self, "_lock", None)
+        if isinstance(lock, InstrumentedLock):
+            return lock.stats()
+        return {}
+
+    def add_many(self, deltas):
+        """
+        Apply an iterable of updates as a single add().
+
+        Args:
+            deltas: Iterable of ints to add (may be negative)
+        """
+        total = sum(deltas)
+        if total:
+            self.add(total)
+
+    def batch(self, flush_every=1000):
+        """
+        Return a CounterBatch that buffers updates for this counter.
+
+        Args:
+            flush_every (int): Flush after this many buffered operations
+                (None = only flush on exit)
+
+        Returns:
+            CounterBatch: Context manager that flushes on exit
+        """
+        return CounterBatch(self, flush_every)
+
+
+class FixedCounterLock(_CounterMixin):
     """Fix using threading.Lock."""
-    # YOUR CODE HERE
-    pass
 
+    def __init__(self, instrumented=False):
+        self.count = 0
+        self._lock = _make_lock(threading.Lock(), instrumented)
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+    def add(self, n):
+        """Atomically add n (may be negative) under one lock acquisition."""
+        with self._lock:
+            self.count += n
+
+    def get_value(self):
+        with self._lock:
+            return self.count
 
-class FixedCounterRLock:
+
+class FixedCounterRLock(_CounterMixin):
     """Fix using threading.RLock (reentrant lock)."""
-    # YOUR CODE HERE
-    pass
 
+    def __init__(self, instrumented=False):
+        self.count = 0
+        self._lock = _make_lock(threading.RLock(), instrumented)
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
 
-class ThreadSafeCounter:
+    def add(self, n):
+        """Atomically add n (may be negative) under one lock acquisition."""
+        with self._lock:
+            self.count += n
+
+    def get_value(self):
+        with self._lock:
+            return self.count
+
+
+class ThreadSafeCounter(_CounterMixin):
     """
     A thread-safe counter that supports increment, decrement, and value retrieval.
 
@@ -38,20 +289,22 @@ class ThreadSafeCounter:
     concurrently without race conditions or data loss.
 
     Thread Safety Guarantees:
-    - All operations (increment, decrement, get_value) are atomic
+    - All operations (increment, decrement, add, get_value) are atomic
     - No lost updates from concurrent modifications
     - Consistent snapshots of counter state when reading
     """
 
-    def __init__(self, initial=0):
+    def __init__(self, initial=0, instrumented=False):
         """
         Initialize the counter with an optional starting value.
 
         Args:
             initial (int): The starting value for the counter (default: 0)
+            instrumented (bool): Record lock-contention statistics, exposed
+                via stats() (default: False)
         """
-        # TODO: Implement initialization with lock
-        raise NotImplementedError("Students should implement __init__")
+        self._value = initial
+        self._lock = _make_lock(threading.Lock(), instrumented)
 
     def increment(self):
         """
@@ -60,8 +313,8 @@ class ThreadSafeCounter:
         Thread-safe: This operation is protected and will not interfere with
         concurrent increments or decrements from other threads.
         """
-        # TODO: Implement thread-safe increment
-        raise NotImplementedError("Students should implement increment()")
+        with self._lock:
+            self._value += 1
 
     def decrement(self):
         """
@@ -70,8 +323,21 @@ class ThreadSafeCounter:
         Thread-safe: This operation is protected and will not interfere with
         concurrent increments or decrements from other threads.
         """
-        # TODO: Implement thread-safe decrement
-        raise NotImplementedError("Students should implement decrement()")
+        with self._lock:
+            self._value -= 1
+
+    def add(self, n):
+        """
+        Atomically add n to the counter.
+
+        Thread-safe: the whole update happens under a single lock
+        acquisition, regardless of the size of n.
+
+        Args:
+            n (int): Amount to add (may be negative)
+        """
+        with self._lock:
+            self._value += n
 
     def get_value(self):
         """
@@ -82,8 +348,364 @@ class ThreadSafeCounter:
         Returns:
             int: The current value of the counter
         """
-        # TODO: Implement thread-safe value retrieval
-        raise NotImplementedError("Students should implement get_value()")
+        with self._lock:
+            return self._value
+
+
+class ShardedCounter(_CounterMixin):
+    """
+    A counter that keeps one partial count per thread and sums them on read.
+
+    Each thread gets its own cell the first time it touches the counter, so
+    increment() and decrement() never contend on a shared lock: only the
+    owning thread ever writes to a cell. The registry lock is taken once per
+    thread (on first use) and by get_value(). Cells of threads that have
+    exited are folded into a base value so short-lived threads don't grow
+    the registry without bound.
+
+    Consistency Guarantees:
+    - No lost updates: every increment/decrement is eventually reflected
+    - get_value() is exact once writers have finished (e.g. after join())
+    - While writers are running, get_value() returns a value that includes
+      every update completed before the call started and possibly some
+      made during it; it is not a point-in-time snapshot across threads
+    """
+
+    def __init__(self, initial=0):
+        """
+        Initialize the counter with an optional starting value.
+
+        Args:
+            initial (int): The starting value for the counter (default: 0)
+        """
+        self._base = initial
+        self._cells = []  # list of (thread, [partial_count]) pairs
+        self._registry_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _cell(self):
+        """Return the calling thread's cell, registering it on first use."""
+        try:
+            return self._local.cell
+        except AttributeError:
+            pass
+        cell = [0]
+        with self._registry_lock:
+            live = []
+            for thread, other in self._cells:
+                if thread.is_alive():
+                    live.append((thread, other))
+                else:
+                    # A dead thread can no longer write to its cell.
+                    self._base += other[0]
+            live.append((threading.current_thread(), cell))
+            self._cells = live
+        self._local.cell = cell
+        return cell
+
+    def increment(self):
+        """
+        Increment the counter by 1.
+
+        Thread-safe: only the calling thread writes to its own cell.
+        """
+        self._cell()[0] += 1
+
+    def decrement(self):
+        """
+        Decrement the counter by 1.
+
+        Thread-safe: only the calling thread writes to its own cell.
+        """
+        self._cell()[0] -= 1
+
+    def add(self, n):
+        """
+        Add n to the counter.
+
+        Thread-safe: only the calling thread writes to its own cell.
+
+        Args:
+            n (int): Amount to add (may be negative)
+        """
+        self._cell()[0] += n
+
+    def get_value(self):
+        """
+        Get the current value of the counter by summing every cell.
+
+        See the class docstring for the consistency guarantee.
+
+        Returns:
+            int: The current value of the counter
+        """
+        with self._registry_lock:
+            return self._base + sum(cell[0] for _, cell in self._cells)
+
+
+class CounterRegistry:
+    """
+    A set of counters keyed by label, e.g. status code or (host, event_type).
+
+    Looking up an existing key is a plain dict read with no registry lock;
+    the lock is only taken the first time a key is seen, to create its
+    counter exactly once. Each counter then handles its own updates, so
+    threads counting different keys don't contend with each other.
+
+    Snapshots read every counter individually (they are not a point-in-time
+    view across keys). With reset=True each counter is reset by subtracting
+    the value that was read, so updates racing with the snapshot are kept
+    for the next one rather than lost.
+
+    Example:
+        statuses = CounterRegistry()
+        statuses.increment(200)
+        statuses.add(("GET", 404), 3)
+        statuses.snapshot(reset=True)  # {200: 1, ('GET', 404): 3}
+    """
+
+    def __init__(self, counter_class=ThreadSafeCounter):
+        """
+        Initialize an empty registry.
+
+        Args:
+            counter_class: Counter class created for each new key; must
+                provide add(n) and get_value() (default: ThreadSafeCounter)
+        """
+        self._counter_class = counter_class
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def counter(self, key):
+        """
+        Return the counter for key, creating it on first use.
+
+        Args:
+            key: Any hashable label
+
+        Returns:
+            The counter instance for key
+        """
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.get(key)
+                if counter is None:
+                    counter = self._counter_class()
+                    self._counters[key] = counter
+        return counter
+
+    def increment(self, key):
+        """Increment the counter for key by 1."""
+        self.counter(key).add(1)
+
+    def decrement(self, key):
+        """Decrement the counter for key by 1."""
+        self.counter(key).add(-1)
+
+    def add(self, key, n):
+        """
+        Add n to the counter for key.
+
+        Args:
+            key: Any hashable label
+            n (int): Amount to add (may be negative)
+        """
+        self.counter(key).add(n)
+
+    def get_value(self, key):
+        """
+        Get the current value for key.
+
+        Returns:
+            int: The counter's value, or 0 if key has never been used
+        """
+        counter = self._counters.get(key)
+        return counter.get_value() if counter is not None else 0
+
+    def snapshot(self, reset=False):
+        """
+        Read every counter.
+
+        Args:
+            reset (bool): Subtract each value that was read from its counter,
+                so the next snapshot only reports new updates (default: False)
+
+        Returns:
+            dict: Mapping of key -> value
+        """
+        with self._lock:
+            items = list(self._counters.items())
+        values = {}
+        for key, counter in items:
+            value = counter.get_value()
+            if reset and value:
+                counter.add(-value)
+            values[key] = value
+        return values
+
+    def keys(self):
+        """Return a list of the keys seen so far."""
+        with self._lock:
+            return list(self._counters)
+
+    def __contains__(self, key):
+        return key in self._counters
+
+    def __len__(self):
+        return len(self._counters)
+
+
+class SharedMemoryCounter(_CounterMixin):
+    """
+    A counter shared between processes, backed by multiprocessing.shared_memory.
+
+    The shared block is an int64 array laid out as
+    [slots_in_use, initial, slot_0, slot_1, ...]. Each process claims its own
+    slot the first time it updates the counter and from then on only writes
+    to that slot, guarded by an ordinary in-process Lock for its own threads;
+    no other process ever touches it, so updates never cross a process
+    boundary. get_value() sums the slots in use, with the same consistency
+    guarantee as ShardedCounter.
+
+    The counter reaches worker processes by inheritance: pass it through a
+    Process's args or a pool's initializer/initargs (or rely on fork). The
+    process that created it owns the block and should close() it when done;
+    it is also released when the owning object is garbage collected.
+
+    Example:
+        counter = SharedMemoryCounter()
+        with ProcessPoolExecutor(initializer=_set_counter, initargs=(counter,)) as pool:
+            ...
+        print(counter.get_value())
+        counter.close()
+    """
+
+    _HEADER = 2  # slots_in_use, initial
+
+    def __init__(self, initial=0, num_slots=64, mp_context=None):
+        """
+        Create the shared block.
+
+        Args:
+            initial (int): The starting value for the counter (default: 0)
+            num_slots (int): Maximum number of distinct processes that may
+                update the counter (default: 64)
+            mp_context: multiprocessing context the worker processes are
+                started with (default: the default context)
+        """
+        if mp_context is None:
+            mp_context = multiprocessing.get_context()
+        shm = shared_memory.SharedMemory(create=True, size=8 * (self._HEADER + num_slots))
+        self._register_lock = mp_context.Lock()
+        self._setup(shm, num_slots, owner=True)
+        self._values[0] = 0
+        self._values[1] = initial
+        for i in range(self._HEADER, self._HEADER + num_slots):
+            self._values[i] = 0
+
+    def _setup(self, shm, num_slots, owner):
+        self._shm = shm
+        self._num_slots = num_slots
+        self._values = shm.buf.cast("q")
+        self._pid = None
+        self._slot = None
+        self._slot_lock = None
+        self._finalizer = weakref.finalize(
+            self, _release_shared_memory, shm, self._values, owner)
+
+    def __getstate__(self):
+        return {
+            "name": self._shm.name,
+            "num_slots": self._num_slots,
+            "register_lock": self._register_lock,
+        }
+
+    def __setstate__(self, state):
+        self._register_lock = state["register_lock"]
+        try:
+            # Python 3.13+: don't let an attaching process's resource
+            # tracker unlink a block it doesn't own.
+            shm = shared_memory.SharedMemory(name=state["name"], track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=state["name"])
+        self._setup(shm, state["num_slots"], owner=False)
+
+    @property
+    def name(self):
+        """Name of the underlying shared memory block."""
+        return self._shm.name
+
+    def _claim_slot(self):
+        """Return this process's slot index, claiming one on first use."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return self._slot
+        with self._register_lock:
+            if self._pid != pid:  # another thread of this process may have won
+                used = self._values[0]
+                if used >= self._num_slots:
+                    raise RuntimeError(
+                        f"SharedMemoryCounter has no free slots ({self._num_slots} "
+                        "processes already registered); increase num_slots")
+                self._values[0] = used + 1
+                self._slot = self._HEADER + used
+                self._slot_lock = threading.Lock()
+                self._pid = pid
+        return self._slot
+
+    def increment(self):
+        """Increment the counter by 1 in this process's slot."""
+        self.add(1)
+
+    def decrement(self):
+        """Decrement the counter by 1 in this process's slot."""
+        self.add(-1)
+
+    def add(self, n):
+        """
+        Add n to the counter in this process's slot.
+
+        Args:
+            n (int): Amount to add (may be negative)
+        """
+        slot = self._claim_slot()
+        with self._slot_lock:
+            self._values[slot] += n
+
+    def get_value(self):
+        """
+        Get the current value of the counter by summing every process's slot.
+
+        Returns:
+            int: The current value of the counter
+        """
+        values = self._values
+        used = values[0]
+        return values[1] + sum(values[self._HEADER:self._HEADER + used])
+
+    def close(self):
+        """
+        Detach from the shared block, unlinking it if this is the owner.
+
+        The counter must not be used after close().
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _release_shared_memory(shm, values, owner):
+    """Release a SharedMemoryCounter's view and block (finalizer target)."""
+    values.release()
+    shm.close()
+    if owner:
+        shm.unlink()
 
 
 def test_counter(counter_class, name, num_threads=10, increments_per_thread=1000):
@@ -110,8 +732,154 @@ def test_counter(counter_class, name, num_threads=10, increments_per_thread=1000
     return actual == expected
 
 
+
+# Implementations swept by run_counter_benchmarks(); add new counters here.
+COUNTER_IMPLEMENTATIONS = {
+    "BrokenCounter": BrokenCounter,
+    "FixedCounterLock": FixedCounterLock,
+    "FixedCounterRLock": FixedCounterRLock,
+    "ThreadSafeCounter": ThreadSafeCounter,
+    "ShardedCounter": ShardedCounter,
+    "SharedMemoryCounter": SharedMemoryCounter,
+}
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0 for empty)."""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def benchmark_counter(counter_class, num_threads=10, increments_per_thread=1000,
+                      latency_sample_every=1):
+    """
+    Measure throughput, per-op latency and correctness of one counter class.
+
+    All threads wait on a barrier so they start hammering the counter at the
+    same time; throughput is measured from the barrier release to the last
+    join.
+
+    Args:
+        counter_class: Counter class to instantiate with no arguments
+        num_threads (int): Number of concurrent incrementing threads
+        increments_per_thread (int): increment() calls made by each thread
+        latency_sample_every (int): Time every Nth call for the latency
+            percentiles (1 = time every call)
+
+    Returns:
+        dict: Result with keys 'implementation', 'threads', 'iterations',
+        'total_ops', 'elapsed_seconds', 'ops_per_sec', 'p50_latency_us',
+        'p99_latency_us', 'expected', 'actual' and 'correct'
+    """
+    counter = counter_class()
+    barrier = threading.Barrier(num_threads + 1)
+    samples = [None] * num_threads
+
+    def worker(index):
+        increment = counter.increment
+        clock = time.perf_counter_ns
+        latencies = []
+        barrier.wait()
+        for i in range(increments_per_thread):
+            if i % latency_sample_every:
+                increment()
+            else:
+                start = clock()
+                increment()
+                latencies.append(clock() - start)
+        samples[index] = latencies
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ns for per_thread in samples for ns in per_thread)
+    total_ops = num_threads * increments_per_thread
+    actual = counter.get_value()
+    return {
+        "implementation": counter_class.__name__,
+        "threads": num_threads,
+        "iterations": increments_per_thread,
+        "total_ops": total_ops,
+        "elapsed_seconds": elapsed,
+        "ops_per_sec": total_ops / elapsed if elapsed > 0 else float("inf"),
+        "p50_latency_us": _percentile(latencies, 50) / 1000,
+        "p99_latency_us": _percentile(latencies, 99) / 1000,
+        "expected": total_ops,
+        "actual": actual,
+        "correct": actual == total_ops,
+    }
+
+
+def run_counter_benchmarks(implementations=None, thread_counts=(1, 2, 4, 8, 16, 32, 64),
+                           iterations=(1000,), latency_sample_every=1):
+    """
+    Sweep counter implementations over thread counts and iteration counts.
+
+    Args:
+        implementations: Mapping of name -> counter class
+            (default: COUNTER_IMPLEMENTATIONS)
+        thread_counts: Thread counts to try
+        iterations: increments_per_thread values to try
+        latency_sample_every (int): Passed through to benchmark_counter()
+
+    Returns:
+        list: One benchmark_counter() result dict per combination, ready to
+        be serialized with json.dump()
+    """
+    if implementations is None:
+        implementations = COUNTER_IMPLEMENTATIONS
+    results = []
+    for name, counter_class in implementations.items():
+        for iters in iterations:
+            for num_threads in thread_counts:
+                result = benchmark_counter(counter_class, num_threads, iters,
+                                           latency_sample_every)
+                result["implementation"] = name
+                results.append(result)
+    return results
+
+
+def _parse_int_list(text):
+    return [int(part) for part in text.split(",") if part]
+
+
 if __name__ == "__main__":
-    print("Testing thread safety:\n")
-    test_counter(BrokenCounter, "BrokenCounter (expect FAIL)")
-    test_counter(FixedCounterLock, "FixedCounterLock")
-    test_counter(FixedCounterRLock, "FixedCounterRLock")
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Benchmark task1 counters under contention.")
+    parser.add_argument("--threads", type=_parse_int_list, default=[1, 2, 4, 8, 16, 32, 64],
+                        help="comma-separated thread counts (default: 1,2,4,8,16,32,64)")
+    parser.add_argument("--iterations", type=_parse_int_list, default=[1000],
+                        help="comma-separated increments per thread (default: 1000)")
+    parser.add_argument("--counters", default=",".join(COUNTER_IMPLEMENTATIONS),
+                        help="comma-separated implementation names")
+    parser.add_argument("--sample-every", type=int, default=1,
+                        help="time every Nth increment for latency percentiles")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+
+    selected = {name: COUNTER_IMPLEMENTATIONS[name] for name in args.counters.split(",") if name}
+    results = run_counter_benchmarks(selected, args.threads, args.iterations, args.sample_every)
+
+    print(f"{'implementation':<20}{'threads':>8}{'iters':>8}{'ops/sec':>14}"
+          f"{'p50 us':>10}{'p99 us':>10}  correct")
+    for r in results:
+        print(f"{r['implementation']:<20}{r['threads']:>8}{r['iterations']:>8}"
+              f"{r['ops_per_sec']:>14,.0f}{r['p50_latency_us']:>10.2f}"
+              f"{r['p99_latency_us']:>10.2f}  {'PASS' if r['correct'] else 'FAIL'}")
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -17,14 +17,1575 @@ Your implementation will be tested with multiple URLs and must complete efficien
 """
 
 import asyncio
+import functools
+import hashlib
+import json
+import math
+import os
+import queue
+import random
+import re
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import weakref
 import aiohttp
 import requests
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-from typing import List, Dict
-from urllib.parse import urlparse
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+from collections import OrderedDict, deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from contextlib import asynccontextmanager, contextmanager
+import dataclasses
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Dict, FrozenSet, Iterable,
+                    List, Optional, Tuple, Union)
+from urllib.parse import urlparse, urlsplit, urlunsplit
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
 
-def fetch_sequential(urls: List[str]) -> List[Dict]:
+# Connection-pool defaults for pooled fetch modes.
+DEFAULT_POOL_CONNECTIONS = 10  # distinct hosts to keep a pool for
+DEFAULT_POOL_MAXSIZE = 10  # keep-alive connections per host
+
+
+def make_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    resolver: Optional["DNSCache"] = None,
+) -> requests.Session:
+    """
+    Create a requests.Session with a tuned connection pool.
+
+    Reusing one session keeps TCP (and TLS) connections open between
+    requests to the same host, avoiding a handshake per URL.
+
+    Args:
+        pool_connections: Number of distinct hosts to keep pools for
+        pool_maxsize: Maximum keep-alive connections kept per host
+        keep_alive: If False, ask servers to close after each response
+        resolver: Optional DNSCache used to look up host names when opening
+            connections
+
+    Returns:
+        A configured requests.Session (close it when done)
+    """
+    session = requests.Session()
+    if resolver is not None:
+        adapter = _ResolvingAdapter(resolver, pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize)
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# Seconds a DNSCache keeps an answer (getaddrinfo() does not report the TTL).
+DEFAULT_DNS_TTL = 300.0
+
+
+class DNSCache:
+    """
+    Thread-safe cache of getaddrinfo() answers with a fixed TTL.
+
+    One cache can be shared by the threaded fetchers (through make_session(),
+    where each new connection looks its host up here) and the async fetchers
+    (through an aiohttp resolver), so a host is resolved once per TTL for the
+    whole batch instead of once per connection. Concurrent misses for the
+    same host wait for a single lookup instead of all querying the system
+    resolver. Failed lookups are not cached.
+
+    Args:
+        ttl: Seconds an answer stays valid
+        max_entries: Most (host, port, family) answers kept; the least
+            recently used are evicted beyond that
+
+    Example:
+        resolver = DNSCache(ttl=60)
+        resolver.warm_up(urls)
+        results = fetch_threaded(urls, max_workers=20, pooled=True, resolver=resolver)
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[float, List[tuple]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._lookups: Dict[Tuple[str, int, int], threading.Lock] = {}
+
+    def __getstate__(self):
+        return {"ttl": self.ttl, "max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["ttl"], state["max_entries"])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def resolve(self, host: str, port: int = 0, family: int = socket.AF_UNSPEC) -> List[tuple]:
+        """
+        Look up host like socket.getaddrinfo(host, port, family, SOCK_STREAM).
+
+        Returns:
+            List of (family, type, proto, canonname, sockaddr) tuples
+
+        Raises:
+            socket.gaierror: If the host can't be resolved
+        """
+        key = (host.lower(), port, family)
+        infos = self._get(key)
+        if infos is not None:
+            return infos
+        return self._lookup(key, host, port, family)
+
+    async def resolve_async(self, host: str, port: int = 0,
+                            family: int = socket.AF_UNSPEC) -> List[tuple]:
+        """resolve() without blocking the event loop on a miss."""
+        key = (host.lower(), port, family)
+        infos = self._get(key)
+        if infos is not None:
+            return infos
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._lookup, key, host, port, family)
+
+    def _lookup(self, key: Tuple[str, int, int], host: str, port: int, family: int) -> List[tuple]:
+        """Resolve a missed key, letting only one thread query per key at a time."""
+        with self._lock:
+            lookup = self._lookups.setdefault(key, threading.Lock())
+        try:
+            with lookup:
+                infos = self._get(key, count=False)
+                if infos is not None:
+                    return infos
+                infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + self.ttl, infos)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return infos
+        finally:
+            with self._lock:
+                if self._lookups.get(key) is lookup and not lookup.locked():
+                    del self._lookups[key]
+
+    def addresses(self, host: str, port: int = 0, family: int = socket.AF_UNSPEC) -> List[str]:
+        """Distinct IP addresses for host, in resolver order."""
+        return list(dict.fromkeys(info[4][0] for info in self.resolve(host, port, family)))
+
+    def warm_up(self, urls: Iterable[str], max_workers: int = 16) -> Dict[str, Optional[str]]:
+        """
+        Resolve the distinct hosts of `urls` concurrently ahead of fetching.
+
+        Returns:
+            Dictionary mapping each host to None, or to an error message if
+            it could not be resolved
+        """
+        targets = {}
+        for url in urls:
+            parsed = urlparse(url)
+            if parsed.hostname:
+                port = parsed.port or (443 if parsed.scheme == "https" else 80)
+                targets.setdefault(parsed.hostname, port)
+        if not targets:
+            return {}
+
+        def resolve(item: Tuple[str, int]) -> Optional[str]:
+            try:
+                self.resolve(*item)
+            except OSError as exc:
+                return f"{type(exc).__name__}: {exc}"
+            return None
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+            return dict(zip(targets, executor.map(resolve, targets.items())))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Dictionary with 'entries', 'hits' and 'misses'."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: Tuple[str, int, int], count: bool = True) -> Optional[List[tuple]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if count:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+
+class _ResolvingConnectionMixin:
+    """urllib3 connection that looks its host up through a DNSCache."""
+
+    resolver: DNSCache
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.resolver.addresses(host, self.port)
+        except socket.gaierror as exc:
+            raise NewConnectionError(self, f"Failed to resolve {host!r}: {exc}") from exc
+        error = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as exc:
+                error = exc  # try the next address
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class _ResolvingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools resolve hosts through a DNSCache."""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["resolver"]
+
+    def __init__(self, resolver: DNSCache, **kwargs):
+        self.resolver = resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"resolver": self.resolver}
+        http = type("ResolvingHTTPConnection", (_ResolvingConnectionMixin, HTTPConnection), attrs)
+        https = type("ResolvingHTTPSConnection", (_ResolvingConnectionMixin, HTTPSConnection),
+                     attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("ResolvingHTTPConnectionPool", (HTTPConnectionPool,),
+                         {"ConnectionCls": http}),
+            "https": type("ResolvingHTTPSConnectionPool", (HTTPSConnectionPool,),
+                          {"ConnectionCls": https}),
+        }
+
+
+class _AiohttpResolver(AbstractResolver):
+    """aiohttp resolver backed by a DNSCache."""
+
+    def __init__(self, cache: DNSCache):
+        self.cache = cache
+
+    async def resolve(self, host: str, port: int = 0,
+                      family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        infos = await self.cache.resolve_async(host, port, family)
+        return [
+            {"hostname": host, "host": address[0], "port": address[1], "family": info_family,
+             "proto": proto, "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV}
+            for info_family, _, proto, _, address in infos
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
+def _tcp_connector(resolver: Optional[DNSCache] = None, **kwargs) -> aiohttp.TCPConnector:
+    """TCPConnector that resolves through `resolver` (aiohttp's own cache is off)."""
+    if resolver is not None:
+        kwargs.update(resolver=_AiohttpResolver(resolver), use_dns_cache=False)
+    return aiohttp.TCPConnector(**kwargs)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Each
+    request takes one token; when the bucket is empty the caller is told how
+    long to wait for its token instead of spinning, which lets the same
+    bucket serve threads (time.sleep) and coroutines (asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly borrowing against future refills.
+
+        Returns:
+            Seconds the caller must wait before using its token (0 if none)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_reserve(self) -> float:
+        """
+        Take a token only if one is available now.
+
+        Returns:
+            0 if a token was taken, else seconds until one will be
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a token is available."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class HostLimiter:
+    """
+    Per-host rate limits and concurrency caps shared by the fetch strategies.
+
+    Policies are dicts with optional keys:
+        - 'rate': Requests per second (token bucket refill rate)
+        - 'burst': Requests allowed back-to-back before 'rate' applies
+        - 'max_concurrency': Requests to the host in flight at once
+
+    A host uses the policy of its most specific entry in `per_host`
+    ('api.example.com' is matched by 'api.example.com', then 'example.com'),
+    falling back to `default`. Every host gets its own bucket and cap, so a
+    slow or strict host never throttles the others.
+
+    Rate limits are shared by every caller. Concurrency caps are enforced
+    separately for threads and for each asyncio event loop, since a
+    coroutine cannot block on a thread semaphore.
+
+    Example:
+        limiter = HostLimiter(
+            default={'rate': 20, 'max_concurrency': 8},
+            per_host={'api.example.com': {'rate': 2, 'burst': 1}},
+        )
+        results = fetch_threaded(urls, max_workers=50, limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        default: Optional[Dict[str, Any]] = None,
+        per_host: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            default: Policy for hosts without a per_host entry (None = no limits)
+            per_host: Mapping of host or parent domain -> policy
+        """
+        self.default = default or {}
+        self.per_host = {host.lower(): policy for host, policy in (per_host or {}).items()}
+        self._hosts: Dict[str, "_HostState"] = {}
+        self._lock = threading.Lock()
+
+    def scaled(self, factor: float) -> "HostLimiter":
+        """
+        Return a new limiter whose rates, bursts and caps are multiplied by factor.
+
+        Used to split one limiter's budget between N independent processes
+        (factor = 1 / N). Caps and bursts never drop below 1.
+
+        Args:
+            factor: Multiplier applied to every policy
+        """
+        def scale(policy: Dict[str, Any]) -> Dict[str, Any]:
+            scaled = dict(policy)
+            if policy.get("rate"):
+                scaled["rate"] = policy["rate"] * factor
+            for key in ("burst", "max_concurrency"):
+                if policy.get(key):
+                    scaled[key] = max(1, int(policy[key] * factor))
+            return scaled
+
+        return HostLimiter(scale(self.default),
+                           {host: scale(policy) for host, policy in self.per_host.items()})
+
+    def policy(self, host: str) -> Dict[str, Any]:
+        """
+        Return the policy that applies to host.
+
+        Args:
+            host: Hostname (e.g. 'api.example.com')
+        """
+        labels = host.lower().split(".")
+        for i in range(len(labels)):
+            policy = self.per_host.get(".".join(labels[i:]))
+            if policy is not None:
+                return policy
+        return self.default
+
+    def _state(self, url: str) -> "_HostState":
+        host = urlparse(url).hostname or ""
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.get(host)
+                if state is None:
+                    state = _HostState(self.policy(host))
+                    self._hosts[host] = state
+        return state
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to url's host may start."""
+        state = self._state(url)
+        if state.semaphore is not None:
+            state.semaphore.acquire()
+        if state.bucket is not None:
+            state.bucket.acquire()
+
+    def try_acquire(self, url: str) -> float:
+        """
+        Like acquire(), but never blocks.
+
+        Returns:
+            0 if a request to url's host may start now (call release() when
+            it finishes), else seconds until it may be worth trying again
+            (math.inf when the host is at its concurrency cap)
+        """
+        state = self._state(url)
+        if state.semaphore is not None and not state.semaphore.acquire(blocking=False):
+            return math.inf
+        delay = state.bucket.try_reserve() if state.bucket is not None else 0.0
+        if delay and state.semaphore is not None:
+            state.semaphore.release()
+        return delay
+
+    def release(self, url: str) -> None:
+        """Mark a request started with acquire() as finished."""
+        state = self._state(url)
+        if state.semaphore is not None:
+            state.semaphore.release()
+
+    @contextmanager
+    def limit(self, url: str):
+        """Context manager wrapping acquire()/release() around one request."""
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    async def acquire_async(self, url: str) -> None:
+        """Wait until a request to url's host may start (coroutine version)."""
+        state = self._state(url)
+        semaphore = state.async_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        if state.bucket is not None:
+            await state.bucket.acquire_async()
+
+    def release_async(self, url: str) -> None:
+        """Mark a request started with acquire_async() as finished."""
+        semaphore = self._state(url).async_semaphore()
+        if semaphore is not None:
+            semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self, url: str):
+        """Async context manager wrapping acquire_async()/release_async()."""
+        await self.acquire_async(url)
+        try:
+            yield
+        finally:
+            self.release_async(url)
+
+
+class _HostState:
+    """Token bucket and concurrency semaphores for one host."""
+
+    def __init__(self, policy: Dict[str, Any]):
+        rate = policy.get("rate")
+        self.bucket = TokenBucket(rate, policy.get("burst")) if rate else None
+        self.max_concurrency = policy.get("max_concurrency")
+        self.semaphore = (threading.BoundedSemaphore(self.max_concurrency)
+                          if self.max_concurrency else None)
+        self._async_semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def async_semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Return the running event loop's semaphore for this host."""
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores.setdefault(
+                loop, asyncio.BoundedSemaphore(self.max_concurrency))
+        return semaphore
+
+
+# Longest a _HostScheduler waits before re-checking capped hosts, in case a
+# slot was freed by a caller that doesn't notify it.
+_SCHEDULER_POLL = 0.05
+
+
+class _HostScheduler:
+    """
+    Hands out URLs in per-host FIFO order, only for hosts a HostLimiter
+    admits right now, so a capped or rate-limited host never ties up the
+    thread asking for work while other hosts have URLs ready.
+    """
+
+    def __init__(self, items: Iterable[Tuple[int, str]], limiter: HostLimiter):
+        """
+        Args:
+            items: (index, url) pairs in submission order
+            limiter: Limiter whose slots take() acquires
+        """
+        self._limiter = limiter
+        self._pending: "OrderedDict[str, deque]" = OrderedDict()
+        for index, url in items:
+            host = urlparse(url).hostname or ""
+            self._pending.setdefault(host, deque()).append((index, url))
+        self._cond = threading.Condition()
+
+    def take(self) -> Optional[Tuple[int, str]]:
+        """
+        Wait for a URL whose host the limiter admits and acquire its slot.
+
+        Hosts are tried round-robin, so one busy host can't starve the rest.
+
+        Returns:
+            (index, url) (the caller must call release(url) when done), or
+            None once every URL has been handed out
+        """
+        with self._cond:
+            while self._pending:
+                soonest = math.inf
+                for host, queued in self._pending.items():
+                    delay = self._limiter.try_acquire(queued[0][1])
+                    if not delay:
+                        item = queued.popleft()
+                        if queued:
+                            self._pending.move_to_end(host)
+                        else:
+                            del self._pending[host]
+                        return item
+                    soonest = min(soonest, delay)
+                self._cond.wait(min(soonest, _SCHEDULER_POLL))
+            return None
+
+    def release(self, url: str) -> None:
+        """Release a slot acquired by take() and wake waiting takers."""
+        self._limiter.release(url)
+        with self._cond:
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Drop every URL not yet handed out; take() then returns None."""
+        with self._cond:
+            self._pending.clear()
+            self._cond.notify_all()
+
+
+class _AdmittedLimiter:
+    """
+    HostLimiter stand-in for one URL handed out by a _HostScheduler: the
+    first limit() uses the slot the scheduler already acquired, later ones
+    (retries, hedged duplicates) go through the real limiter.
+    """
+
+    def __init__(self, scheduler: _HostScheduler, limiter: HostLimiter, url: str):
+        self._scheduler = scheduler
+        self._limiter = limiter
+        self._url = url
+        self._admitted = True
+        self._lock = threading.Lock()
+
+    def _claim(self) -> bool:
+        with self._lock:
+            admitted, self._admitted = self._admitted, False
+        return admitted
+
+    @contextmanager
+    def limit(self, url: str):
+        if not self._claim():
+            with self._limiter.limit(url):
+                yield
+            return
+        try:
+            yield
+        finally:
+            self._scheduler.release(self._url)
+
+    def close(self) -> None:
+        """Give the slot back if no request used it (e.g. a cache hit)."""
+        if self._claim():
+            self._scheduler.release(self._url)
+
+
+# Statuses that may be served from ResponseCache (RFC 9111 heuristically cacheable).
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Longest gap between sweeps of ttl-expired entries from ResponseCache's disk layer.
+_DISK_SWEEP_INTERVAL = 60.0
+
+
+@dataclass
+class CachedResponse:
+    """A response stored by ResponseCache."""
+
+    url: str
+    status_code: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+    stored_at: float  # time.time() of the last store or revalidation
+    expires_at: float  # fresh until this time.time()
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+
+class ResponseCache:
+    """
+    HTTP response cache with an in-memory LRU and an optional disk layer.
+
+    Fresh entries (per Cache-Control max-age / Expires, or `default_ttl` when
+    the server gives no freshness information) are served without touching
+    the network. Stale entries that carry an ETag or Last-Modified validator
+    are revalidated with a conditional GET; a 304 refreshes the entry and
+    the stored response is returned. 'no-store' responses are never cached
+    and 'no-cache' responses are always revalidated.
+
+    Eviction:
+    - Memory: least recently used entries are dropped once there are more
+      than `max_entries` or their bodies exceed `max_bytes`
+    - Disk: least recently used entries are deleted once there are more
+      than `max_disk_entries` or their files exceed `max_disk_bytes`
+    - Both layers: entries are dropped `ttl` seconds after they were last
+      stored or revalidated, fresh or not. On disk this happens on lookup
+      and in a sweep run as entries are written (at most every
+      _DISK_SWEEP_INTERVAL seconds)
+
+    With `directory` set, entries are also written to disk (one metadata and
+    one body file per URL) so later runs and other processes can reuse them.
+    The disk budget covers the entries found when the cache was created plus
+    those this instance writes; entries other processes add meanwhile are
+    only seen by prune().
+
+    Results served through the cache carry an extra 'cache' key:
+    'hit', 'revalidated' or 'miss'.
+
+    Example:
+        cache = ResponseCache(directory='.http_cache', default_ttl=60)
+        results = fetch_threaded(urls, cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = 24 * 3600,
+        default_ttl: float = 0.0,
+        directory: Optional[str] = None,
+        max_disk_entries: int = 65536,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries held in memory
+            max_bytes: Maximum total body bytes held in memory
+            ttl: Seconds after which an entry is evicted even if it could
+                still be revalidated (None = never)
+            default_ttl: Freshness lifetime for responses without
+                Cache-Control/Expires (0 = always revalidate)
+            directory: Optional directory for the persistent disk layer
+            max_disk_entries: Maximum entries kept in `directory`
+            max_disk_bytes: Maximum total size of the files in `directory`
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.default_ttl = default_ttl
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Disk layer index: file key -> (bytes on disk, stored_at), least recently used first.
+        self._disk: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._next_sweep = 0.0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_disk()
+
+    def lookup(self, url: str) -> Tuple[Optional[CachedResponse], bool]:
+        """
+        Find the entry for url.
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            (entry, fresh): entry is None on a miss; fresh is True when the
+            entry may be served without contacting the server
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+        if entry is None and self.directory is not None:
+            entry = self._load(url)
+            if entry is not None:
+                self._remember(entry)
+                with self._disk_lock:
+                    if self._key(url) in self._disk:
+                        self._disk.move_to_end(self._key(url))
+        if entry is None:
+            return None, False
+        if self._expired(entry, now):
+            self.discard(url)
+            return None, False
+        return entry, entry.is_fresh(now)
+
+    def update(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        body: bytes,
+        entry: Optional[CachedResponse] = None,
+    ) -> Dict:
+        """
+        Record a network response for url and build its result.
+
+        Args:
+            url: Requested URL
+            status_code: Status returned by the server
+            headers: Response headers
+            body: Response body
+            entry: The stale entry that was revalidated, if any
+
+        Returns:
+            Result dictionary with 'url', 'status_code' and 'cache' keys
+        """
+        now = time.time()
+        headers = {name.lower(): value for name, value in headers.items()}
+        if status_code == 304 and entry is not None:
+            store, expires_at = self._freshness(headers, now)
+            merged = dict(entry.headers)
+            merged.update(headers)
+            entry = CachedResponse(url, entry.status_code, merged, entry.body, now, expires_at)
+            if store:
+                self._store(entry)
+            return {"url": url, "status_code": entry.status_code, "cache": "revalidated"}
+
+        store, expires_at = self._freshness(headers, now)
+        if store and status_code in CACHEABLE_STATUSES:
+            fresh = expires_at > now
+            if fresh or "etag" in headers or "last-modified" in headers:
+                self._store(CachedResponse(url, status_code, headers, body, now, expires_at))
+        else:
+            self.discard(url)
+        return {"url": url, "status_code": status_code, "cache": "miss"}
+
+    @staticmethod
+    def hit(entry: CachedResponse) -> Dict:
+        """Build the result for an entry served without a request."""
+        return {"url": entry.url, "status_code": entry.status_code, "cache": "hit"}
+
+    def discard(self, url: str) -> None:
+        """Remove url from both layers."""
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        if self.directory is not None:
+            key = self._key(url)
+            with self._disk_lock:
+                self._forget(key)
+            self._remove_files(key)
+
+    def prune(self) -> int:
+        """
+        Remove entries older than `ttl` from the disk layer.
+
+        Unlike the automatic sweep, this reads every metadata file in
+        `directory`, so it also finds entries written by other processes.
+
+        Returns:
+            Number of entries removed
+        """
+        if self.directory is None or self.ttl is None:
+            return 0
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if now - meta.get("stored_at", 0) >= self.ttl:
+                self.discard(meta.get("url", ""))
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _freshness(self, headers: Dict[str, str], now: float) -> Tuple[bool, float]:
+        """Return (storable, expires_at) for lower-cased response headers."""
+        directives = {}
+        for part in headers.get("cache-control", "").split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"')
+        if "no-store" in directives:
+            return False, now
+        if "no-cache" in directives:
+            return True, now
+        for name in ("s-maxage", "max-age"):
+            if name in directives:
+                try:
+                    return True, now + max(0, int(directives[name]))
+                except ValueError:
+                    return True, now
+        if "expires" in headers:
+            try:
+                expires = parsedate_to_datetime(headers["expires"]).timestamp()
+                if "date" in headers:
+                    expires = now + (expires - parsedate_to_datetime(headers["date"]).timestamp())
+                return True, expires
+            except (TypeError, ValueError):
+                return True, now
+        return True, now + self.default_ttl
+
+    def _expired(self, entry: CachedResponse, now: float) -> bool:
+        return self.ttl is not None and now - entry.stored_at >= self.ttl
+
+    def _store(self, entry: CachedResponse) -> None:
+        self._remember(entry)
+        if self.directory is not None:
+            self._save(entry)
+
+    def _remember(self, entry: CachedResponse) -> None:
+        """Insert entry in the memory layer and enforce its limits."""
+        with self._lock:
+            old = self._entries.pop(entry.url, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size > self.max_bytes:
+                return
+            self._entries[entry.url] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        return self._key_paths(self._key(url))
+
+    def _key_paths(self, key: str) -> Tuple[str, str]:
+        return (os.path.join(self.directory, key + ".json"),
+                os.path.join(self.directory, key + ".body"))
+
+    def _remove_files(self, key: str) -> None:
+        for path in self._key_paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _scan_disk(self) -> None:
+        """Index the entries already in `directory` (oldest first) and trim them."""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            meta_path, body_path = self._key_paths(key)
+            try:
+                meta_stat = os.stat(meta_path)
+                size = meta_stat.st_size + os.path.getsize(body_path)
+            except OSError:
+                continue
+            # The metadata file is written last on every store, so its mtime is stored_at.
+            found.append((meta_stat.st_mtime, key, size))
+        found.sort()
+        with self._disk_lock:
+            for stored_at, key, size in found:
+                self._disk[key] = (size, stored_at)
+                self._disk_bytes += size
+            evicted = self._trim_disk(time.time())
+        for key in evicted:
+            self._remove_files(key)
+
+    def _forget(self, key: str) -> None:
+        """Drop key from the disk index; the caller holds _disk_lock."""
+        old = self._disk.pop(key, None)
+        if old is not None:
+            self._disk_bytes -= old[0]
+
+    def _trim_disk(self, now: float) -> List[str]:
+        """
+        Unindex expired and over-budget entries; the caller holds _disk_lock
+        and deletes the returned keys' files.
+        """
+        evicted = []
+        if self.ttl is not None and now >= self._next_sweep:
+            self._next_sweep = now + min(self.ttl, _DISK_SWEEP_INTERVAL)
+            evicted = [key for key, (_, stored_at) in self._disk.items()
+                       if now - stored_at >= self.ttl]
+            for key in evicted:
+                self._forget(key)
+        while self._disk and (len(self._disk) > self.max_disk_entries
+                              or self._disk_bytes > self.max_disk_bytes):
+            key, (size, _) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _save(self, entry: CachedResponse) -> None:
+        key = self._key(entry.url)
+        meta_path, body_path = self._key_paths(key)
+        meta = json.dumps({
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+            "expires_at": entry.expires_at,
+        }).encode()
+        size = len(entry.body) + len(meta)
+        if size > self.max_disk_bytes:
+            # Too big to keep; don't leave an older copy behind either.
+            with self._disk_lock:
+                self._forget(key)
+            self._remove_files(key)
+            return
+        # Body first, metadata last: a metadata file means a complete entry.
+        _atomic_write(body_path, entry.body)
+        _atomic_write(meta_path, meta)
+        with self._disk_lock:
+            self._forget(key)
+            self._disk[key] = (size, entry.stored_at)
+            self._disk_bytes += size
+            evicted = self._trim_disk(time.time())
+        for evicted_key in evicted:
+            self._remove_files(evicted_key)
+
+    def _load(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return CachedResponse(url, meta["status_code"], meta["headers"], body,
+                              meta["stored_at"], meta["expires_at"])
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write data to path so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@dataclass
+class BodyStream:
+    """
+    Streaming-body mode: read response bodies in chunks and feed a parser.
+
+    `parser` is a zero-argument factory called once per response. The object
+    it returns must have an update(chunk) method; returning True from
+    update() stops reading that body early. Hash constructors such as
+    hashlib.sha256 work as-is. Bodies are never held in memory as a whole,
+    and only their first `max_bytes` reach the parser; reading stops at the
+    first chunk that goes past the limit.
+
+    Results then also carry:
+    - 'bytes_read': body bytes fed to the parser
+    - 'truncated': True if the body was longer than max_bytes or the
+      parser stopped the read early
+    - 'parsed': parser.hexdigest() for hashes, parser.result() if the
+      parser defines it, otherwise the parser object itself
+
+    For fetch_multiprocess the parser factory must be picklable (a
+    module-level function or class, or a hashlib constructor).
+
+    Example:
+        stream = BodyStream(hashlib.sha256, max_bytes=1_000_000)
+        results = fetch_threaded(urls, stream=stream)
+    """
+
+    parser: Callable[[], Any]
+    max_bytes: Optional[int] = None
+    chunk_size: int = 64 * 1024
+
+    def consume(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """Feed an iterable of body chunks to a new parser."""
+        parser = self.parser()
+        read = 0
+        truncated = False
+        for chunk in chunks:
+            chunk, read, truncated = self._clip(chunk, read)
+            if chunk and parser.update(chunk) is True:
+                truncated = True
+            if truncated:
+                break
+        return self._finish(parser, read, truncated)
+
+    async def consume_async(self, chunks: AsyncIterable[bytes]) -> Dict[str, Any]:
+        """Feed an async iterable of body chunks to a new parser."""
+        parser = self.parser()
+        read = 0
+        truncated = False
+        async for chunk in chunks:
+            chunk, read, truncated = self._clip(chunk, read)
+            if chunk and parser.update(chunk) is True:
+                truncated = True
+            if truncated:
+                break
+        return self._finish(parser, read, truncated)
+
+    def _clip(self, chunk: bytes, read: int) -> Tuple[bytes, int, bool]:
+        """
+        Trim chunk to the max_bytes budget; return (chunk, read, over_limit).
+
+        A body of exactly max_bytes isn't over the limit: that is only known
+        once a byte past it arrives.
+        """
+        if self.max_bytes is not None and read + len(chunk) > self.max_bytes:
+            return chunk[:self.max_bytes - read], self.max_bytes, True
+        return chunk, read + len(chunk), False
+
+    @staticmethod
+    def _finish(parser: Any, read: int, truncated: bool) -> Dict[str, Any]:
+        if hasattr(parser, "hexdigest"):
+            parsed = parser.hexdigest()
+        elif callable(getattr(parser, "result", None)):
+            parsed = parser.result()
+        else:
+            parsed = parser
+        return {"bytes_read": read, "truncated": truncated, "parsed": parsed}
+
+
+def _check_stream_options(cache: Optional[ResponseCache], stream: Optional[BodyStream]) -> None:
+    """Reject option combinations the fetchers can't honour."""
+    if cache is not None and stream is not None:
+        raise ValueError("cache and stream can't be combined: the cache needs whole bodies")
+
+
+# Exceptions that count as a failed attempt under a RetryPolicy.
+RETRYABLE_ERRORS = (requests.RequestException, aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries, timeouts, deadlines and hedging for the fetch functions.
+
+    With a policy, a fetch function never raises for a failed URL. Each
+    result gains an 'attempts' key. A URL that never got a response comes
+    back as an error record instead:
+        {'url': url, 'status_code': None, 'error': 'ConnectTimeout: ...', 'attempts': 3}
+
+    Behaviour:
+    - Attempts that raise, or return a status in retry_statuses, are retried
+      up to max_attempts with full-jitter exponential backoff
+    - Each attempt is limited to `timeout` seconds
+    - `deadline` bounds the whole batch: no attempt starts after it, and
+      attempt timeouts and backoff sleeps are clipped to what is left
+    - With hedge=True, an attempt that hasn't finished `hedge_delay`
+      seconds after its request was sent (or, if that is None, the
+      hedge_percentile of the latencies seen so far in the batch, once
+      hedge_min_samples are recorded) gets a duplicate request. Time spent
+      waiting on a HostLimiter doesn't count. The first response wins.
+      Blocking requests can't be cancelled, so in threads a hedged attempt
+      and its duplicate each get a thread of their own (and never share a
+      session), and the loser runs to completion in the background.
+
+    Example:
+        policy = RetryPolicy(max_attempts=4, timeout=5, deadline=60, hedge=True)
+        results = fetch_threaded(urls, retry=policy)
+        failed = [r for r in results if r.get('error')]
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.1
+    max_backoff: float = 5.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    timeout: Optional[float] = 10.0
+    deadline: Optional[float] = None
+    hedge: bool = False
+    hedge_delay: Optional[float] = None
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+
+    def backoff_delay(self, retry: int) -> float:
+        """Full-jitter backoff before the given retry (1 = first retry)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+
+    def start(self) -> "_RetryRun":
+        """Begin a batch: fix its deadline and start tracking latencies."""
+        return _RetryRun(self)
+
+
+class _RetryRun:
+    """
+    Per-batch state for a RetryPolicy: the absolute deadline and a window of
+    observed latencies used to pick the hedging delay.
+
+    Pickles without its latency window, so each worker process learns its
+    own; the deadline is wall-clock time and is shared by all processes.
+    """
+
+    def __init__(self, policy: RetryPolicy, deadline_at: Optional[float] = None):
+        self.policy = policy
+        if deadline_at is None and policy.deadline is not None:
+            deadline_at = time.time() + policy.deadline
+        self.deadline_at = deadline_at
+        self._latencies: deque = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"policy": self.policy, "deadline_at": self.deadline_at}
+
+    def __setstate__(self, state):
+        self.__init__(state["policy"], state["deadline_at"])
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None = no deadline)."""
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.time()
+
+    def attempt_timeout(self) -> Optional[float]:
+        """Timeout for the next attempt, clipped to the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return self.policy.timeout
+        if self.policy.timeout is None:
+            return remaining
+        return min(self.policy.timeout, remaining)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_after(self) -> Optional[float]:
+        """Seconds to wait before sending a duplicate (None = don't hedge)."""
+        policy = self.policy
+        if not policy.hedge:
+            return None
+        if policy.hedge_delay is not None:
+            return policy.hedge_delay
+        with self._lock:
+            if len(self._latencies) < policy.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * policy.hedge_percentile / 100))
+        return ordered[index]
+
+    def _backoff(self, attempts: int) -> float:
+        delay = self.policy.backoff_delay(attempts)
+        remaining = self.remaining()
+        return delay if remaining is None else max(0.0, min(delay, remaining))
+
+    def call(self, attempt: Callable[[Optional[float]], Any],
+             status_of: Callable[[Any], int]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Run attempt(timeout) under the policy.
+
+        When hedging, attempt is called as attempt(timeout, sent) instead
+        (see _hedged()).
+
+        Returns:
+            (value, info): value is the last successful attempt's return value
+            (None if every attempt failed); info has 'attempts' and, on
+            failure, 'error'
+        """
+        attempts = 0
+        value = None
+        error = None
+        while attempts < self.policy.max_attempts:
+            timeout = self.attempt_timeout()
+            if timeout is not None and timeout <= 0:
+                error = error or "deadline exceeded"
+                break
+            attempts += 1
+            start = time.monotonic()
+            try:
+                value = self._hedged(attempt, timeout)
+            except RETRYABLE_ERRORS as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                self.record(time.monotonic() - start)
+                if status_of(value) not in self.policy.retry_statuses:
+                    break
+            if attempts < self.policy.max_attempts:
+                time.sleep(self._backoff(attempts))
+        return value, self._info(value, attempts, error)
+
+    async def call_async(self, attempt: Callable[[Optional[float]], Any],
+                         status_of: Callable[[Any], int]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Coroutine version of call(); attempt(timeout) returns an awaitable.
+
+        When hedging, the first request is made as attempt(timeout, sent),
+        where sent() is called as the request goes out.
+        """
+        attempts = 0
+        value = None
+        error = None
+        while attempts < self.policy.max_attempts:
+            timeout = self.attempt_timeout()
+            if timeout is not None and timeout <= 0:
+                error = error or "deadline exceeded"
+                break
+            attempts += 1
+            start = time.monotonic()
+            try:
+                value = await self._hedged_async(attempt, timeout)
+            except RETRYABLE_ERRORS as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                self.record(time.monotonic() - start)
+                if status_of(value) not in self.policy.retry_statuses:
+                    break
+            if attempts < self.policy.max_attempts:
+                await asyncio.sleep(self._backoff(attempts))
+        return value, self._info(value, attempts, error)
+
+    @staticmethod
+    def _info(value: Any, attempts: int, error: Optional[str]) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"attempts": attempts}
+        if value is None:
+            info["error"] = error or "deadline exceeded"
+        return info
+
+    def _hedged(self, attempt: Callable[..., Any], timeout: Optional[float]) -> Any:
+        """
+        Run attempt(timeout), hedging it as attempt(timeout, sent) if the
+        policy says so.
+
+        attempt calls sent() just before its request goes out. Both requests
+        may run at once, so they must not share a requests.Session.
+        """
+        delay = self.hedge_after()
+        if delay is None:
+            return attempt(timeout)
+        events: "queue.Queue[Tuple[str, bool, Any]]" = queue.Queue()
+
+        def run() -> None:
+            try:
+                value = attempt(timeout, lambda: events.put(("sent", True, None)))
+            except BaseException as exc:
+                events.put(("done", False, exc))
+            else:
+                events.put(("done", True, value))
+
+        threading.Thread(target=run, name="hedge-primary", daemon=True).start()
+        hedge_at: Optional[float] = None  # set once the first request is sent
+        hedged = False
+        running = 1
+        while True:
+            wait_for = None
+            if hedge_at is not None and not hedged:
+                wait_for = max(0.0, hedge_at - time.monotonic())
+            try:
+                kind, ok, value = events.get(timeout=wait_for)
+            except queue.Empty:
+                threading.Thread(target=run, name="hedge-duplicate", daemon=True).start()
+                hedged = True
+                running += 1
+                continue
+            if kind == "sent":
+                if hedge_at is None:
+                    hedge_at = time.monotonic() + delay
+                continue
+            running -= 1
+            if ok:
+                return value
+            if not running:
+                raise value
+
+    async def _hedged_async(self, attempt: Callable[..., Any],
+                            timeout: Optional[float]) -> Any:
+        delay = self.hedge_after()
+        if delay is None:
+            return await attempt(timeout)
+        sent = asyncio.Event()
+        first = asyncio.ensure_future(attempt(timeout, sent.set))
+        sending = asyncio.ensure_future(sent.wait())
+        # The hedge clock starts once the request is out, not while it waits
+        # for a HostLimiter slot.
+        await asyncio.wait({first, sending}, return_when=asyncio.FIRST_COMPLETED)
+        sending.cancel()
+        if not first.done():
+            await asyncio.wait({first}, timeout=delay)
+        if first.done():
+            return first.result()
+        pending = {first, asyncio.ensure_future(attempt(timeout))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _start_retry(retry: Optional[RetryPolicy]) -> Optional[_RetryRun]:
+    return retry.start() if retry is not None else None
+
+
+def _raw_result(
+    url: str,
+    raw: Optional[Tuple[int, Dict[str, str], bytes]],
+    info: Dict[str, Any],
+    cache: Optional[ResponseCache] = None,
+    entry: Optional[CachedResponse] = None,
+) -> Dict:
+    """Turn a (status, headers, body) response (or a failure) into a result."""
+    if raw is None:
+        return _with_info(url, None, info)
+    if cache is not None:
+        return _with_info(url, cache.update(url, *raw, entry), info)
+    return _with_info(url, {"url": url, "status_code": raw[0]}, info)
+
+
+def _with_info(url: str, result: Optional[Dict], info: Dict[str, Any]) -> Dict:
+    """Merge retry info into a result, or build an error record if it failed."""
+    if result is None:
+        return {"url": url, "status_code": None, **info}
+    result.update(info)
+    return result
+
+
+class _Timed:
+    """
+    Wrap a per-URL fetch helper for timed=True: each call's wall time is
+    added as 'latency_seconds' to the result dict it returns, or to the info
+    dict of a (response, info) pair.
+
+    A module-level class so the wrapper pickles by reference and times the
+    request inside worker processes, whatever their start method.
+    """
+
+    def __init__(self, fetch: Callable[..., Any]):
+        self.fetch = fetch
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        return _add_latency(self.fetch(*args, **kwargs), time.perf_counter() - start)
+
+
+def _timed_async(fetch: Callable[..., Any]) -> Callable[..., Any]:
+    """Coroutine version of _Timed (not picklable)."""
+    @functools.wraps(fetch)
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        return _add_latency(await fetch(*args, **kwargs), time.perf_counter() - start)
+
+    return timed
+
+
+def _add_latency(result: Any, seconds: float) -> Any:
+    if isinstance(result, tuple):
+        raw, info = result
+        return raw, {**info, "latency_seconds": seconds}
+    return {**result, "latency_seconds": seconds}
+
+
+def _lookup_timed(
+    cache: ResponseCache, url: str, timed: bool
+) -> Tuple[Optional[CachedResponse], Optional[Dict]]:
+    """cache.lookup() for the parent-side lookups of fetch_multiprocess();
+    returns (entry, hit result or None)."""
+    start = time.perf_counter()
+    entry, fresh = cache.lookup(url)
+    if not fresh:
+        return entry, None
+    hit = cache.hit(entry)
+    return entry, _add_latency(hit, time.perf_counter() - start) if timed else hit
+
+
+def _status_of_raw(raw: Tuple[int, Dict[str, str], bytes]) -> int:
+    return raw[0]
+
+
+def _status_of_result(result: Dict) -> int:
+    return result["status_code"]
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+_PERCENT_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, so that trivially equivalent URLs compare equal.
+
+    - Scheme and host are lower-cased
+    - The scheme's default port is dropped (http:80, https:443)
+    - An empty path becomes '/'
+    - Percent-escapes are upper-cased ('%2f' -> '%2F')
+    - Query parameters are sorted by name (repeated names keep their order)
+      and empty parameters are dropped
+    - The fragment is removed
+
+    URLs that can't be parsed (e.g. a non-numeric port) are returned unchanged.
+
+    Example:
+        normalize_url('HTTP://Example.com:80/a?b=2&a=1#top')
+        # 'http://example.com/a?a=1&b=2'
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if parts.hostname is not None:
+        host = parts.hostname
+        if ":" in host:
+            host = f"[{host}]"
+        userinfo = netloc.rpartition("@")[0]
+        netloc = f"{userinfo}@{host}" if userinfo else host
+        if port is not None and port != DEFAULT_PORTS.get(scheme):
+            netloc += f":{port}"
+    path = parts.path or ("/" if netloc else "")
+    params = sorted((p for p in parts.query.split("&") if p), key=lambda p: p.split("=", 1)[0])
+    return urlunsplit((scheme, netloc, _PERCENT_ESCAPE.sub(_upper_escape, path),
+                       _PERCENT_ESCAPE.sub(_upper_escape, "&".join(params)), ""))
+
+
+def _upper_escape(match: "re.Match[str]") -> str:
+    return match.group().upper()
+
+
+def _fetch_deduplicated(urls: List[str], fetch: Callable[[List[str]], List[Dict]]) -> List[Dict]:
+    """
+    Fetch each canonical URL once with fetch(unique_urls), then fan the
+    results back out to every input position, each carrying its original
+    'url'.
+    """
+    unique, positions = _deduplicate(urls)
+    return _fan_out(urls, positions, fetch(unique))
+
+
+async def _fetch_deduplicated_async(urls: List[str], fetch) -> List[Dict]:
+    """Coroutine version of _fetch_deduplicated(); fetch returns an awaitable."""
+    unique, positions = _deduplicate(urls)
+    return _fan_out(urls, positions, await fetch(unique))
+
+
+def _deduplicate(urls: Iterable[str]) -> Tuple[List[str], List[int]]:
+    """Canonical URLs in first-seen order, and each input's index into them."""
+    index: Dict[str, int] = {}
+    positions = [index.setdefault(normalize_url(url), len(index)) for url in urls]
+    return list(index), positions
+
+
+def _fan_out(urls: List[str], positions: List[int], results: List[Dict]) -> List[Dict]:
+    return [_as_result_for(url, results[i]) for url, i in zip(urls, positions)]
+
+
+def _as_result_for(url: str, result: Dict) -> Dict:
+    """Copy of a result for the input URL it answers."""
+    return {**result, "url": url}
+
+
+def fetch_sequential(
+    urls: List[str],
+    pooled: bool = False,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[RetryPolicy] = None,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> List[Dict]:
     """
     Fetch URLs one at a time, sequentially.
 
@@ -33,24 +1594,60 @@ def fetch_sequential(urls: List[str]) -> List[Dict]:
 
     Args:
         urls: List of URLs to fetch
+        pooled: Reuse one requests.Session (and its connections) for all URLs
+        pool_maxsize: Keep-alive connections kept per host in pooled mode
+        keep_alive: In pooled mode, keep connections open between requests
+        limiter: Optional HostLimiter applying per-host rate limits
+        cache: Optional ResponseCache; results then also carry a 'cache' key
+        stream: Optional BodyStream to parse bodies incrementally
+        retry: Optional RetryPolicy; failed URLs then come back as error
+            records instead of raising
+        dedupe: Fetch each normalized URL (see normalize_url()) once and
+            copy its result to every equivalent input URL
+        timed: Add 'latency_seconds' to each result: client-side wall time
+            from starting that URL's fetch to its result, including cache
+            revalidation, limiter waits and retries
 
     Returns:
         List of dictionaries with 'url' and 'status_code' keys for each URL
 
     Raises:
-        requests.RequestException: If any request fails
+        requests.RequestException: If any request fails (without retry)
+        ValueError: If both cache and stream are given
 
     Example:
         results = fetch_sequential(['http://example.com', 'http://google.com'])
         # results = [{'url': 'http://example.com', 'status_code': 200}, ...]
     """
-    # TODO: Implement sequential fetching
-    # Hint: Use requests.get() in a simple for loop
-    # Return list of dicts with 'url' and 'status_code'
-    pass
+    _check_stream_options(cache, stream)
+    if dedupe:
+        return _fetch_deduplicated(urls, lambda unique: fetch_sequential(
+            unique, pooled=pooled, pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+            limiter=limiter, cache=cache, stream=stream, retry=retry, timed=timed))
+    run = _start_retry(retry)
+    fetch = _Timed(_fetch_single_url) if timed else _fetch_single_url
+    if not pooled:
+        return [fetch(url, limiter=limiter, cache=cache, stream=stream, retry=run)
+                for url in urls]
+    with make_session(pool_maxsize=pool_maxsize, keep_alive=keep_alive) as session:
+        return [fetch(url, session, limiter, cache, stream, run) for url in urls]
 
 
-def fetch_threaded(urls: List[str], max_workers: int = 5) -> List[Dict]:
+def fetch_threaded(
+    urls: List[str],
+    max_workers: int = 5,
+    pooled: bool = False,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[RetryPolicy] = None,
+    resolver: Optional[DNSCache] = None,
+    warm_up: bool = False,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> List[Dict]:
     """
     Fetch URLs using a thread pool.
 
@@ -58,26 +1655,145 @@ def fetch_threaded(urls: List[str], max_workers: int = 5) -> List[Dict]:
     Multiple requests happen concurrently while the Python GIL allows only
     one thread to execute Python code at a time.
 
+    In pooled mode each worker thread lazily creates its own requests.Session
+    (sessions are not guaranteed thread-safe) and reuses it for every URL it
+    handles; all sessions are closed when the batch finishes.
+
+    With a resolver, every new connection looks its host up in the shared
+    DNSCache instead of the system resolver. warm_up resolves
+    all distinct hosts concurrently before the first request; connections
+    are not pre-opened, since each worker has its own pool.
+
     Args:
         urls: List of URLs to fetch
         max_workers: Maximum number of worker threads (default 5)
+        pooled: Reuse a per-thread requests.Session across URLs
+        pool_maxsize: Keep-alive connections kept per host by each session
+        keep_alive: In pooled mode, keep connections open between requests
+        limiter: Optional HostLimiter applying per-host rate limits and
+            concurrency caps; workers skip to URLs for other hosts while a
+            host is at its cap or out of tokens
+        cache: Optional ResponseCache; results then also carry a 'cache' key
+        stream: Optional BodyStream to parse bodies incrementally
+        retry: Optional RetryPolicy; failed URLs then come back as error
+            records instead of raising
+        resolver: Optional DNSCache shared by all worker sessions
+        warm_up: Pre-resolve every distinct host before fetching (with a
+            batch-local DNSCache if resolver is None)
+        dedupe: Fetch each normalized URL (see normalize_url()) once and
+            copy its result to every equivalent input URL
+        timed: Add 'latency_seconds' to each result: client-side wall time
+            from starting that URL's fetch to its result, including cache
+            revalidation, limiter waits and retries
 
     Returns:
         List of dictionaries with 'url' and 'status_code' keys for each URL
 
     Raises:
-        requests.RequestException: If any request fails
+        requests.RequestException: If any request fails (without retry)
+        ValueError: If both cache and stream are given
 
     Example:
         results = fetch_threaded(urls, max_workers=10)
+        results = fetch_threaded(urls, max_workers=10, pooled=True,
+                                 resolver=DNSCache(), warm_up=True)
     """
-    # TODO: Implement threaded fetching
-    # Hint: Use ThreadPoolExecutor.map() or submit()
-    # Return results in the same order as input URLs
-    pass
+    _check_stream_options(cache, stream)
+    if dedupe:
+        return _fetch_deduplicated(urls, lambda unique: fetch_threaded(
+            unique, max_workers=max_workers, pooled=pooled, pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive, limiter=limiter, cache=cache, stream=stream, retry=retry,
+            resolver=resolver, warm_up=warm_up, timed=timed))
+    run = _start_retry(retry)
+    if warm_up:
+        resolver = resolver if resolver is not None else DNSCache()
+        resolver.warm_up(urls)
+    fetch_url = _Timed(_fetch_single_url) if timed else _fetch_single_url
+    if not pooled:
+        if resolver is None:
+            fetch_one = functools.partial(fetch_url, limiter=limiter, cache=cache,
+                                          stream=stream, retry=run)
+        else:
+            def fetch_one(url: str, limiter: Optional[HostLimiter] = limiter) -> Dict:
+                # A throwaway session per URL, as requests.get() uses.
+                with make_session(resolver=resolver) as session:
+                    return fetch_url(url, session, limiter, cache, stream, run)
+        if limiter is not None:
+            return _fetch_scheduled(urls, max_workers, limiter, fetch_one)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch_one, urls))
+
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def fetch(url: str, limiter: Optional[HostLimiter] = limiter) -> Dict:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = make_session(pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+                                   resolver=resolver)
+            local.session = session
+            with sessions_lock:
+                sessions.append(session)
+        return fetch_url(url, session, limiter, cache, stream, run)
 
+    try:
+        if limiter is not None:
+            return _fetch_scheduled(urls, max_workers, limiter, fetch)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, urls))
+    finally:
+        for session in sessions:
+            session.close()
 
-async def fetch_async(urls: List[str]) -> List[Dict]:
+
+def _fetch_scheduled(
+    urls: List[str],
+    max_workers: int,
+    limiter: HostLimiter,
+    fetch: Callable[..., Dict],
+) -> List[Dict]:
+    """
+    Run fetch(url, limiter=...) for every URL on max_workers threads that
+    take URLs from a _HostScheduler, so no thread blocks on a capped host.
+    """
+    scheduler = _HostScheduler(enumerate(urls), limiter)
+    results: List[Optional[Dict]] = [None] * len(urls)
+
+    def work() -> None:
+        try:
+            while True:
+                item = scheduler.take()
+                if item is None:
+                    return
+                index, url = item
+                admitted = _AdmittedLimiter(scheduler, limiter, url)
+                try:
+                    results[index] = fetch(url, limiter=admitted)
+                finally:
+                    admitted.close()
+        except BaseException:
+            scheduler.close()  # stop the other workers, as executor.map() would
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        workers = [executor.submit(work) for _ in range(min(max_workers, len(urls)))]
+        for worker in workers:
+            worker.result()
+    return results
+
+
+async def fetch_async(
+    urls: List[str],
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[RetryPolicy] = None,
+    resolver: Optional[DNSCache] = None,
+    warm_up: bool = False,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> List[Dict]:
     """
     Fetch URLs asynchronously using asyncio and aiohttp.
 
@@ -85,26 +1801,343 @@ async def fetch_async(urls: List[str]) -> List[Dict]:
     doesn't require system threads. All operations are scheduled in a single
     event loop.
 
+    With a resolver, host names are looked up in the shared DNSCache instead
+    of aiohttp's per-connector cache. warm_up first resolves every distinct
+    host, then opens a connection to each origin by sending a HEAD for its
+    first URL; those connections stay in the session's pool for the batch.
+
     Args:
         urls: List of URLs to fetch
+        limiter: Optional HostLimiter applying per-host rate limits and
+            concurrency caps
+        cache: Optional ResponseCache; results then also carry a 'cache' key
+        stream: Optional BodyStream to parse bodies incrementally
+        retry: Optional RetryPolicy; failed URLs then come back as error
+            records instead of raising
+        resolver: Optional DNSCache used to look up host names
+        warm_up: Pre-resolve hosts and pre-open one connection per origin
+            (with a batch-local DNSCache if resolver is None)
+        dedupe: Fetch each normalized URL (see normalize_url()) once and
+            copy its result to every equivalent input URL
+        timed: Add 'latency_seconds' to each result: client-side wall time
+            from starting that URL's fetch to its result, including cache
+            revalidation, limiter waits and retries
 
     Returns:
         List of dictionaries with 'url' and 'status_code' keys for each URL
 
     Raises:
-        aiohttp.ClientError: If any request fails
+        aiohttp.ClientError: If any request fails (without retry)
+        ValueError: If both cache and stream are given
 
     Example:
         results = await fetch_async(urls)
+        results = await fetch_async(urls, resolver=DNSCache(), warm_up=True)
+    """
+    _check_stream_options(cache, stream)
+    if dedupe:
+        return await _fetch_deduplicated_async(urls, lambda unique: fetch_async(
+            unique, limiter=limiter, cache=cache, stream=stream, retry=retry,
+            resolver=resolver, warm_up=warm_up, timed=timed))
+    run = _start_retry(retry)
+    if warm_up and resolver is None:
+        resolver = DNSCache()
+    fetch = _timed_async(_fetch_async_single_url) if timed else _fetch_async_single_url
+    async with aiohttp.ClientSession(connector=_tcp_connector(resolver)) as session:
+        if warm_up:
+            await _warm_up_async(session, urls, resolver, limiter)
+        return list(await asyncio.gather(
+            *(fetch(session, url, limiter, cache, stream, run)
+              for url in urls)))
+
+
+async def fetch_async_stream(
+    urls: Union[Iterable[str], AsyncIterable[str]],
+    concurrency: int = 100,
+    limit_per_host: int = 0,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[RetryPolicy] = None,
+    resolver: Optional[DNSCache] = None,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> AsyncIterator[Dict]:
+    """
+    Fetch URLs asynchronously with bounded concurrency, yielding as they finish.
+
+    Unlike fetch_async(), which schedules every URL up front, this pulls URLs
+    from the input lazily and keeps at most `concurrency` requests in flight,
+    so memory and socket usage stay constant no matter how long the input
+    is. All requests share one aiohttp.ClientSession whose TCPConnector is
+    sized to the same limit.
+
+    Results are yielded in completion order, not input order; use the 'url'
+    key to match them up. If the consumer stops iterating early, requests
+    still in flight are cancelled.
+
+    Args:
+        urls: Iterable or async iterable of URLs (may be a generator)
+        concurrency: Maximum number of requests in flight (default 100)
+        limit_per_host: Maximum connections per host (0 = no per-host limit)
+        limiter: Optional HostLimiter applying per-host rate limits and
+            concurrency caps (requests waiting on it count as in flight)
+        cache: Optional ResponseCache; results then also carry a 'cache' key
+        stream: Optional BodyStream to parse bodies incrementally
+        retry: Optional RetryPolicy; failed URLs then come back as error
+            records instead of raising
+        resolver: Optional DNSCache used to look up host names
+        dedupe: Fetch each normalized URL (see normalize_url()) once; later
+            equivalent URLs are answered from its result (kept for the
+            whole iteration) without a request
+        timed: Add 'latency_seconds' to each result: client-side wall time
+            from starting that URL's fetch to its result, including cache
+            revalidation, limiter waits and retries
+
+    Yields:
+        Dictionaries with 'url' and 'status_code' keys
+
+    Raises:
+        aiohttp.ClientError: If any request fails (without retry)
+        ValueError: If both cache and stream are given
+
+    Example:
+        async for result in fetch_async_stream(read_urls(), concurrency=50):
+            print(result)
     """
-    # TODO: Implement async fetching
-    # Hint: Use aiohttp.ClientSession and asyncio.gather()
-    # Create an async function to fetch a single URL with aiohttp
-    # Then gather all the coroutines
-    pass
+    _check_stream_options(cache, stream)
+    run = _start_retry(retry)
+    fetch = _timed_async(_fetch_async_single_url) if timed else _fetch_async_single_url
+    connector = _tcp_connector(resolver, limit=concurrency, limit_per_host=limit_per_host)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        url_iter = _aiter_urls(urls).__aiter__()
+        pending = set()
+        done = set()
+        exhausted = False
+        # With dedupe: canonical URL of each task, inputs waiting on each
+        # canonical URL in flight, and results of those already fetched.
+        keys: Dict[asyncio.Future, str] = {}
+        waiting: Dict[str, List[str]] = {}
+        answered: Dict[str, Dict] = {}
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        url = await url_iter.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    if dedupe:
+                        key = normalize_url(url)
+                        if key in answered:
+                            yield _as_result_for(url, answered[key])
+                            continue
+                        if key in waiting:
+                            waiting[key].append(url)
+                            continue
+                        waiting[key] = [url]
+                        url = key
+                    task = asyncio.ensure_future(
+                        fetch(session, url, limiter, cache, stream, run))
+                    pending.add(task)
+                    if dedupe:
+                        keys[task] = url
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not dedupe:
+                        yield task.result()
+                        continue
+                    key = keys.pop(task)
+                    answered[key] = task.result()
+                    for original in waiting.pop(key):
+                        yield _as_result_for(original, answered[key])
+        finally:
+            for task in done:
+                if not task.cancelled():
+                    task.exception()  # mark as retrieved if we stopped early
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _warm_up_async(
+    session: aiohttp.ClientSession,
+    urls: List[str],
+    resolver: DNSCache,
+    limiter: Optional[HostLimiter] = None,
+) -> None:
+    """Resolve all hosts, then open one pooled connection per origin (HEAD)."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, resolver.warm_up, urls)
+    first_urls = {}
+    for url in urls:
+        parsed = urlparse(url)
+        first_urls.setdefault((parsed.scheme, parsed.netloc), url)
+
+    async def connect(url: str) -> None:
+        try:
+            if limiter is not None:
+                async with limiter.limit_async(url):
+                    await connect_unlimited(url)
+            else:
+                await connect_unlimited(url)
+        except RETRYABLE_ERRORS:
+            pass  # best effort: the real request will report the error
+
+    async def connect_unlimited(url: str) -> None:
+        async with session.head(url, allow_redirects=False) as response:
+            await response.read()
+
+    await asyncio.gather(*(connect(url) for url in first_urls.values()))
+
+
+async def _aiter_urls(urls: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Adapt a plain or async iterable of URLs to an async iterator."""
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+
+async def _fetch_async_single_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Dict:
+    """
+    Fetch a single URL with a shared aiohttp session.
+
+    Args:
+        session: Open aiohttp.ClientSession
+        url: URL to fetch
+        limiter: Optional HostLimiter to wait on before sending the request
+        cache: Optional ResponseCache to serve or revalidate from
+        stream: Optional BodyStream to parse the body incrementally
+        retry: Optional retry state from RetryPolicy.start()
+
+    Returns:
+        Dictionary with 'url' and 'status_code' (and 'cache' if cache is set)
+    """
+    if stream is not None:
+        return await _fetch_async_streamed_retrying(session, url, stream, limiter, retry)
+    entry = None
+    validators = None
+    if cache is not None:
+        entry, fresh = await _off_loop(cache, cache.lookup, url)
+        if fresh:
+            return cache.hit(entry)
+        validators = entry.validators() if entry is not None else None
+    raw, info = await _fetch_async_raw_retrying(session, url, validators, limiter, retry)
+    if cache is None or raw is None:
+        return _raw_result(url, raw, info)
+    return await _off_loop(cache, _raw_result, url, raw, info, cache, entry)
+
+
+async def _off_loop(cache: ResponseCache, fn: Callable[..., Any], *args: Any) -> Any:
+    """Call fn(*args) in the loop's default executor if cache has a disk layer."""
+    if cache.directory is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def _fetch_async_raw_retrying(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    limiter: Optional[HostLimiter] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Tuple[Optional[Tuple[int, Dict[str, str], bytes]], Dict[str, Any]]:
+    """_fetch_async_raw() under a retry policy; returns (response or None, info)."""
+    def attempt(timeout: Optional[float], sent: Optional[Callable[[], None]] = None):
+        return _fetch_async_raw(session, url, headers, limiter, timeout, sent)
+
+    if retry is None:
+        return await attempt(None), {}
+    return await retry.call_async(attempt, _status_of_raw)
+
+
+async def _fetch_async_streamed_retrying(
+    session: aiohttp.ClientSession,
+    url: str,
+    stream: BodyStream,
+    limiter: Optional[HostLimiter] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Dict:
+    """_fetch_async_streamed() under a retry policy."""
+    def attempt(timeout: Optional[float], sent: Optional[Callable[[], None]] = None):
+        return _fetch_async_streamed(session, url, stream, limiter, timeout, sent)
+
+    if retry is None:
+        return await attempt(None)
+    return _with_info(url, *await retry.call_async(attempt, _status_of_result))
+
 
+async def _fetch_async_raw(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    limiter: Optional[HostLimiter] = None,
+    timeout: Optional[float] = None,
+    sent: Optional[Callable[[], None]] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Send one GET and return (status_code, headers, body); sent() is called first."""
+    if limiter is not None:
+        async with limiter.limit_async(url):
+            return await _fetch_async_raw(session, url, headers, timeout=timeout, sent=sent)
+    if sent is not None:
+        sent()
+    async with session.get(url, headers=headers, **_aiohttp_timeout(timeout)) as response:
+        body = await response.read()
+        return response.status, dict(response.headers), body
 
-def fetch_multiprocess(urls: List[str], max_workers: int = 4) -> List[Dict]:
+
+async def _fetch_async_streamed(
+    session: aiohttp.ClientSession,
+    url: str,
+    stream: BodyStream,
+    limiter: Optional[HostLimiter] = None,
+    timeout: Optional[float] = None,
+    sent: Optional[Callable[[], None]] = None,
+) -> Dict:
+    """Send one GET and feed its body to stream's parser chunk by chunk."""
+    if limiter is not None:
+        async with limiter.limit_async(url):
+            return await _fetch_async_streamed(session, url, stream, timeout=timeout, sent=sent)
+    if sent is not None:
+        sent()
+    async with session.get(url, **_aiohttp_timeout(timeout)) as response:
+        parsed = await stream.consume_async(response.content.iter_chunked(stream.chunk_size))
+        return {"url": url, "status_code": response.status, **parsed}
+
+
+def _aiohttp_timeout(timeout: Optional[float]) -> Dict[str, Any]:
+    """Keyword arguments for session.get() (empty = the session's default)."""
+    if timeout is None:
+        return {}
+    return {"timeout": aiohttp.ClientTimeout(total=timeout)}
+
+
+def fetch_multiprocess(
+    urls: List[str],
+    max_workers: int = 4,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    chunk_size: Optional[int] = None,
+    chunk_mode: str = "threaded",
+    chunk_concurrency: int = 10,
+    retry: Optional[RetryPolicy] = None,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> List[Dict]:
     """
     Fetch URLs using a process pool.
 
@@ -114,26 +2147,437 @@ def fetch_multiprocess(urls: List[str], max_workers: int = 4) -> List[Dict]:
 
     Note: For pure network I/O, threading or async is usually better.
 
+    A limiter and cache are applied in the parent process as URLs are
+    submitted, so limits hold across all worker processes and fresh cache
+    hits never reach the pool. With a limiter, at most max_workers tasks are
+    outstanding, so a URL takes its token and slot only once a worker is
+    free to send it, and while a host is at its cap or out of tokens, URLs
+    for other hosts are submitted ahead of its queued ones.
+
+    With chunk_size set, each task sent to a worker process is a chunk of
+    URLs instead of a single URL, and the worker fetches its chunk with a
+    thread pool or an asyncio event loop (chunk_mode), returning the whole
+    batch at once. This cuts pickling and round-trips to one per chunk and
+    runs many requests per core. A limiter can't be consulted from the
+    parent per URL in this mode, so each worker applies a copy whose rates
+    and caps are divided by max_workers (see HostLimiter.scaled()).
+
     Args:
         urls: List of URLs to fetch
         max_workers: Maximum number of worker processes (default 4)
+        limiter: Optional HostLimiter applying per-host rate limits and
+            concurrency caps
+        cache: Optional ResponseCache; results then also carry a 'cache' key
+        stream: Optional BodyStream to parse bodies incrementally in the
+            workers (its parser factory must be picklable)
+        chunk_size: URLs per task sent to a worker (None = one URL per task)
+        chunk_mode: How a worker fetches its chunk: 'threaded' or 'async'
+        chunk_concurrency: Threads or concurrent requests per worker when
+            chunking
+        retry: Optional RetryPolicy; failed URLs then come back as error
+            records instead of raising
+        dedupe: Fetch each normalized URL (see normalize_url()) once and
+            copy its result to every equivalent input URL
+        timed: Add 'latency_seconds' to each result: client-side wall time
+            from a worker starting that URL's fetch to its result (or of the
+            parent's cache lookup for a fresh hit), including limiter waits
+            inside chunks and retries
 
     Returns:
         List of dictionaries with 'url' and 'status_code' keys for each URL
 
     Raises:
-        requests.RequestException: If any request fails
+        requests.RequestException: If any request fails (without retry)
+        ValueError: If chunk_mode is not 'threaded' or 'async', or if both
+            cache and stream are given
 
     Example:
         results = fetch_multiprocess(urls, max_workers=4)
+        results = fetch_multiprocess(urls, max_workers=8, chunk_size=200,
+                                     chunk_mode='async', chunk_concurrency=50)
+    """
+    _check_stream_options(cache, stream)
+    if dedupe:
+        return _fetch_deduplicated(urls, lambda unique: fetch_multiprocess(
+            unique, max_workers=max_workers, limiter=limiter, cache=cache, stream=stream,
+            chunk_size=chunk_size, chunk_mode=chunk_mode, chunk_concurrency=chunk_concurrency,
+            retry=retry, timed=timed))
+    if not urls:
+        return []
+    run = _start_retry(retry)
+    if chunk_size is not None:
+        return _fetch_multiprocess_chunked(urls, max_workers, limiter, cache, stream,
+                                           chunk_size, chunk_mode, chunk_concurrency, run,
+                                           timed)
+    fetch_one = functools.partial(_Timed(_fetch_single_url) if timed else _fetch_single_url,
+                                  stream=stream, retry=run)
+    fetch_raw = _Timed(_fetch_raw_retrying) if timed else _fetch_raw_retrying
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        if limiter is None and cache is None:
+            return list(executor.map(fetch_one, urls))
+        results: List[Optional[Dict]] = [None] * len(urls)
+        entries: Dict[int, Optional[CachedResponse]] = {}
+        to_submit = []  # (index, url) of URLs that need a request
+        for i, url in enumerate(urls):
+            if cache is not None:
+                entry, results[i] = _lookup_timed(cache, url, timed)
+                if results[i] is not None:
+                    continue
+                entries[i] = entry
+            to_submit.append((i, url))
+
+        def submit(i: int, url: str) -> Future:
+            if cache is None:
+                return executor.submit(fetch_one, url)
+            entry = entries[i]
+            validators = entry.validators() if entry is not None else None
+            return executor.submit(fetch_raw, url, validators, retry=run)
+
+        futures = {}
+        if limiter is None:
+            for i, url in to_submit:
+                futures[i] = submit(i, url)
+        else:
+            scheduler = _HostScheduler(to_submit, limiter)
+            outstanding = set()
+            while True:
+                if len(outstanding) >= max_workers:
+                    # Tasks queued in the pool would spend their tokens long before they run.
+                    _, outstanding = wait(outstanding, return_when=FIRST_COMPLETED)
+                item = scheduler.take()
+                if item is None:
+                    break
+                i, url = item
+                try:
+                    future = submit(i, url)
+                except BaseException:
+                    scheduler.release(url)
+                    raise
+                future.add_done_callback(lambda _, url=url: scheduler.release(url))
+                futures[i] = future
+                outstanding.add(future)
+
+        for i, future in futures.items():
+            if cache is None:
+                results[i] = future.result()
+            else:
+                results[i] = _raw_result(urls[i], *future.result(), cache, entries[i])
+        return results
+
+
+def _fetch_multiprocess_chunked(
+    urls: List[str],
+    max_workers: int,
+    limiter: Optional[HostLimiter],
+    cache: Optional[ResponseCache],
+    stream: Optional[BodyStream],
+    chunk_size: int,
+    chunk_mode: str,
+    chunk_concurrency: int,
+    retry: Optional[_RetryRun] = None,
+    timed: bool = False,
+) -> List[Dict]:
+    """Chunked dispatch for fetch_multiprocess()."""
+    if chunk_mode not in ("threaded", "async"):
+        raise ValueError(f"chunk_mode must be 'threaded' or 'async', not {chunk_mode!r}")
+    results: List[Optional[Dict]] = [None] * len(urls)
+    entries: Dict[int, Optional[CachedResponse]] = {}
+    requests_to_send = []  # (index, url, conditional headers)
+    for i, url in enumerate(urls):
+        validators = None
+        if cache is not None:
+            entry, results[i] = _lookup_timed(cache, url, timed)
+            if results[i] is not None:
+                continue
+            entries[i] = entry
+            validators = entry.validators() if entry is not None else None
+        requests_to_send.append((i, url, validators))
+
+    worker_limits = None
+    if limiter is not None:
+        scaled = limiter.scaled(1 / max_workers)
+        worker_limits = (scaled.default, scaled.per_host)
+
+    chunks = [requests_to_send[i:i + chunk_size]
+              for i in range(0, len(requests_to_send), chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_fetch_chunk, [(url, validators) for _, url, validators in chunk],
+                            chunk_mode, chunk_concurrency, worker_limits, stream, retry, timed)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            for (i, url, _), fetched in zip(chunk, future.result()):
+                if stream is not None:
+                    results[i] = fetched
+                else:
+                    results[i] = _raw_result(url, *fetched, cache, entries.get(i))
+    return results
+
+
+def _fetch_chunk(
+    requests_to_send: List[Tuple[str, Optional[Dict[str, str]]]],
+    mode: str,
+    concurrency: int,
+    limits: Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[_RetryRun] = None,
+    timed: bool = False,
+) -> List[Any]:
+    """
+    Fetch a chunk of (url, conditional headers) pairs inside a worker process.
+
+    Module-level so fetch_multiprocess can send it to worker processes.
+
+    Returns:
+        ((status_code, headers, body) or None, retry info) for each pair, in
+        order, or result dictionaries if stream is set
+    """
+    limiter = HostLimiter(*limits) if limits is not None else None
+    if mode == "async":
+        return asyncio.run(_fetch_chunk_async(requests_to_send, concurrency, limiter, stream,
+                                              retry, timed))
+
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def fetch(item: Tuple[str, Optional[Dict[str, str]]]) -> Any:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = make_session()
+            local.session = session
+            with sessions_lock:
+                sessions.append(session)
+        url, headers = item
+        if stream is not None:
+            return _fetch_streamed_retrying(url, stream, session, limiter, retry)
+        return _fetch_raw_retrying(url, headers, session, limiter, retry)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(_Timed(fetch) if timed else fetch, requests_to_send))
+    finally:
+        for session in sessions:
+            session.close()
+
+
+async def _fetch_chunk_async(
+    requests_to_send: List[Tuple[str, Optional[Dict[str, str]]]],
+    concurrency: int,
+    limiter: Optional[HostLimiter] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[_RetryRun] = None,
+    timed: bool = False,
+) -> List[Any]:
+    """Event-loop half of _fetch_chunk()."""
+    fetch_streamed = _fetch_async_streamed_retrying
+    fetch_raw = _fetch_async_raw_retrying
+    if timed:
+        fetch_streamed, fetch_raw = _timed_async(fetch_streamed), _timed_async(fetch_raw)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        if stream is not None:
+            return list(await asyncio.gather(
+                *(fetch_streamed(session, url, stream, limiter, retry)
+                  for url, _ in requests_to_send)))
+        return list(await asyncio.gather(
+            *(fetch_raw(session, url, headers, limiter, retry)
+              for url, headers in requests_to_send)))
+
+
+# fetch_auto() tuning: a response is CPU-bound when its CPU time is at least
+# this fraction of its latency; async is chosen once the concurrency needed to
+# hide latency exceeds the thread budget.
+AUTO_SAMPLE_SIZE = 8
+AUTO_CPU_BOUND_FRACTION = 0.5
+AUTO_MAX_ASYNC_CONCURRENCY = 500
+
+
+def choose_strategy(
+    latency: float,
+    cpu_per_response: float,
+    remaining: int,
+    max_workers: int = 32,
+    cpu_count: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Pick a concurrency model and worker count from sampled measurements.
+
+    - CPU-bound responses (CPU time >= AUTO_CPU_BOUND_FRACTION of latency)
+      go to a process pool with one worker per core, since threads and
+      coroutines would serialize on the GIL.
+    - Otherwise the work is I/O-bound and needs about latency / cpu
+      requests in flight to keep one core busy (Little's law). Threads are
+      used up to max_workers; beyond that, async is cheaper per request.
+
+    Args:
+        latency: Mean seconds per response in the sample
+        cpu_per_response: Mean CPU seconds spent per response in the sample
+        remaining: Number of URLs left to fetch
+        max_workers: Largest thread pool worth using
+        cpu_count: Available cores (default: os.cpu_count())
+
+    Returns:
+        Dictionary with 'strategy' ('threaded', 'async' or 'multiprocess')
+        and 'workers' (threads, processes or async concurrency)
     """
-    # TODO: Implement multiprocess fetching
-    # Hint: Use ProcessPoolExecutor.map() or submit()
-    # Note: Need a helper function that can be pickled (use module-level function)
-    pass
+    cpu_count = cpu_count or os.cpu_count() or 1
+    remaining = max(1, remaining)
+    cpu_fraction = cpu_per_response / latency if latency > 0 else 1.0
+    if cpu_fraction >= AUTO_CPU_BOUND_FRACTION and cpu_count > 1:
+        return {"strategy": "multiprocess", "workers": min(cpu_count, remaining)}
+    needed = int(latency / cpu_per_response) + 1 if cpu_per_response > 0 else remaining
+    needed = min(needed, remaining)
+    if needed > max_workers:
+        return {"strategy": "async", "workers": min(needed, AUTO_MAX_ASYNC_CONCURRENCY)}
+    return {"strategy": "threaded", "workers": max(1, needed)}
+
+
+def fetch_auto(
+    urls: List[str],
+    sample_size: int = AUTO_SAMPLE_SIZE,
+    max_workers: int = 32,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    on_decision: Optional[Callable[[Dict[str, Any]], None]] = None,
+    retry: Optional[RetryPolicy] = None,
+    dedupe: bool = False,
+    timed: bool = False,
+) -> List[Dict]:
+    """
+    Fetch URLs with whichever concurrency model suits the workload.
+
+    The first `sample_size` URLs are fetched with a small thread pool while
+    measuring mean latency and CPU time per response. choose_strategy() then
+    picks threaded, async or multiprocess execution (and its worker count)
+    for the rest of the URLs.
+
+    Args:
+        urls: List of URLs to fetch
+        sample_size: Number of leading URLs used for measurement
+        max_workers: Largest thread pool worth using
+        limiter: Optional HostLimiter, passed to every strategy
+        cache: Optional ResponseCache, passed to every strategy
+        stream: Optional BodyStream, passed to every strategy; parsing time
+            counts towards the sampled CPU per response
+        on_decision: Optional callback receiving the decision: the
+            choose_strategy() result plus the sampled 'latency',
+            'cpu_per_response', 'sample_size' and 'remaining'
+        retry: Optional RetryPolicy, passed to every strategy (its deadline
+            covers the whole call, sample included)
+        dedupe: Normalize and deduplicate URLs before sampling, then copy
+            results back to every equivalent input URL
+        timed: Add 'latency_seconds' to each result (see the chosen
+            strategy's timed option)
+
+    Returns:
+        List of dictionaries with 'url' and 'status_code' keys for each URL,
+        in input order
+
+    Raises:
+        ValueError: If sample_size is less than 1, or if both cache and
+            stream are given
+
+    Example:
+        decisions = []
+        results = fetch_auto(urls, on_decision=decisions.append)
+    """
+    _check_stream_options(cache, stream)
+    if sample_size < 1:
+        raise ValueError(f"sample_size must be at least 1, not {sample_size}")
+    if dedupe:
+        return _fetch_deduplicated(urls, lambda unique: fetch_auto(
+            unique, sample_size=sample_size, max_workers=max_workers, limiter=limiter,
+            cache=cache, stream=stream, on_decision=on_decision, retry=retry, timed=timed))
+    if not urls:
+        return []
+    sample, rest = urls[:sample_size], urls[sample_size:]
+
+    run = _start_retry(retry)
+    latencies = []
+
+    def timed(url: str) -> Dict:
+        start = time.perf_counter()
+        result = _fetch_single_url(url, limiter=limiter, cache=cache, stream=stream, retry=run)
+        latencies.append(time.perf_counter() - start)
+        return _add_latency(result, latencies[-1]) if timed else result
+
+    cpu_start = time.process_time()
+    with ThreadPoolExecutor(max_workers=min(len(sample), max_workers)) as executor:
+        results = list(executor.map(timed, sample))
+    cpu_per_response = (time.process_time() - cpu_start) / len(sample)
+    latency = sum(latencies) / len(latencies)
+
+    decision = choose_strategy(latency, cpu_per_response, len(rest), max_workers)
+    decision.update({
+        "latency": latency,
+        "cpu_per_response": cpu_per_response,
+        "sample_size": len(sample),
+        "remaining": len(rest),
+    })
+    if decision["strategy"] == "async" and _in_event_loop():
+        # asyncio.run() can't be nested; fall back to the largest thread pool.
+        decision.update({"strategy": "threaded", "workers": max_workers})
+    if on_decision is not None:
+        on_decision(decision)
+    if not rest:
+        return results
+
+    if run is not None and run.deadline_at is not None:
+        # The chosen strategy starts a new batch; give it only what is left.
+        retry = dataclasses.replace(retry, deadline=max(0.0, run.remaining()))
+    workers = decision["workers"]
+    if decision["strategy"] == "multiprocess":
+        results += fetch_multiprocess(rest, max_workers=workers, limiter=limiter,
+                                      cache=cache, stream=stream, retry=retry, timed=timed)
+    elif decision["strategy"] == "async":
+        results += asyncio.run(_fetch_async_ordered(rest, workers, limiter, cache, stream,
+                                                    retry, timed))
+    else:
+        results += fetch_threaded(rest, max_workers=workers, pooled=True, limiter=limiter,
+                                  cache=cache, stream=stream, retry=retry, timed=timed)
+    return results
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
 
 
-def _fetch_single_url(url: str) -> Dict:
+async def _fetch_async_ordered(
+    urls: List[str],
+    concurrency: int,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[RetryPolicy] = None,
+    timed: bool = False,
+) -> List[Dict]:
+    """Run fetch_async_stream() and put its results back in input order."""
+    positions: Dict[str, List[int]] = {}
+    for i, url in enumerate(urls):
+        positions.setdefault(url, []).append(i)
+    results: List[Optional[Dict]] = [None] * len(urls)
+    async for result in fetch_async_stream(urls, concurrency=concurrency,
+                                           limiter=limiter, cache=cache, stream=stream,
+                                           retry=retry, timed=timed):
+        results[positions[result["url"]].pop()] = result
+    return results
+
+
+def _fetch_single_url(
+    url: str,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+    stream: Optional[BodyStream] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Dict:
     """
     Helper function to fetch a single URL.
 
@@ -142,10 +2586,543 @@ def _fetch_single_url(url: str) -> Dict:
 
     Args:
         url: URL to fetch
+        session: Optional requests.Session to reuse pooled connections
+        limiter: Optional HostLimiter to wait on before sending the request
+        cache: Optional ResponseCache to serve or revalidate from
+        stream: Optional BodyStream to parse the body incrementally
+        retry: Optional retry state from RetryPolicy.start()
+
+    Returns:
+        Dictionary with 'url' and 'status_code' (and 'cache' if cache is set)
+    """
+    if stream is not None:
+        return _fetch_streamed_retrying(url, stream, session, limiter, retry)
+    entry = None
+    validators = None
+    if cache is not None:
+        entry, fresh = cache.lookup(url)
+        if fresh:
+            return cache.hit(entry)
+        validators = entry.validators() if entry is not None else None
+    raw, info = _fetch_raw_retrying(url, validators, session, limiter, retry)
+    return _raw_result(url, raw, info, cache, entry)
+
+
+def _fetch_raw_retrying(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostLimiter] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Tuple[Optional[Tuple[int, Dict[str, str], bytes]], Dict[str, Any]]:
+    """
+    _fetch_raw() under a retry policy; returns (response or None, info).
+
+    Module-level so fetch_multiprocess can run it in worker processes.
+    """
+    def attempt(timeout: Optional[float],
+                sent: Optional[Callable[[], None]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        with _exclusive_session(session) as own:
+            return _fetch_raw(url, headers, own, limiter, timeout, sent)
+
+    if retry is None:
+        return attempt(None), {}
+    return retry.call(attempt, _status_of_raw)
+
+
+def _fetch_streamed_retrying(
+    url: str,
+    stream: BodyStream,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostLimiter] = None,
+    retry: Optional[_RetryRun] = None,
+) -> Dict:
+    """_fetch_streamed() under a retry policy."""
+    def attempt(timeout: Optional[float],
+                sent: Optional[Callable[[], None]] = None) -> Dict:
+        with _exclusive_session(session) as own:
+            return _fetch_streamed(url, stream, own, limiter, timeout, sent)
+
+    if retry is None:
+        return attempt(None)
+    return _with_info(url, *retry.call(attempt, _status_of_result))
+
+
+def _fetch_raw(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostLimiter] = None,
+    timeout: Optional[float] = None,
+    sent: Optional[Callable[[], None]] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Send one GET and return (status_code, headers, body); sent() is called first."""
+    if limiter is not None:
+        with limiter.limit(url):
+            return _fetch_raw(url, headers, session, timeout=timeout, sent=sent)
+    if sent is not None:
+        sent()
+    getter = session.get if session is not None else requests.get
+    response = getter(url, headers=headers, timeout=timeout)
+    return response.status_code, dict(response.headers), response.content
+
+
+_session_locks: "weakref.WeakKeyDictionary[requests.Session, threading.Lock]" = (
+    weakref.WeakKeyDictionary())
+_session_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _exclusive_session(session: Optional[requests.Session]):
+    """
+    Yield session, or a throwaway session configured like it if another
+    thread is using it (requests.Session isn't thread-safe). That happens
+    when a hedged request and its duplicate race, or when the loser of such
+    a race is still running as its worker moves on.
+    """
+    if session is None:
+        yield None
+        return
+    with _session_locks_guard:
+        lock = _session_locks.setdefault(session, threading.Lock())
+    if lock.acquire(blocking=False):
+        try:
+            yield session
+        finally:
+            lock.release()
+        return
+    adapter = session.get_adapter("http://")
+    with make_session(resolver=getattr(adapter, "resolver", None),
+                      keep_alive="close" not in session.headers.get("Connection", "")) as own:
+        yield own
+
+
+def _fetch_streamed(
+    url: str,
+    stream: BodyStream,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostLimiter] = None,
+    timeout: Optional[float] = None,
+    sent: Optional[Callable[[], None]] = None,
+) -> Dict:
+    """Send one GET and feed its body to stream's parser chunk by chunk."""
+    if limiter is not None:
+        with limiter.limit(url):
+            return _fetch_streamed(url, stream, session, timeout=timeout, sent=sent)
+    if sent is not None:
+        sent()
+    getter = session.get if session is not None else requests.get
+    with getter(url, stream=True, timeout=timeout) as response:
+        parsed = stream.consume(response.iter_content(stream.chunk_size))
+        return {"url": url, "status_code": response.status_code, **parsed}
+
+
+# ---------------------------------------------------------------------------
+# Offline benchmarking: a local mock server and a strategy benchmark runner
+# ---------------------------------------------------------------------------
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class MockServer:
+    """
+    Local aiohttp server that simulates remote hosts for offline benchmarks.
+
+    The server runs its own event loop in a background thread, so any
+    fetch function (including the async ones) can be pointed at it from the
+    calling thread. Every GET, whatever its path, answers after a latency
+    drawn from the configured distribution. The answer is either
+    `payload_bytes` of body or, with probability `error_rate`, an
+    `error_status` response.
+
+    Latency distributions (`latency` is the mean, in seconds):
+    - 'fixed': always `latency`
+    - 'uniform': uniform between 0 and 2 * latency
+    - 'exponential': exponential with mean `latency`
+    - 'lognormal': heavy-tailed lognormal (sigma 1) with mean `latency`
+    - a callable taking a random.Random and returning seconds
+
+    Args:
+        latency: Mean response latency in seconds
+        latency_distribution: One of LATENCY_DISTRIBUTIONS, or a callable
+        payload_bytes: Body size, or a (min, max) range drawn uniformly
+        error_rate: Fraction of requests answered with error_status
+        error_status: Status code used for injected errors
+        seed: Seed for latency, payload and error draws (reproducible runs)
+        host: Interface to bind
+        port: Port to bind (0 = any free port)
+
+    Raises:
+        ValueError: If latency_distribution is unknown or error_rate is
+            outside [0, 1]
+
+    Example:
+        with MockServer(latency=0.05, latency_distribution='lognormal',
+                        error_rate=0.01, seed=1) as server:
+            results = fetch_threaded(server.urls(200), max_workers=20)
+            print(server.stats())
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_distribution: Union[str, Callable[[random.Random], float]] = "fixed",
+        payload_bytes: Union[int, Tuple[int, int]] = 1024,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if not callable(latency_distribution) and latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS} "
+                             f"or a callable, not {latency_distribution!r}")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.payload_bytes = payload_bytes
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.host = host
+        self.port = port
+        self.base_url: Optional[str] = None
+        self._rng = random.Random(seed)
+        largest = payload_bytes if isinstance(payload_bytes, int) else payload_bytes[1]
+        self._payload = (b"0123456789" * (largest // 10 + 1))[:largest]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._startup_error: Optional[BaseException] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Clear request counters, latencies and the connection high-water mark."""
+        self.requests = 0
+        self.errors = 0
+        self.peak_connections = 0
+        self._latencies: List[float] = []
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Server-side counters since the last reset_stats().
+
+        Returns:
+            Dictionary with 'requests', 'errors', 'peak_connections' (most
+            client connections open at once) and 'p50_latency_ms' /
+            'p99_latency_ms' (time from a request arriving to its response
+            being sent; None before the first request)
+        """
+        p50, p99 = _p50_p99_ms(self._latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "peak_connections": self.peak_connections,
+            "p50_latency_ms": p50,
+            "p99_latency_ms": p99,
+        }
+
+    def url(self, path: str = "/") -> str:
+        if self.base_url is None:
+            raise RuntimeError("MockServer is not running; call start() first")
+        return self.base_url + path
+
+    def urls(self, count: int) -> List[str]:
+        """`count` distinct URLs on this server."""
+        return [self.url(f"/item/{i}") for i in range(count)]
+
+    def start(self) -> "MockServer":
+        """Start serving in a background thread; returns self."""
+        if self._thread is not None:
+            raise RuntimeError("MockServer is already running")
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._serve, args=(ready,),
+                                        name="mock-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._startup_error is not None:
+            self._thread.join()
+            self._thread = None
+            raise self._startup_error
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close every connection."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self.base_url = None
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _serve(self, ready: threading.Event) -> None:
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._setup())
+        except BaseException as exc:
+            self._startup_error = exc
+            loop.close()
+            ready.set()
+            return
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self._runner.cleanup())
+            loop.close()
+
+    async def _setup(self) -> None:
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+
+    def _draw_latency(self) -> float:
+        mean = self.latency
+        distribution = self.latency_distribution
+        if callable(distribution):
+            return max(0.0, distribution(self._rng))
+        if mean <= 0 or distribution == "fixed":
+            return max(0.0, mean)
+        if distribution == "uniform":
+            return self._rng.uniform(0, 2 * mean)
+        if distribution == "exponential":
+            return self._rng.expovariate(1 / mean)
+        return self._rng.lognormvariate(math.log(mean) - 0.5, 1.0)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        start = time.perf_counter()
+        self.requests += 1
+        self.peak_connections = max(self.peak_connections, len(self._runner.server.connections))
+        delay = self._draw_latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            response = web.Response(status=self.error_status, body=b"injected error")
+        else:
+            size = self.payload_bytes
+            if not isinstance(size, int):
+                size = self._rng.randint(*size)
+            response = web.Response(body=self._payload[:size])
+        # Record before sending, so a client that has its response also sees it counted.
+        self._latencies.append(time.perf_counter() - start)
+        await response.prepare(request)
+        await response.write_eof()
+        return response
+
+
+# Strategies benchmark_scraper() can run: name -> fn(urls, workers) -> results
+# (with 'latency_seconds', see timed=True).
+# Strategies listed in _FIXED_CONCURRENCY_STRATEGIES ignore `workers`.
+SCRAPER_STRATEGIES: Dict[str, Callable[[List[str], int], List[Dict]]] = {
+    "sequential": lambda urls, workers: fetch_sequential(urls, pooled=True, timed=True),
+    "threaded": lambda urls, workers: fetch_threaded(urls, max_workers=workers, timed=True),
+    "threaded_pooled": lambda urls, workers: fetch_threaded(urls, max_workers=workers,
+                                                            pooled=True, timed=True),
+    "async": lambda urls, workers: asyncio.run(fetch_async(urls, timed=True)),
+    "async_stream": lambda urls, workers: asyncio.run(_fetch_async_ordered(urls, workers,
+                                                                           timed=True)),
+    "multiprocess": lambda urls, workers: fetch_multiprocess(urls, max_workers=workers,
+                                                             timed=True),
+}
+_FIXED_CONCURRENCY_STRATEGIES = {"sequential", "async"}
+
+
+def _p50_p99_ms(latencies: List[float]) -> Tuple[Optional[float], Optional[float]]:
+    """Median and 99th percentile of latencies in seconds, in milliseconds
+    (None without samples)."""
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else None
+        return value, value
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Not Linux: fall back to the lifetime peak, in KiB (bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def _sample_peak_rss(interval: float = 0.01):
+    """Sample this process's RSS in a background thread; yields a dict whose
+    'peak' key holds the highest value seen (None if unavailable)."""
+    sample = {"peak": _current_rss()}
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval):
+            rss = _current_rss()
+            if rss is not None and (sample["peak"] is None or rss > sample["peak"]):
+                sample["peak"] = rss
+
+    thread = threading.Thread(target=run, name="rss-sampler", daemon=True)
+    thread.start()
+    try:
+        yield sample
+    finally:
+        stop.set()
+        thread.join()
+
+
+def benchmark_scraper(
+    server: MockServer,
+    strategy: str = "threaded",
+    workers: int = 5,
+    num_urls: int = 100,
+) -> Dict[str, Any]:
+    """
+    Fetch `num_urls` distinct URLs from a running MockServer with one strategy.
+
+    Args:
+        server: Running MockServer (its stats are reset first)
+        strategy: Key of SCRAPER_STRATEGIES
+        workers: Threads, processes or async concurrency for the strategy
+        num_urls: Number of URLs to fetch
 
     Returns:
-        Dictionary with 'url' and 'status_code'
+        Dictionary with 'strategy', 'workers' (None for strategies with
+        fixed concurrency), 'urls', 'elapsed_seconds', 'requests_per_sec',
+        'p50_latency_ms' and 'p99_latency_ms' (per request as the client
+        sees it, from each result's 'latency_seconds'; None if no result
+        carried one),
+        'server_p50_latency_ms' and 'server_p99_latency_ms' (handler time,
+        see MockServer.stats()), 'errors' (results that are not 2xx),
+        'peak_rss_mb' (this process; worker processes are not included)
+        and 'peak_connections' (sockets open to the server at once, across
+        all processes)
+
+    Raises:
+        KeyError: If strategy is not in SCRAPER_STRATEGIES
+    """
+    fetch = SCRAPER_STRATEGIES[strategy]
+    urls = server.urls(num_urls)
+    server.reset_stats()
+    with _sample_peak_rss() as rss:
+        start = time.perf_counter()
+        results = fetch(urls, workers)
+        elapsed = time.perf_counter() - start
+    stats = server.stats()
+    p50, p99 = _p50_p99_ms([r["latency_seconds"] for r in results if "latency_seconds" in r])
+    return {
+        "strategy": strategy,
+        "workers": None if strategy in _FIXED_CONCURRENCY_STRATEGIES else workers,
+        "urls": num_urls,
+        "elapsed_seconds": elapsed,
+        "requests_per_sec": num_urls / elapsed if elapsed > 0 else float("inf"),
+        "p50_latency_ms": p50,
+        "p99_latency_ms": p99,
+        "server_p50_latency_ms": stats["p50_latency_ms"],
+        "server_p99_latency_ms": stats["p99_latency_ms"],
+        "errors": sum(1 for r in results if not 200 <= (r["status_code"] or 0) < 300),
+        "peak_rss_mb": rss["peak"] / 2 ** 20 if rss["peak"] is not None else None,
+        "peak_connections": stats["peak_connections"],
+    }
+
+
+def run_scraper_benchmarks(
+    strategies: Optional[Iterable[str]] = None,
+    worker_counts: Iterable[int] = (1, 2, 4, 8, 16, 32),
+    num_urls: int = 100,
+    server_options: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     """
-    # TODO: Implement single URL fetch
-    # Hint: Use requests.get() and return dict with 'url' and 'status_code'
-    pass
+    Sweep strategies over worker counts against one local MockServer.
+
+    Args:
+        strategies: Names from SCRAPER_STRATEGIES (default: all)
+        worker_counts: Worker counts to try; strategies with fixed
+            concurrency run once
+        num_urls: URLs fetched per run
+        server_options: Keyword arguments for MockServer (latency,
+            latency_distribution, payload_bytes, error_rate, seed, ...)
+
+    Returns:
+        list: One benchmark_scraper() result dict per run, ready to be
+        serialized with json.dump()
+
+    Example:
+        results = run_scraper_benchmarks(['threaded', 'async_stream'], (8, 64),
+                                         num_urls=500,
+                                         server_options={'latency': 0.05})
+    """
+    if strategies is None:
+        strategies = SCRAPER_STRATEGIES
+    results = []
+    with MockServer(**(server_options or {})) as server:
+        for strategy in strategies:
+            counts = list(worker_counts)
+            if strategy in _FIXED_CONCURRENCY_STRATEGIES:
+                counts = counts[:1]
+            for workers in counts:
+                results.append(benchmark_scraper(server, strategy, workers, num_urls))
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark task2 fetch strategies against a local mock server.")
+    parser.add_argument("--strategies", nargs="+", choices=list(SCRAPER_STRATEGIES),
+                        default=list(SCRAPER_STRATEGIES), help="strategies to run (default: all)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="worker counts to try (default: 1 2 4 8 16 32)")
+    parser.add_argument("--urls", type=int, default=100, help="URLs per run (default: 100)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="mean server latency in seconds (default: 0.05)")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed",
+                        help="server latency distribution (default: fixed)")
+    parser.add_argument("--payload", type=int, default=1024,
+                        help="response body size in bytes (default: 1024)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 503 (default: 0)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+
+    results = run_scraper_benchmarks(
+        args.strategies, args.workers, args.urls,
+        {"latency": args.latency, "latency_distribution": args.distribution,
+         "payload_bytes": args.payload, "error_rate": args.error_rate, "seed": args.seed})
+
+    print(f"{'strategy':<18}{'workers':>8}{'req/sec':>10}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'srv p99':>9}{'errors':>8}{'rss MB':>9}{'sockets':>9}")
+    def cell(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "-"
+
+    for r in results:
+        print(f"{r['strategy']:<18}{r['workers'] or '-':>8}{r['requests_per_sec']:>10,.0f}"
+              f"{cell(r['p50_latency_ms']):>9}{cell(r['p99_latency_ms']):>9}"
+              f"{cell(r['server_p99_latency_ms']):>9}{r['errors']:>8}"
+              f"{cell(r['peak_rss_mb']):>9}{r['peak_connections']:>9}")
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -8,6 +8,7 @@ Architecture:
 - Each stage has one or more worker threads
 - Data flows from one stage to the next via queues
 - Stages operate concurrently, with data buffering between them
+- Stages may also fan out to and join from several others (a DAG)
 
 Use Cases:
 - ETL (Extract, Transform, Load) pipelines
@@ -20,17 +21,33 @@ Your implementation must handle:
 - Configurable workers per stage
 """
 
+import asyncio
+import multiprocessing
 import queue
 import threading
-from typing import Callable, List, Any, Optional
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+
+# Tells a worker to exit; each worker consumes exactly one.
+_SENTINEL = object()
 
 
 class ProducerConsumer:
     """
-    A simple producer-consumer queue wrapper.
+    A simple producer-consumer queue.
 
-    This class encapsulates queue.Queue and provides methods for producing
-    and consuming items with optional timeouts.
+    A FIFO of items kept in a deque and guarded by one lock with 'not
+    empty' and 'not full' conditions; it behaves like queue.Queue and
+    raises queue.Full / queue.Empty on timeouts, and its bulk operations
+    move whole runs of items per lock acquisition.
+
+    A bounded queue (maxsize > 0) applies backpressure: produce() blocks
+    while the queue is full, so a fast producer is slowed to the pace of
+    its consumers instead of piling items up in memory. Time producers
+    spend blocked is recorded and reported by backpressure().
     """
 
     def __init__(self, maxsize: int = 0):
@@ -38,10 +55,20 @@ class ProducerConsumer:
         Initialize the producer-consumer queue.
 
         Args:
-            maxsize: Maximum queue size (0 = unlimited, which is recommended)
+            maxsize: Maximum queue size (0 = unlimited). Bound it whenever
+                producers can outpace consumers for long.
         """
-        # TODO: Initialize a queue.Queue with the given maxsize
-        pass
+        self.maxsize = maxsize
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._stats_lock = threading.Lock()
+        self._blocked_puts = 0
+        self._blocked_seconds = 0.0
+
+    def _has_room(self) -> bool:
+        return self.maxsize <= 0 or len(self._items) < self.maxsize
 
     def produce(self, item: Any, timeout: Optional[float] = None) -> None:
         """
@@ -54,8 +81,18 @@ class ProducerConsumer:
         Raises:
             queue.Full: If timeout expires and queue is full
         """
-        # TODO: Put item on queue with optional timeout
-        pass
+        with self._not_full:
+            if not self._has_room():
+                start = time.perf_counter()
+                try:
+                    if not self._not_full.wait_for(self._has_room, timeout):
+                        raise queue.Full
+                finally:
+                    with self._stats_lock:
+                        self._blocked_puts += 1
+                        self._blocked_seconds += time.perf_counter() - start
+            self._items.append(item)
+            self._not_empty.notify()
 
     def consume(self, timeout: Optional[float] = None) -> Any:
         """
@@ -70,8 +107,91 @@ class ProducerConsumer:
         Raises:
             queue.Empty: If timeout expires before item is available
         """
-        # TODO: Get item from queue with optional timeout
-        pass
+        with self._not_empty:
+            if not self._not_empty.wait_for(self._items.__len__, timeout):
+                raise queue.Empty
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def produce_many(self, items: List[Any], timeout: Optional[float] = None) -> None:
+        """
+        Add several items, taking the queue's lock once per run of free space
+        instead of once per item.
+
+        Args:
+            items: Items to add, in order
+            timeout: Optional timeout in seconds for the whole call
+
+        Raises:
+            queue.Full: If timeout expires while the queue is full; items
+                added before that stay queued
+        """
+        blocked = 0.0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        index = 0
+        try:
+            with self._not_full:
+                while index < len(items):
+                    room = len(items) - index
+                    if self.maxsize > 0:
+                        room = min(room, self.maxsize - len(self._items))
+                    if room > 0:
+                        self._items.extend(items[index:index + room])
+                        index += room
+                        self._not_empty.notify(room)
+                    if index == len(items):
+                        break
+                    start = time.perf_counter()
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Full
+                    self._not_full.wait(remaining)
+                    blocked += time.perf_counter() - start
+        finally:
+            if blocked:
+                with self._stats_lock:
+                    self._blocked_puts += 1
+                    self._blocked_seconds += blocked
+
+    def consume_many(self, max_items: int, timeout: Optional[float] = None,
+                     max_wait: float = 0.0) -> List[Any]:
+        """
+        Remove and return up to max_items items under one lock acquisition.
+
+        Blocks (up to timeout) for the first item, then keeps collecting
+        until max_items are taken or max_wait seconds have passed since the
+        first one. Stops right after a pipeline shutdown sentinel, so each
+        worker still receives exactly one.
+
+        Args:
+            max_items: Largest batch to return
+            timeout: Optional seconds to wait for the first item
+            max_wait: Seconds to wait for more items after the first
+
+        Returns:
+            List of 1 to max_items items, in queue order
+
+        Raises:
+            queue.Empty: If timeout expires before any item is available
+        """
+        pending = self._items
+        items: List[Any] = []
+        with self._not_empty:
+            if not self._not_empty.wait_for(pending.__len__, timeout):
+                raise queue.Empty
+            fill_deadline = time.monotonic() + max_wait
+            while len(items) < max_items:
+                if not pending:
+                    remaining = fill_deadline - time.monotonic()
+                    if remaining <= 0 or not self._not_empty.wait_for(pending.__len__, remaining):
+                        break
+                item = pending.popleft()
+                items.append(item)
+                if item is _SENTINEL:
+                    break
+            self._not_full.notify(len(items))
+        return items
 
     def qsize(self) -> int:
         """
@@ -83,8 +203,261 @@ class ProducerConsumer:
         Returns:
             Approximate number of items in the queue
         """
-        # TODO: Return queue size
-        pass
+        with self._lock:
+            return len(self._items)
+
+    def full(self) -> bool:
+        """Return True if the queue is bounded and (approximately) full."""
+        with self._lock:
+            return not self._has_room()
+
+    def backpressure(self) -> Dict[str, Any]:
+        """
+        Return how much producers have been held back by this queue.
+
+        Returns:
+            Dictionary with 'maxsize', 'depth' (current qsize),
+            'blocked_puts' (produce() calls that found the queue full) and
+            'blocked_seconds' (total time those calls spent waiting)
+        """
+        with self._stats_lock:
+            return {
+                "maxsize": self.maxsize,
+                "depth": self.qsize(),
+                "blocked_puts": self._blocked_puts,
+                "blocked_seconds": self._blocked_seconds,
+            }
+
+
+class _ReorderBuffer:
+    """
+    Puts a stage's results back into input order before they move on.
+
+    In ordered mode items travel as (sequence number, value). Workers hand
+    in the results of each input sequence number (possibly none, if the item
+    was dropped, or several); results are released to the output queue as
+    soon as every earlier input has been handed in, renumbered densely for
+    the next stage.
+
+    A worker whose input is `capacity` or more places ahead of the oldest
+    unfinished input waits, which bounds the buffer. This can't deadlock:
+    queues are FIFO, so the oldest unfinished input is always held by a
+    worker that is not waiting here.
+    """
+
+    def __init__(self, output_queue: ProducerConsumer, capacity: int):
+        self.output_queue = output_queue
+        self.capacity = max(1, capacity)
+        self.high_water = 0
+        self._pending: Dict[int, List[Any]] = {}
+        self._next_in = 0
+        self._next_out = 0
+        self._cond = threading.Condition()
+
+    def put(self, entries: List[Tuple[int, List[Any]]]) -> None:
+        """Hand in (input sequence number, results) pairs."""
+        first = min(seq for seq, _ in entries)
+        with self._cond:
+            while first - self._next_in >= self.capacity:
+                self._cond.wait()
+            self._pending.update(entries)
+            ready = []
+            while self._next_in in self._pending:
+                for result in self._pending.pop(self._next_in):
+                    ready.append((self._next_out, result))
+                    self._next_out += 1
+                self._next_in += 1
+            self.high_water = max(self.high_water, len(self._pending))
+            if ready:
+                # Still under the lock, so releases reach the queue in order.
+                self.output_queue.produce_many(ready)
+                self._cond.notify_all()
+
+
+class _Router:
+    """
+    Output side of a stage feeding several downstream stages.
+
+    Looks like a ProducerConsumer to the stage's workers. Without a key,
+    every item goes to every target (the same object, so branches must not
+    mutate it); with one, each item goes to targets[hash(key(value)) % n],
+    so equal keys always reach the same branch. Tagged items are routed on
+    their value. A value whose key can't be computed or hashed is passed to
+    on_error(value, exc) and dropped (raised if on_error is None).
+    """
+
+    def __init__(self, targets: List[Any], key: Optional[Callable[[Any], Any]] = None,
+                 tagged: bool = False,
+                 on_error: Optional[Callable[[Any, BaseException], None]] = None):
+        self.targets = targets
+        self.key = key
+        self.tagged = tagged
+        self.on_error = on_error
+
+    def produce(self, item: Any, timeout: Optional[float] = None) -> None:
+        self.produce_many([item], timeout)
+
+    def produce_many(self, items: List[Any], timeout: Optional[float] = None) -> None:
+        if self.key is None:
+            for target in self.targets:
+                target.produce_many(items, timeout)
+            return
+        parts: List[List[Any]] = [[] for _ in self.targets]
+        for item in items:
+            value = item[1] if self.tagged else item
+            try:
+                index = hash(self.key(value)) % len(parts)
+            except Exception as exc:
+                if self.on_error is None:
+                    raise
+                self.on_error(value, exc)
+                continue
+            parts[index].append(item)
+        for target, part in zip(self.targets, parts):
+            if part:
+                target.produce_many(part, timeout)
+
+
+class _ZipJoin:
+    """
+    Input side of a zip join stage: matches up its inputs' results per item.
+
+    Items arrive tagged with the feed() number of the item they came from.
+    Once every input has delivered a result for a tag, (tag, tuple of those
+    results in input order) is put on the join stage's queue. How far one
+    branch can run ahead of another is bounded by the queue sizes of the
+    slower branch, since the stage feeding both blocks on it.
+    """
+
+    def __init__(self, output_queue: ProducerConsumer, num_inputs: int):
+        self.output_queue = output_queue
+        self.num_inputs = num_inputs
+        self._pending: Dict[int, List[List[Any]]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, branch: int, items: List[Tuple[int, Any]]) -> None:
+        """Hand in (tag, result) pairs from input number branch."""
+        ready = []
+        with self._lock:
+            for tag, value in items:
+                slots = self._pending.get(tag)
+                if slots is None:
+                    slots = self._pending[tag] = [[] for _ in range(self.num_inputs)]
+                slots[branch].append(value)
+                if all(slots):
+                    ready.append((tag, tuple(slot.pop(0) for slot in slots)))
+                    if not any(slots):
+                        del self._pending[tag]
+        if ready:
+            self.output_queue.produce_many(ready)
+
+    def incomplete(self) -> List[List[List[Any]]]:
+        """Remove and return the per-input results of tags never completed."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        return pending
+
+
+class _ZipInput:
+    """One input of a _ZipJoin, used as an upstream stage's output queue."""
+
+    def __init__(self, join: _ZipJoin, branch: int):
+        self.join = join
+        self.branch = branch
+
+    def produce(self, item: Any, timeout: Optional[float] = None) -> None:
+        self.join.put(self.branch, [item])
+
+    def produce_many(self, items: List[Any], timeout: Optional[float] = None) -> None:
+        self.join.put(self.branch, items)
+
+
+# Service-time histogram bucket i counts items that took under 2**i µs;
+# the last bucket also takes everything slower (2**31 µs is ~36 minutes).
+_NUM_BUCKETS = 32
+
+# Queue depth samples kept per stage (the oldest are dropped first).
+_DEPTH_HISTORY = 1000
+
+# How often an autoscaling stage's idle workers check whether to retire.
+_RETIRE_POLL = 0.05
+
+# Consecutive idle autoscale checks before a stage gives up a worker.
+_SCALE_DOWN_CHECKS = 3
+
+
+class _WorkerMetrics:
+    """
+    Counters owned by one worker thread.
+
+    Only the owning thread writes them, so the hot path takes no lock;
+    readers sum them across workers and may see a slightly stale view.
+    """
+
+    __slots__ = ("items_in", "items_out", "busy", "idle", "blocked", "max_service", "buckets",
+                 "state")
+
+    def __init__(self):
+        # What the worker is doing now: 'idle', 'busy' or 'blocked'.
+        self.state = "idle"
+        self.items_in = 0
+        self.items_out = 0
+        self.busy = 0.0
+        self.idle = 0.0
+        self.blocked = 0.0
+        self.max_service = 0.0
+        self.buckets = [0] * _NUM_BUCKETS
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Record that count items were processed together in seconds."""
+        self.busy += seconds
+        per_item = seconds / count
+        self.max_service = max(self.max_service, per_item)
+        self.buckets[min(int(per_item * 1e6).bit_length(), _NUM_BUCKETS - 1)] += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_seconds": self.busy,
+            "idle_seconds": self.idle,
+            "blocked_seconds": self.blocked,
+        }
+
+
+def _bucket_percentile(buckets: List[int], pct: float) -> float:
+    """Upper bound in seconds of the bucket holding the pct-th percentile."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = pct / 100 * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if count and seen >= rank:
+            return (1 << i) / 1e6
+    return (1 << (_NUM_BUCKETS - 1)) / 1e6
+
+
+def format_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Render Pipeline.stats() as one line per stage.
+
+    Example:
+        Pipeline(configs, stats_interval=5.0,
+                 on_stats=lambda s: log.info("\\n" + format_stats(s)))
+    """
+    lines = []
+    for name, s in stats.items():
+        service = s["service_time"]
+        lines.append(
+            f"{name}: in={s['items_in']} out={s['items_out']} errors={s['errors']} "
+            f"depth={s['queue_depth']} util={s['utilization']:.0%} "
+            f"p50={service['p50'] * 1000:.3f}ms p99={service['p99'] * 1000:.3f}ms "
+            f"rate={s['throughput']:.1f}/s"
+        )
+    return "\n".join(lines)
 
 
 class PipelineStage:
@@ -96,6 +469,44 @@ class PipelineStage:
     - Applies a transformation function
     - Produces items to an output queue
     - Runs in multiple worker threads for parallelism
+
+    In batch mode (batch_size > 1) each worker takes up to batch_size items
+    at once, waiting at most max_wait_ms for a batch to fill, calls
+    process_func once with the list and puts the returned results on the
+    output queue in one go. This amortizes queue locking when process_func
+    is cheap; the function may return fewer or more results than inputs.
+
+    With executor='process', process_func runs in a pool of num_workers
+    processes instead, so CPU-bound work isn't serialized by the GIL. The
+    stage's threads then only move data: each takes a chunk of up to
+    chunk_size items (or one batch in batch mode), sends it to the pool as
+    a single task and puts the results on the output queue in bulk. Two
+    such threads per process keep a chunk queued while another is being
+    processed. process_func, items and results must be picklable.
+
+    With ordered=True, items arrive as (sequence number, value) pairs and
+    results leave in input order through a reorder buffer holding at most
+    reorder_buffer completed inputs; its peak occupancy is kept in
+    reorder_high_water. A batch function that returns as many results as
+    inputs keeps per-item order; otherwise the batch's results are placed
+    at its first item. With tagged=True items are (tag, value) pairs too,
+    but results simply leave as (tag of their input, result) in completion
+    order; DAG pipelines use this to match up branch results.
+
+    If process_func raises, the item (or batch) is dropped and
+    (item, exception) is appended to `errors`; the worker keeps going.
+
+    Every worker times what it does: waiting for input (idle), running
+    process_func (busy, also fed into a service-time histogram) and waiting
+    for room downstream (blocked). stats() sums these per stage; for
+    process-pool stages busy time is time spent waiting on the pool.
+
+    With max_workers set, the stage autoscales between min_workers and
+    max_workers threads: each autoscale() call adds a worker when the input
+    queue holds at least one item per worker (or is full) and none is idle, and retires
+    one after the queue has stayed empty with idle workers for several calls.
+    Retiring workers finish their current item first. Not supported with
+    executor='process', whose pool size is fixed.
     """
 
     def __init__(
@@ -105,6 +516,16 @@ class PipelineStage:
         process_func: Callable,
         num_workers: int = 1,
         stage_name: str = "Stage",
+        batch_size: int = 1,
+        max_wait_ms: float = 0,
+        executor: str = "thread",
+        chunk_size: int = 16,
+        mp_context: Any = None,
+        ordered: bool = False,
+        reorder_buffer: int = 1024,
+        min_workers: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        tagged: bool = False,
     ):
         """
         Initialize a pipeline stage.
@@ -112,38 +533,448 @@ class PipelineStage:
         Args:
             input_queue: ProducerConsumer to read items from
             output_queue: ProducerConsumer to write items to
-            process_func: Callable that transforms items
+            process_func: Callable that transforms items (a list of items
+                to a list of results when batch_size > 1)
             num_workers: Number of worker threads (default 1)
             stage_name: Name for logging purposes
+            batch_size: Items handed to process_func per call (1 = no
+                batching)
+            max_wait_ms: In batch mode, how long to wait for a batch to fill
+                once its first item has arrived (also used for process-pool
+                chunks)
+            executor: 'thread' (default) or 'process' to run process_func
+                in a process pool of num_workers processes
+            chunk_size: Items sent to a worker process per task when
+                executor is 'process' and batching is off
+            mp_context: Optional multiprocessing context for the process
+                pool, or a start method name such as 'spawn' or 'forkserver'
+                (forking while other stages' threads run can copy held locks)
+            ordered: Expect (sequence number, value) items and emit results
+                in input order
+            reorder_buffer: Most completed inputs held back waiting for an
+                earlier one in ordered mode
+            min_workers: Fewest worker threads when autoscaling (default 1)
+            max_workers: Most worker threads; setting it enables autoscaling,
+                starting from num_workers (clamped to the range)
+            tagged: Expect (tag, value) items and emit (tag, result) pairs
+
+        Raises:
+            ValueError: If executor is not 'thread' or 'process', or
+                autoscaling is requested with an invalid range or with
+                executor='process'
         """
-        # TODO: Store parameters and initialize workers
-        # TODO: Create and start num_workers threads
-        pass
+        if executor not in ("thread", "process"):
+            raise ValueError(f"executor must be 'thread' or 'process', not {executor!r}")
+        if max_workers is not None:
+            min_workers = 1 if min_workers is None else min_workers
+            if not 1 <= min_workers <= max_workers:
+                raise ValueError(f"need 1 <= min_workers <= max_workers, "
+                                 f"got {min_workers} and {max_workers}")
+            if executor == "process":
+                raise ValueError("autoscaling is not supported with executor='process'")
+            num_workers = min(max(num_workers, min_workers), max_workers)
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.process_func = process_func
+        self.num_workers = num_workers
+        self.stage_name = stage_name
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.tagged = tagged
+        self._unwrap = ordered or tagged
+        self.errors: List[tuple] = []
+        self._errors_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._reorder = _ReorderBuffer(output_queue, reorder_buffer) if ordered else None
+        self._worker_metrics: Dict[str, _WorkerMetrics] = {}
+        self.depth_history: deque = deque(maxlen=_DEPTH_HISTORY)
+        self._started = time.perf_counter()
+        self._stopped: Optional[float] = None
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.autoscaling = max_workers is not None
+        self._scale_lock = threading.Lock()
+        self._to_retire = 0
+        self._idle_checks = 0
+        self._closing = False
+        num_threads = num_workers
+        target = self._batch_worker if batch_size > 1 else self._worker
+        if executor == "process":
+            if isinstance(mp_context, str):
+                mp_context = multiprocessing.get_context(mp_context)
+            self._pool = ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context)
+            num_threads = 2 * num_workers
+            target = self._batch_worker
+        self._target = target
+        self._workers: List[threading.Thread] = []
+        for _ in range(num_threads):
+            self._start_worker()
 
-    def _worker(self) -> None:
+    def _start_worker(self) -> None:
+        """Start one more worker thread (callers hold _scale_lock or own the stage)."""
+        name = f"{self.stage_name}-worker-{len(self._worker_metrics)}"
+        metrics = self._worker_metrics[name] = _WorkerMetrics()
+        worker = threading.Thread(target=self._target, args=(metrics,), name=name, daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def _take(self, take: Callable[[Optional[float]], Any]) -> Any:
+        """
+        Wait for input with take(timeout), or return _SENTINEL to retire.
+
+        Autoscaling workers wake up every _RETIRE_POLL seconds while idle to
+        see whether autoscale() asked for one of them to leave.
+        """
+        if not self.autoscaling:
+            return take(None)
+        while True:
+            if self._to_retire and self._claim_retirement():
+                return _SENTINEL
+            try:
+                return take(_RETIRE_POLL)
+            except queue.Empty:
+                pass
+
+    def _claim_retirement(self) -> bool:
+        with self._scale_lock:
+            if not self._to_retire:
+                return False
+            self._to_retire -= 1
+            self._workers.remove(threading.current_thread())
+            return True
+
+    def _worker(self, metrics: _WorkerMetrics) -> None:
         """
         Worker thread function that processes items.
 
         Each worker:
         1. Consumes an item from input_queue
         2. Applies process_func to transform it
-        3. Produces the result to output_queue
+        3. Produces the result to output_queue (blocking while it is full)
         4. Repeats until a sentinel value is received
+        """
+        clock = time.perf_counter
+        while True:
+            waiting = clock()
+            metrics.state = "idle"
+            item = self._take(self.input_queue.consume)
+            started = clock()
+            metrics.idle += started - waiting
+            if item is _SENTINEL:
+                return
+            metrics.state = "busy"
+            metrics.items_in += 1
+            if self._unwrap:
+                seq, item = item
+            try:
+                results = [self.process_func(item)]
+            except Exception as exc:
+                self._record_error(item, exc)
+                results = []
+            finished = clock()
+            metrics.record(finished - started)
+            metrics.state = "blocked"
+            if self._reorder is not None:
+                self._reorder.put([(seq, results)])
+            elif results:
+                self.output_queue.produce((seq, results[0]) if self.tagged else results[0])
+            metrics.items_out += len(results)
+            metrics.blocked += clock() - finished
+
+    def _batch_worker(self, metrics: _WorkerMetrics) -> None:
+        """Worker thread function for batch mode and process-pool stages."""
+        max_items = self.batch_size if self.batch_size > 1 else self.chunk_size
+        max_wait = self.max_wait_ms / 1000
+        clock = time.perf_counter
+        while True:
+            waiting = clock()
+            metrics.state = "idle"
+            batch = self._take(
+                lambda timeout: self.input_queue.consume_many(max_items, timeout, max_wait))
+            started = clock()
+            metrics.idle += started - waiting
+            if batch is _SENTINEL:
+                return
+            done = batch[-1] is _SENTINEL
+            if done:
+                batch.pop()
+            if batch:
+                metrics.state = "busy"
+                metrics.items_in += len(batch)
+                if self._unwrap:
+                    seqs = [seq for seq, _ in batch]
+                    batch = [item for _, item in batch]
+                per_item = self._run_batch(batch)
+                finished = clock()
+                metrics.record(finished - started, len(batch))
+                metrics.state = "blocked"
+                if self._reorder is not None:
+                    self._reorder.put(list(zip(seqs, per_item)))
+                    metrics.items_out += sum(len(results) for results in per_item)
+                elif self.tagged:
+                    results = [(seq, r) for seq, item_results in zip(seqs, per_item)
+                               for r in item_results]
+                    if results:
+                        self.output_queue.produce_many(results)
+                    metrics.items_out += len(results)
+                else:
+                    results = [r for item_results in per_item for r in item_results]
+                    if results:
+                        self.output_queue.produce_many(results)
+                    metrics.items_out += len(results)
+                metrics.blocked += clock() - finished
+            if done:
+                return
+
+    def _run_batch(self, items: List[Any]) -> List[List[Any]]:
+        """
+        Process a batch or chunk; failures are recorded, not raised.
+
+        Returns:
+            The results belonging to each input item, in input order
+        """
+        try:
+            if self._pool is None:
+                results = list(self.process_func(items))
+            elif self.batch_size > 1:
+                results = self._pool.submit(_call_batch, self.process_func, items).result()
+            else:
+                outcomes = self._pool.submit(_map_chunk, self.process_func, items).result()
+                per_item = []
+                for item, (ok, value) in zip(items, outcomes):
+                    if not ok:
+                        self._record_error(item, value)
+                    per_item.append([value] if ok else [])
+                return per_item
+        except Exception as exc:
+            self._record_error(items, exc)
+            return [[] for _ in items]
+        if len(results) == len(items):
+            return [[result] for result in results]
+        return [results] + [[] for _ in items[1:]]
+
+    @property
+    def reorder_high_water(self) -> int:
+        """Most completed inputs the reorder buffer has held (0 if unordered)."""
+        return self._reorder.high_water if self._reorder is not None else 0
+
+    @property
+    def thread_count(self) -> int:
+        """Worker threads currently running, not counting ones asked to retire."""
+        with self._scale_lock:
+            return len(self._workers) - self._to_retire
+
+    def add_worker(self) -> bool:
+        """
+        Start one more worker thread.
+
+        Returns:
+            False if the stage is shutting down (no worker was added)
+        """
+        with self._scale_lock:
+            if self._closing:
+                return False
+            self._start_worker()
+            return True
+
+    def retire_worker(self) -> bool:
+        """
+        Ask one worker thread to exit once it is idle.
+
+        Returns:
+            False if the stage is shutting down or already at its minimum
+            (min_workers, or 1 without autoscaling)
+        """
+        with self._scale_lock:
+            if self._closing or len(self._workers) - self._to_retire <= (self.min_workers or 1):
+                return False
+            self._to_retire += 1
+            return True
 
-        TODO: Implement this method
+    def autoscale(self, budget: int) -> int:
+        """
+        Take one scaling step based on queue depth and what workers are doing.
+
+        Adds a worker when the input queue holds at least one item per
+        worker (or is full, since a bounded queue can hold fewer items than
+        there are workers), no worker is idle and more are processing than waiting on
+        the next stage (more workers can't help a stage held back
+        downstream). Retires one when the queue has been empty with some
+        worker idle for _SCALE_DOWN_CHECKS calls in a row.
+
+        Args:
+            budget: How many more threads the caller allows
+
+        Returns:
+            Change in thread count: 1, -1 or 0 (always 0 unless autoscaling)
+        """
+        if not self.autoscaling:
+            return 0
+        with self._scale_lock:
+            live = len(self._workers) - self._to_retire
+            states = [self._worker_metrics[worker.name].state for worker in self._workers]
+        depth = self.input_queue.qsize()
+        idle = states.count("idle")
+        backlog = depth >= live or self.input_queue.full()
+        if (backlog and not idle and states.count("busy") > states.count("blocked")
+                and live < self.max_workers and budget > 0):
+            self._idle_checks = 0
+            return 1 if self.add_worker() else 0
+        if depth or not idle:
+            self._idle_checks = 0
+            return 0
+        self._idle_checks += 1
+        if self._idle_checks >= _SCALE_DOWN_CHECKS and live > self.min_workers:
+            self._idle_checks = 0
+            return -1 if self.retire_worker() else 0
+        return 0
+
+    def sample_depth(self) -> None:
+        """Append (time.monotonic(), input queue depth) to depth_history."""
+        self.depth_history.append((time.monotonic(), self.input_queue.qsize()))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return this stage's counters and timings.
+
+        Returns:
+            Dictionary with:
+            - 'workers': Number of worker threads currently running
+            - 'items_in' / 'items_out': Items taken from the input queue and
+              results handed on (errors and batch functions make them differ)
+            - 'errors': Number of failed items or batches
+            - 'queue_depth', 'queue_maxsize', 'blocked_puts': Input queue
+              state, as in ProducerConsumer.backpressure()
+            - 'busy_seconds', 'idle_seconds', 'blocked_seconds': Worker time
+              spent processing, waiting for input and waiting for room
+              downstream, summed over workers
+            - 'utilization': busy share of that time (0.0 to 1.0)
+            - 'throughput': items_out per second between the stage's start
+              and now (or its shutdown)
+            - 'service_time': 'count', 'mean', 'max' and the 'p50', 'p90'
+              and 'p99' estimates (bucket upper bounds) in seconds, plus
+              'histogram' mapping each non-empty bucket's upper bound in
+              seconds to its item count
+            - 'per_worker': Thread name -> that worker's items_in,
+              items_out and busy/idle/blocked seconds
+            - 'depth_history': (time.monotonic(), input queue depth) samples
+              taken by the pipeline's stats reporter
+            - 'reorder_high_water': As the property of the same name
         """
-        pass
+        workers = list(self._worker_metrics.items())
+        per_worker = {name: metrics.snapshot() for name, metrics in workers}
+        buckets = [sum(counts) for counts in zip(*(m.buckets for _, m in workers))]
+        served = sum(buckets)
+        busy = sum(w["busy_seconds"] for w in per_worker.values())
+        idle = sum(w["idle_seconds"] for w in per_worker.values())
+        blocked = sum(w["blocked_seconds"] for w in per_worker.values())
+        items_out = sum(w["items_out"] for w in per_worker.values())
+        queue_stats = self.input_queue.backpressure()
+        with self._errors_lock:
+            errors = len(self.errors)
+        return {
+            "workers": self.thread_count,
+            "items_in": sum(w["items_in"] for w in per_worker.values()),
+            "items_out": items_out,
+            "errors": errors,
+            "queue_depth": queue_stats["depth"],
+            "queue_maxsize": queue_stats["maxsize"],
+            "blocked_puts": queue_stats["blocked_puts"],
+            "busy_seconds": busy,
+            "idle_seconds": idle,
+            "blocked_seconds": blocked,
+            "utilization": busy / (busy + idle + blocked) if busy + idle + blocked else 0.0,
+            "throughput": items_out / ((self._stopped or time.perf_counter()) - self._started),
+            "service_time": {
+                "count": served,
+                "mean": busy / served if served else 0.0,
+                "max": max((m.max_service for _, m in workers), default=0.0),
+                "p50": _bucket_percentile(buckets, 50),
+                "p90": _bucket_percentile(buckets, 90),
+                "p99": _bucket_percentile(buckets, 99),
+                "histogram": {(1 << i) / 1e6: count
+                              for i, count in enumerate(buckets) if count},
+            },
+            "per_worker": per_worker,
+            "depth_history": list(self.depth_history),
+            "reorder_high_water": self.reorder_high_water,
+        }
+
+    def _record_error(self, item: Any, exc: BaseException) -> None:
+        with self._errors_lock:
+            self.errors.append((item, exc))
 
     def shutdown(self, timeout: Optional[float] = None) -> None:
         """
         Shutdown all worker threads.
 
+        Sentinels queue up behind items already waiting, so every item fed
+        before shutdown is processed first.
+
         Args:
             timeout: Optional timeout for joining threads
         """
-        # TODO: Send sentinel values to signal workers to stop
-        # TODO: Wait for all workers to finish
-        pass
+        with self._scale_lock:
+            self._closing = True
+            self._to_retire = 0
+            workers = list(self._workers)
+        for _ in workers:
+            self.input_queue.produce(_SENTINEL)
+        for worker in workers:
+            worker.join(timeout)
+        self._stopped = time.perf_counter()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def _resolve_inputs(stage_configs: List[dict], names: List[str]) -> List[List[int]]:
+    """
+    Turn each stage's 'inputs' names into indices of earlier stages.
+
+    Raises:
+        ValueError: If a name is unknown, ambiguous or not an earlier stage
+    """
+    resolved = []
+    for j, config in enumerate(stage_configs):
+        sources = config.get("inputs")
+        if sources is None:
+            resolved.append([j - 1] if j else [])
+            continue
+        if isinstance(sources, str):
+            sources = [sources]
+        indices = []
+        for source in sources:
+            matches = [i for i in range(j) if names[i] == source]
+            if len(matches) != 1:
+                raise ValueError(f"stage {names[j]!r}: input {source!r} must name exactly one "
+                                 f"earlier stage")
+            indices.append(matches[0])
+        resolved.append(indices)
+    return resolved
+
+
+def _call_batch(func: Callable, items: List[Any]) -> List[Any]:
+    """Run a batch function in a worker process."""
+    return list(func(items))
+
+
+def _map_chunk(func: Callable, items: List[Any]) -> List[Tuple[bool, Any]]:
+    """
+    Apply func to each item of a chunk in a worker process.
+
+    Returns (True, result) or (False, exception) per item, so one failing
+    item doesn't lose the rest of its chunk.
+    """
+    outcomes = []
+    for item in items:
+        try:
+            outcomes.append((True, func(item)))
+        except Exception as exc:
+            outcomes.append((False, exc))
+    return outcomes
 
 
 class Pipeline:
@@ -151,45 +982,426 @@ class Pipeline:
     A multi-stage processing pipeline.
 
     This class orchestrates multiple PipelineStages connected by queues.
+
+    Bounded queues propagate backpressure: when a stage falls behind, its
+    input queue fills, the upstream stage's workers block on it, their own
+    input queue fills in turn, and eventually feed() blocks. Memory held
+    in the pipeline therefore stays below the sum of the queue sizes plus
+    one item per worker.
+
+    Example:
+        pipeline = Pipeline([
+            {'func': parse, 'workers': 2, 'queue_size': 100},
+            {'func': enrich, 'workers': 8, 'queue_size': 50},
+        ])
+        for line in lines:
+            pipeline.feed(line)  # blocks while the pipeline is saturated
+        pipeline.shutdown()
+        results = pipeline.get_results()
+
+    To consume results while items are still being fed, iterate results()
+    (or results_async()) and call shutdown() from the feeding side; the
+    iteration ends once shutdown has flushed every item through:
+
+        threading.Thread(target=lambda: [pipeline.feed(x) for x in items]
+                         + [pipeline.shutdown()]).start()
+        for result in pipeline.results():
+            sink.write(result)
+
+    stats() reports per-stage metrics keyed by stage name. With
+    stats_interval set, a background thread also samples every stage's
+    queue depth at that interval and passes stats() to on_stats (printed
+    with format_stats() by default), once more after shutdown.
+
+    Stages configured with 'max_workers' autoscale: a background thread
+    calls PipelineStage.autoscale() on each of them every
+    autoscale_interval seconds, deepest input queue first, so a slow stage
+    gains threads while idle ones give theirs back. max_threads caps the
+    worker threads of all stages together.
+
+    Stages can also form a DAG. A stage's 'inputs' names the earlier stages
+    it reads from (by default, the stage before it). A stage read by
+    several others sends each result to all of them, or with 'route':
+    'partition' to one chosen by hashing 'key'(result). A stage with
+    several inputs merges their results, or with 'join': 'zip' waits for
+    one result per input for each fed item and calls 'func' with the tuple
+    of them. Stages nobody reads from deliver to the pipeline's output.
+    Branches run concurrently, so parallel lookups cost the slowest one
+    rather than their sum:
+
+        pipeline = Pipeline([
+            {'name': 'parse', 'func': parse},
+            {'name': 'geo', 'func': geo_lookup, 'inputs': ['parse']},
+            {'name': 'user', 'func': user_lookup, 'inputs': ['parse']},
+            {'name': 'combine', 'func': lambda pair: {**pair[0], **pair[1]},
+             'inputs': ['geo', 'user'], 'join': 'zip'},
+        ])
+
+    A zip join's input branches should yield one result per item; items a
+    branch drops (or extra results it makes) are reported in the join
+    stage's errors at shutdown.
     """
 
-    def __init__(self, stage_configs: List[dict]):
+    def __init__(self, stage_configs: List[dict], queue_size: int = 0,
+                 output_queue_size: int = 0, ordered: bool = False,
+                 reorder_buffer: int = 1024, stats_interval: Optional[float] = None,
+                 on_stats: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+                 autoscale_interval: float = 0.1, max_threads: Optional[int] = None):
         """
         Initialize a pipeline with multiple stages.
 
         Args:
             stage_configs: List of dicts with keys:
                 - 'func': Processing function
-                - 'workers': Number of workers (default 1)
+                - 'workers': Number of workers (default 1; the starting
+                  number when autoscaling)
+                - 'min_workers' / 'max_workers': Autoscaling range; setting
+                  'max_workers' turns autoscaling on (thread stages only)
                 - 'name': Stage name (optional)
+                - 'queue_size': Capacity of the stage's input queue
+                  (default: queue_size below)
+                - 'batch_size': Items per call in batch mode; 'func' then
+                  takes and returns lists (default 1 = no batching)
+                - 'max_wait_ms': Longest wait for a batch to fill
+                  (default 0 = take only what is already queued)
+                - 'executor': 'thread' (default) or 'process' to run
+                  'func' in a pool of 'workers' processes
+                - 'chunk_size': Items per task sent to a process pool
+                  (default 16)
+                - 'mp_context': multiprocessing context or start method
+                  name ('spawn', 'forkserver') for a process pool (default:
+                  the platform default)
+                - 'reorder_buffer': Reorder buffer capacity in ordered
+                  mode (default: reorder_buffer below)
+                - 'inputs': Names of earlier stages to read from (default:
+                  the previous stage; [] = items passed to feed())
+                - 'route': 'broadcast' (default) or 'partition' for how
+                  results are spread over several downstream stages
+                - 'key': Partition key function (default: the result
+                  itself, which must then be hashable). A result whose
+                  key raises or is unhashable is dropped and recorded as
+                  (result, exc) in the stage's errors
+                - 'join': 'merge' (default) or 'zip' for how several inputs
+                  are combined
+            queue_size: Default input queue capacity for every stage
+                (0 = unlimited)
+            output_queue_size: Capacity of the final output queue (0 =
+                unlimited). Bounding it makes the pipeline stall until
+                results are drained.
+            ordered: Deliver results in feed() order. Items are tagged with
+                sequence numbers and every stage releases results through
+                a reorder buffer. Only for linear pipelines.
+            reorder_buffer: Default reorder buffer capacity per stage in
+                ordered mode (overridable with a 'reorder_buffer' key)
+            stats_interval: Seconds between queue depth samples and stats
+                reports (None = no reporter thread)
+            on_stats: Called with stats() at every report (default: print
+                format_stats() output)
+            autoscale_interval: Seconds between autoscaling steps
+            max_threads: Most worker threads across all stages; autoscaling
+                stages stop growing at this total (None = no limit)
+
+        Raises:
+            ValueError: If 'inputs', 'route' or 'join' are invalid, or
+                ordered is set for a pipeline that isn't linear
         """
-        # TODO: Create queues and pipeline stages
-        # TODO: Connect stages with queues
-        pass
+        names = [config.get("name", f"Stage{i + 1}") for i, config in enumerate(stage_configs)]
+        inputs = _resolve_inputs(stage_configs, names)
+        consumers: List[List[int]] = [[] for _ in stage_configs]
+        for j, sources in enumerate(inputs):
+            for i in sources:
+                consumers[i].append(j)
+        linear = all(sources == ([i - 1] if i else []) for i, sources in enumerate(inputs))
+        if ordered and not linear:
+            raise ValueError("ordered=True needs a linear pipeline")
+        joins = [config.get("join", "merge") for config in stage_configs]
+        for name, join, sources in zip(names, joins, inputs):
+            if join not in ("merge", "zip"):
+                raise ValueError(f"join must be 'merge' or 'zip', not {join!r}")
+            if join == "zip" and len(sources) < 2:
+                raise ValueError(f"zip join stage {name!r} needs at least two inputs")
 
-    def feed(self, item: Any) -> None:
+        self.ordered = ordered
+        # Zip joins match results up by the feed() number of their item.
+        self._tagged = ordered or "zip" in joins
+        self._next_seq = 0
+        self._feed_lock = threading.Lock()
+        self._shut_down = False
+        self.queues: List[ProducerConsumer] = [
+            ProducerConsumer(config.get("queue_size", queue_size)) for config in stage_configs
+        ]
+        self.queues.append(ProducerConsumer(output_queue_size))
+        self._joins: Dict[int, _ZipJoin] = {
+            j: _ZipJoin(self.queues[j], len(inputs[j]))
+            for j, join in enumerate(joins) if join == "zip"
+        }
+        roots = [self.queues[j] for j, sources in enumerate(inputs) if not sources]
+        self._source: Any = roots[0] if len(roots) == 1 else _Router(roots)
+        outputs = [self._stage_output(i, config, consumers[i], inputs)
+                   for i, config in enumerate(stage_configs)]
+        self.stages: List[PipelineStage] = [
+            PipelineStage(
+                self.queues[i],
+                outputs[i],
+                config["func"],
+                config.get("workers", 1),
+                names[i],
+                config.get("batch_size", 1),
+                config.get("max_wait_ms", 0),
+                config.get("executor", "thread"),
+                config.get("chunk_size", 16),
+                config.get("mp_context"),
+                ordered=ordered,
+                reorder_buffer=config.get("reorder_buffer", reorder_buffer),
+                min_workers=config.get("min_workers"),
+                max_workers=config.get("max_workers"),
+                tagged=self._tagged and not ordered,
+            )
+            for i, config in enumerate(stage_configs)
+        ]
+        for stage in self.stages:
+            if isinstance(stage.output_queue, _Router):
+                stage.output_queue.on_error = stage._record_error
+        self._on_stats = on_stats or (lambda stats: print(format_stats(stats)))
+        self._stop_reporter = threading.Event()
+        self._reporter: Optional[threading.Thread] = None
+        if stats_interval is not None:
+            self._reporter = threading.Thread(
+                target=self._report, args=(stats_interval,), name="pipeline-stats", daemon=True)
+            self._reporter.start()
+        self.max_threads = max_threads
+        self._stop_scaler = threading.Event()
+        self._scaler: Optional[threading.Thread] = None
+        if any(stage.autoscaling for stage in self.stages):
+            self._scaler = threading.Thread(
+                target=self._autoscale, args=(autoscale_interval,), name="pipeline-autoscale",
+                daemon=True)
+            self._scaler.start()
+
+    def _stage_output(self, i: int, config: dict, consumers: List[int],
+                      inputs: List[List[int]]) -> Any:
+        """Build what stage i's workers put results on."""
+        if not consumers:
+            return self.queues[-1]
+        targets = [
+            _ZipInput(self._joins[j], inputs[j].index(i)) if j in self._joins else self.queues[j]
+            for j in consumers
+        ]
+        route = config.get("route", "broadcast")
+        if route not in ("broadcast", "partition"):
+            raise ValueError(f"route must be 'broadcast' or 'partition', not {route!r}")
+        if route == "broadcast" and len(targets) == 1:
+            return targets[0]
+        key = None
+        if route == "partition":
+            key = config.get("key") or (lambda value: value)
+        return _Router(targets, key, tagged=self._tagged)
+
+    def _autoscale(self, interval: float) -> None:
+        """Scaler thread: give each autoscaling stage a scaling step every interval."""
+        while not self._stop_scaler.wait(interval):
+            total = sum(stage.thread_count for stage in self.stages)
+            for stage in sorted(self.stages, key=lambda s: s.input_queue.qsize(), reverse=True):
+                budget = 1 if self.max_threads is None else self.max_threads - total
+                total += stage.autoscale(budget)
+
+    def _report(self, interval: float) -> None:
+        """Reporter thread: sample queue depths and report every interval."""
+        while not self._stop_reporter.wait(interval):
+            for stage in self.stages:
+                stage.sample_depth()
+            self._on_stats(self.stats())
+
+    def feed(self, item: Any, timeout: Optional[float] = None) -> None:
         """
         Add an item to the start of the pipeline.
 
+        Blocks while the first stage's input queue is full (with several
+        stages reading from feed(), each gets the item in turn).
+
         Args:
             item: Item to process
+            timeout: Optional seconds to wait for space (None = forever)
+
+        Raises:
+            queue.Full: If timeout expires while the pipeline is saturated
         """
-        # TODO: Put item into first stage's input queue
-        pass
+        if not self._tagged:
+            self._source.produce(item, timeout=timeout)
+            return
+        # Numbering and enqueueing together keeps the first queue in order.
+        with self._feed_lock:
+            self._source.produce((self._next_seq, item), timeout=timeout)
+            self._next_seq += 1
 
     def get_results(self) -> List[Any]:
         """
         Get all results from the end of the pipeline.
 
+        Returns the results available now; call shutdown() first to wait
+        for every fed item.
+
         Returns:
             List of all processed items
         """
-        # TODO: Consume all items from final stage's output queue
-        pass
+        results = []
+        while True:
+            try:
+                batch = self.queues[-1].consume_many(1024, timeout=0)
+            except queue.Empty:
+                return results
+            done = self._unwrap_into(results, batch)
+            if done:
+                return results
+
+    def results(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Yield results as they leave the last stage.
+
+        The generator ends once shutdown() has pushed every fed item
+        through; until then it blocks waiting for more. Only the items in
+        flight are held in memory. Several consumers may iterate at once;
+        each result goes to one of them.
+
+        Args:
+            timeout: Optional seconds to wait for each result
+
+        Yields:
+            Processed items (in feed() order if the pipeline is ordered)
+
+        Raises:
+            queue.Empty: If timeout expires while waiting for a result
+        """
+        output = self.queues[-1]
+        while True:
+            batch = output.consume_many(256, timeout=timeout)
+            ready: List[Any] = []
+            done = self._unwrap_into(ready, batch)
+            yield from ready
+            if done:
+                return
+
+    async def results_async(self, poll_interval: float = 0.05) -> AsyncIterator[Any]:
+        """
+        Async iterator version of results().
+
+        Polls the output queue without blocking the event loop, backing off
+        from 1 ms up to poll_interval while it stays empty, so no item can
+        be lost to a cancelled consumer.
+
+        Example:
+            async for result in pipeline.results_async():
+                await sink.write(result)
+        """
+        output = self.queues[-1]
+        delay = 0.001
+        while True:
+            try:
+                batch = output.consume_many(256, timeout=0)
+            except queue.Empty:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, poll_interval)
+                continue
+            delay = 0.001
+            ready: List[Any] = []
+            done = self._unwrap_into(ready, batch)
+            for result in ready:
+                yield result
+            if done:
+                return
+
+    def _unwrap_into(self, results: List[Any], batch: List[Any]) -> bool:
+        """
+        Append a batch taken from the output queue to results.
+
+        Returns:
+            True if the batch ended with the end-of-stream sentinel (which is
+            put back for any other consumer)
+        """
+        done = batch[-1] is _SENTINEL
+        if done:
+            batch.pop()
+            self.queues[-1].produce(_SENTINEL)
+        if self._tagged:
+            results.extend(result for _, result in batch)
+        else:
+            results.extend(batch)
+        return done
 
     def shutdown(self) -> None:
         """
         Shutdown all pipeline stages gracefully.
+
+        Stages are stopped in order, so every item fed so far reaches the
+        output queue first, followed by an end-of-stream marker that ends
+        results() iterations. Results a zip join never got a match for are
+        recorded in its errors. Calling it again does nothing.
+        """
+        if self._shut_down:
+            return
+        self._shut_down = True
+        if self._scaler is not None:
+            self._stop_scaler.set()
+            self._scaler.join()
+        for i, stage in enumerate(self.stages):
+            if i in self._joins:
+                for partial in self._joins[i].incomplete():
+                    stage._record_error(partial, LookupError("missing results from some inputs"))
+            stage.shutdown()
+        self.queues[-1].produce(_SENTINEL)
+        if self._reporter is not None:
+            self._stop_reporter.set()
+            self._reporter.join()
+            self._on_stats(self.stats())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-stage metrics, keyed by stage name.
+
+        Returns:
+            Dictionary mapping each stage name to its PipelineStage.stats()
+            (stages sharing a name overwrite each other)
+        """
+        return {stage.stage_name: stage.stats() for stage in self.stages}
+
+    def backpressure(self) -> List[Dict[str, Any]]:
+        """
+        Report queue pressure in front of each stage.
+
+        Returns:
+            One ProducerConsumer.backpressure() dict per stage, in order,
+            plus 'stage' (the stage name); blocked time in front of stage i
+            means the stages before it were held back by it
+        """
+        return [dict(stage.input_queue.backpressure(), stage=stage.stage_name)
+                for stage in self.stages]
+
+    def throttling_stage(self) -> Optional[str]:
+        """
+        Name of the stage currently limiting the pipeline, if any.
+
+        A slow stage backs up every queue upstream of it, so the throttling
+        stage is the most downstream one whose input queue is full right
+        now, or failing that, the most downstream one that has ever made
+        its producers wait.
+
+        Returns:
+            Stage name, or None if no producer has been held back
+        """
+        for stage in reversed(self.stages):
+            if stage.input_queue.full():
+                return stage.stage_name
+        for report in reversed(self.backpressure()):
+            if report["blocked_puts"]:
+                return report["stage"]
+        return None
+
+    def reorder_high_water(self) -> Dict[str, int]:
+        """
+        Peak reorder-buffer occupancy of each stage in ordered mode.
+
+        Returns:
+            Dictionary mapping stage name to the most completed items held
+            back waiting for an earlier one (all 0 when not ordered)
         """
-        # TODO: Call shutdown on all stages
-        pass
+        return {stage.stage_name: stage.reorder_high_water for stage in self.stages}
@@ -156,3 +156,147 @@ def test_timeout(variant_config):
 def student_id(variant_config):
     """Provide the student ID from variant config."""
     return variant_config.get("student_id", "default")
+
+
+class _LocalHTTPServer:
+    """Handle to a local keep-alive HTTP server used by scraper tests."""
+
+    def __init__(self, server):
+        self._server = server
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    @property
+    def connections(self):
+        """Number of TCP connections accepted so far."""
+        return self._server.connections
+
+    @property
+    def request_count(self):
+        """Number of requests handled so far."""
+        return self._server.request_count
+
+    @property
+    def max_in_flight(self):
+        """Highest number of requests being handled at the same time."""
+        return self._server.max_in_flight
+
+    @property
+    def arrival_order(self):
+        """Distinct request paths (query included) in the order they first arrived."""
+        with self._server.lock:
+            return list(self._server.hits)
+
+    def url(self, path="/"):
+        return self.base_url + path
+
+
+@pytest.fixture
+def http_server():
+    """
+    Start a local HTTP/1.1 server.
+
+    '/status/<code>' returns that status and '/delay/<ms>' sleeps before
+    answering 200. '/bytes/<n>' answers with n bytes of b"0123456789"
+    repeated. '/etag/<max-age>' answers with Cache-Control max-age and an
+    ETag, and 304 when If-None-Match matches it. '/flaky/<n>' answers 503
+    to the first n requests for that exact path (query string included) and
+    200 after that; '/slow-first/<ms>' sleeps only on the first request for
+    its path. Any other path answers 200 immediately, and HEAD always
+    answers 200 with an empty body.
+    """
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with self.server.lock:
+                self.server.connections += 1
+
+        def do_GET(self):
+            with self.server.lock:
+                self.server.request_count += 1
+                self.server.in_flight += 1
+                self.server.max_in_flight = max(self.server.max_in_flight,
+                                                self.server.in_flight)
+            try:
+                self._respond()
+            finally:
+                with self.server.lock:
+                    self.server.in_flight -= 1
+
+        def do_HEAD(self):
+            with self.server.lock:
+                self.server.request_count += 1
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _respond(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            with self.server.lock:
+                self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+                hits = self.server.hits[self.path]
+            status = 200
+            if parts[0] == "status" and len(parts) > 1:
+                status = int(parts[1])
+            elif parts[0] == "flaky" and len(parts) > 1:
+                status = 503 if hits <= int(parts[1]) else 200
+            elif parts[0] == "slow-first" and len(parts) > 1:
+                if hits == 1:
+                    time.sleep(int(parts[1]) / 1000)
+            elif parts[0] == "delay" and len(parts) > 1:
+                time.sleep(int(parts[1]) / 1000)
+            elif parts[0] == "bytes" and len(parts) > 1:
+                body = (b"0123456789" * (int(parts[1]) // 10 + 1))[:int(parts[1])]
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            elif parts[0] == "etag" and len(parts) > 1:
+                etag = '"v1"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", f"max-age={parts[1]}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", f"max-age={parts[1]}")
+                self.send_header("Content-Length", "4")
+                self.end_headers()
+                self.wfile.write(b"body")
+                return
+            body = f"ok {self.path}".encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            pass  # clients in timeout tests hang up mid-response on purpose
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.request_count = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.hits = {}
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield _LocalHTTPServer(server)
+    server.shutdown()
+    server.server_close()
@@ -267,3 +267,1874 @@ class TestProducerConsumer:
             assert len(events) >= 1, "EventStream must store and return events"
         except ImportError:
             pytest.skip("task4_integration not yet implemented")
+
+
+class TestShardedCounter:
+    """Tests for ShardedCounter per-thread partial counts."""
+
+    def test_sharded_counter_basic_operations(self):
+        """ShardedCounter should support the ThreadSafeCounter API."""
+        from src.task1_threadsafe import ShardedCounter
+
+        counter = ShardedCounter(initial=5)
+        counter.increment()
+        counter.increment()
+        counter.decrement()
+        assert counter.get_value() == 6
+
+    def test_sharded_counter_concurrent_updates(self, num_threads, iterations_per_thread,
+                                                expected_counter_value):
+        """ShardedCounter should not lose updates across threads."""
+        from src.task1_threadsafe import ShardedCounter
+
+        counter = ShardedCounter()
+
+        def worker(iters=iterations_per_thread):
+            for _ in range(iters):
+                counter.increment()
+                counter.increment()
+                counter.decrement()
+
+        threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.get_value() == expected_counter_value
+
+    def test_sharded_counter_folds_exited_threads(self):
+        """Counts from exited threads should survive registry cleanup."""
+        from src.task1_threadsafe import ShardedCounter
+
+        counter = ShardedCounter()
+        for _ in range(20):
+            t = threading.Thread(target=counter.increment)
+            t.start()
+            t.join()
+        counter.increment()
+        assert counter.get_value() == 21
+        assert len(counter._cells) <= 2
+
+
+class TestBatchedUpdates:
+    """Tests for add/add_many and buffered batch() updates."""
+
+    COUNTERS = ["ThreadSafeCounter", "FixedCounterLock", "FixedCounterRLock", "ShardedCounter"]
+
+    @pytest.mark.parametrize("name", COUNTERS)
+    def test_add_and_add_many(self, name):
+        """add(n) and add_many() should apply the summed delta."""
+        import src.task1_threadsafe as task1
+
+        counter = getattr(task1, name)()
+        counter.add(10)
+        counter.add(-3)
+        counter.add_many([1, 2, 3])
+        assert counter.get_value() == 13
+
+    @pytest.mark.parametrize("name", COUNTERS)
+    def test_batch_no_lost_updates(self, name, num_threads, iterations_per_thread,
+                                   expected_counter_value):
+        """Batched increments from many threads should all be applied."""
+        import src.task1_threadsafe as task1
+
+        counter = getattr(task1, name)()
+
+        def worker(iters=iterations_per_thread):
+            with counter.batch(flush_every=7) as b:
+                for _ in range(iters):
+                    b.increment()
+
+        threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.get_value() == expected_counter_value
+
+    def test_batch_flushes_on_exception(self):
+        """Pending updates should be flushed even if the block raises."""
+        from src.task1_threadsafe import FixedCounterLock
+
+        counter = FixedCounterLock()
+        with pytest.raises(RuntimeError):
+            with counter.batch(flush_every=None) as b:
+                b.increment()
+                b.increment()
+                assert counter.get_value() == 0
+                raise RuntimeError("boom")
+        assert counter.get_value() == 2
+
+
+class TestLockInstrumentation:
+    """Tests for opt-in lock-contention statistics."""
+
+    @pytest.mark.parametrize("name", ["ThreadSafeCounter", "FixedCounterLock", "FixedCounterRLock"])
+    def test_instrumented_counter_stats(self, name, num_threads, iterations_per_thread,
+                                        expected_counter_value):
+        """Instrumented counters should count every acquisition per thread."""
+        import src.task1_threadsafe as task1
+
+        counter = getattr(task1, name)(instrumented=True)
+
+        def worker(iters=iterations_per_thread):
+            for _ in range(iters):
+                counter.increment()
+
+        threads = [threading.Thread(target=worker, name=f"w{i}") for i in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.get_value() == expected_counter_value
+        stats = counter.stats()
+        # get_value() above is one more acquisition from the main thread
+        assert stats["acquisitions"] == expected_counter_value + 1
+        assert stats["per_thread_ops"][threads[0].name] == iterations_per_thread
+        assert 0 <= stats["contended"] <= stats["acquisitions"]
+        assert stats["hold_time"] >= 0.0
+        assert stats["wait_time"] >= 0.0
+
+    def test_uninstrumented_counter_has_no_stats(self):
+        """Counters created without instrumentation should report no stats."""
+        from src.task1_threadsafe import ThreadSafeCounter
+
+        counter = ThreadSafeCounter()
+        counter.increment()
+        assert counter.stats() == {}
+
+    def test_rlock_counts_outermost_acquisition_only(self):
+        """Re-entrant acquisitions should not be counted as extra operations."""
+        from src.task1_threadsafe import InstrumentedLock
+
+        lock = InstrumentedLock(threading.RLock())
+        with lock:
+            with lock:
+                pass
+        assert lock.stats()["acquisitions"] == 1
+
+
+class TestCounterBenchmark:
+    """Tests for the counter contention benchmark harness."""
+
+    def test_benchmark_counter_reports_metrics(self):
+        """benchmark_counter should report throughput, latency and correctness."""
+        from src.task1_threadsafe import benchmark_counter, ThreadSafeCounter
+
+        result = benchmark_counter(ThreadSafeCounter, num_threads=4, increments_per_thread=200)
+        assert result["implementation"] == "ThreadSafeCounter"
+        assert result["total_ops"] == 800
+        assert result["correct"] is True
+        assert result["ops_per_sec"] > 0
+        assert 0 <= result["p50_latency_us"] <= result["p99_latency_us"]
+
+    def test_run_counter_benchmarks_sweep_is_json_serializable(self):
+        """The sweep should cover every combination and serialize to JSON."""
+        import json
+        from src.task1_threadsafe import run_counter_benchmarks, FixedCounterLock, ShardedCounter
+
+        results = run_counter_benchmarks(
+            {"lock": FixedCounterLock, "sharded": ShardedCounter},
+            thread_counts=(1, 3), iterations=(50, 100), latency_sample_every=4,
+        )
+        assert len(results) == 2 * 2 * 2
+        assert {r["implementation"] for r in results} == {"lock", "sharded"}
+        assert all(r["correct"] for r in results)
+        json.dumps(results)
+
+
+_shared_counter = None
+
+
+def _init_shared_counter(counter):
+    global _shared_counter
+    _shared_counter = counter
+
+
+def _bump_shared_counter(n):
+    for _ in range(n):
+        _shared_counter.increment()
+    _shared_counter.decrement()
+    return n - 1
+
+
+class TestSharedMemoryCounter:
+    """Tests for the multi-process SharedMemoryCounter."""
+
+    def test_shared_memory_counter_in_process(self):
+        """SharedMemoryCounter should support the ThreadSafeCounter API."""
+        from src.task1_threadsafe import SharedMemoryCounter
+
+        with SharedMemoryCounter(initial=3) as counter:
+            counter.increment()
+            counter.add(5)
+            counter.decrement()
+            assert counter.get_value() == 8
+
+    @pytest.mark.parametrize("start_method", ["fork", "spawn"])
+    def test_shared_memory_counter_across_processes(self, start_method):
+        """Updates from worker processes should be aggregated on read."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from src.task1_threadsafe import SharedMemoryCounter
+
+        if start_method not in multiprocessing.get_all_start_methods():
+            pytest.skip(f"{start_method} start method not available")
+
+        ctx = multiprocessing.get_context(start_method)
+        with SharedMemoryCounter(mp_context=ctx) as counter:
+            counter.increment()
+            with ProcessPoolExecutor(max_workers=3, mp_context=ctx,
+                                     initializer=_init_shared_counter,
+                                     initargs=(counter,)) as pool:
+                returned = sum(pool.map(_bump_shared_counter, [100] * 12))
+            assert counter.get_value() == returned + 1
+
+    def test_shared_memory_counter_runs_out_of_slots(self):
+        """Claiming more slots than configured should fail loudly."""
+        from src.task1_threadsafe import SharedMemoryCounter
+
+        with SharedMemoryCounter(num_slots=1) as counter:
+            counter.increment()
+            counter._pid = None  # pretend to be a new process
+            with pytest.raises(RuntimeError):
+                counter.increment()
+
+
+class TestCounterRegistry:
+    """Tests for the labeled CounterRegistry."""
+
+    def test_registry_keyed_counts(self):
+        """Each label should get its own counter."""
+        from src.task1_threadsafe import CounterRegistry
+
+        registry = CounterRegistry()
+        registry.increment(200)
+        registry.increment(200)
+        registry.add(("GET", 404), 3)
+        registry.decrement(200)
+        assert registry.get_value(200) == 1
+        assert registry.get_value(("GET", 404)) == 3
+        assert registry.get_value(500) == 0
+        assert 500 not in registry
+        assert len(registry) == 2
+
+    def test_registry_concurrent_first_use(self, num_threads, iterations_per_thread,
+                                           expected_counter_value):
+        """Concurrent first use of a key should create a single counter."""
+        from src.task1_threadsafe import CounterRegistry
+
+        registry = CounterRegistry()
+        barrier = threading.Barrier(num_threads)
+
+        def worker(iters=iterations_per_thread):
+            barrier.wait()
+            for i in range(iters):
+                registry.increment("hits")
+                registry.increment(i % 3)
+
+        threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        snapshot = registry.snapshot()
+        assert snapshot["hits"] == expected_counter_value
+        assert sum(snapshot[k] for k in range(3)) == expected_counter_value
+
+    @pytest.mark.parametrize("name", ["ThreadSafeCounter", "ShardedCounter"])
+    def test_registry_reset_on_read(self, name):
+        """snapshot(reset=True) should only report updates since the last reset."""
+        import src.task1_threadsafe as task1
+
+        registry = task1.CounterRegistry(counter_class=getattr(task1, name))
+        registry.add("click", 5)
+        assert registry.snapshot(reset=True) == {"click": 5}
+        registry.increment("click")
+        assert registry.snapshot(reset=True) == {"click": 1}
+        assert registry.snapshot() == {"click": 0}
+
+
+class TestPooledFetch:
+    """Tests for connection-pooled fetch modes against a local server."""
+
+    def test_fetch_sequential_pooled_reuses_connection(self, http_server):
+        """Pooled sequential fetching should keep one connection alive."""
+        from src.task2_scraper import fetch_sequential
+
+        urls = [http_server.url(f"/page/{i}") for i in range(10)]
+        results = fetch_sequential(urls, pooled=True)
+        assert [r["url"] for r in results] == urls
+        assert all(r["status_code"] == 200 for r in results)
+        assert http_server.connections == 1
+
+    def test_fetch_sequential_unpooled_opens_connection_per_url(self, http_server):
+        """Without pooling every URL pays for a new connection."""
+        from src.task2_scraper import fetch_sequential
+
+        urls = [http_server.url(f"/page/{i}") for i in range(5)]
+        fetch_sequential(urls)
+        assert http_server.connections == 5
+
+    def test_fetch_threaded_pooled_uses_per_thread_sessions(self, http_server):
+        """Pooled threaded fetching needs at most one connection per worker."""
+        from src.task2_scraper import fetch_threaded
+
+        urls = [http_server.url(f"/status/{200 + i % 2}") for i in range(20)]
+        results = fetch_threaded(urls, max_workers=4, pooled=True)
+        assert [r["url"] for r in results] == urls
+        assert [r["status_code"] for r in results] == [200 + i % 2 for i in range(20)]
+        assert http_server.connections <= 4
+
+
+class TestAsyncStream:
+    """Tests for the bounded-concurrency fetch_async_stream."""
+
+    def test_stream_bounds_in_flight_requests(self, http_server):
+        """No more than `concurrency` requests should be in flight at once."""
+        import asyncio
+        from src.task2_scraper import fetch_async_stream
+
+        urls = [http_server.url(f"/delay/20?i={i}") for i in range(30)]
+
+        async def collect():
+            return [r async for r in fetch_async_stream(iter(urls), concurrency=4)]
+
+        results = asyncio.run(collect())
+        assert sorted(r["url"] for r in results) == sorted(urls)
+        assert all(r["status_code"] == 200 for r in results)
+        assert 1 < http_server.max_in_flight <= 4
+
+    def test_stream_accepts_async_iterable(self, http_server):
+        """URLs may come from an async generator."""
+        import asyncio
+        from src.task2_scraper import fetch_async_stream
+
+        async def url_source():
+            for code in (200, 404, 500):
+                yield http_server.url(f"/status/{code}")
+
+        async def collect():
+            return [r async for r in fetch_async_stream(url_source(), concurrency=2)]
+
+        results = asyncio.run(collect())
+        assert sorted(r["status_code"] for r in results) == [200, 404, 500]
+
+    def test_stream_stops_early(self, http_server):
+        """Breaking out of the stream should not fetch the rest of the input."""
+        import asyncio
+        import itertools
+        from src.task2_scraper import fetch_async_stream
+
+        endless = (http_server.url(f"/page/{i}") for i in itertools.count())
+
+        async def take(n):
+            taken = []
+            stream = fetch_async_stream(endless, concurrency=3)
+            async for r in stream:
+                taken.append(r)
+                if len(taken) == n:
+                    break
+            await stream.aclose()
+            return taken
+
+        assert len(asyncio.run(take(5))) == 5
+
+
+class TestHostLimiter:
+    """Tests for per-host rate limiting and concurrency caps."""
+
+    def test_token_bucket_paces_requests(self):
+        """After the burst is spent, tokens should arrive at `rate` per second."""
+        import time
+        from src.task2_scraper import TokenBucket
+
+        bucket = TokenBucket(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(7):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert elapsed >= 5 / 50 * 0.9
+
+    def test_policy_matches_most_specific_domain(self):
+        """Host policies should fall back from subdomain to domain to default."""
+        from src.task2_scraper import HostLimiter
+
+        limiter = HostLimiter(
+            default={"rate": 10},
+            per_host={"example.com": {"rate": 5}, "api.example.com": {"rate": 1}},
+        )
+        assert limiter.policy("api.example.com") == {"rate": 1}
+        assert limiter.policy("WWW.Example.com") == {"rate": 5}
+        assert limiter.policy("other.org") == {"rate": 10}
+
+    def test_threaded_respects_host_concurrency_cap(self, http_server):
+        """fetch_threaded should never exceed the host's max_concurrency."""
+        from src.task2_scraper import HostLimiter, fetch_threaded
+
+        limiter = HostLimiter(per_host={"127.0.0.1": {"max_concurrency": 2}})
+        urls = [http_server.url(f"/delay/20?i={i}") for i in range(12)]
+        results = fetch_threaded(urls, max_workers=8, limiter=limiter)
+        assert [r["url"] for r in results] == urls
+        assert http_server.max_in_flight <= 2
+
+    def test_async_respects_host_concurrency_cap(self, http_server):
+        """fetch_async should never exceed the host's max_concurrency."""
+        import asyncio
+        from src.task2_scraper import HostLimiter, fetch_async
+
+        limiter = HostLimiter(default={"max_concurrency": 3})
+        urls = [http_server.url(f"/delay/20?i={i}") for i in range(12)]
+        results = asyncio.run(fetch_async(urls, limiter=limiter))
+        assert len(results) == 12
+        assert http_server.max_in_flight <= 3
+        # The limiter can be reused from a new event loop.
+        assert len(asyncio.run(fetch_async(urls[:2], limiter=limiter))) == 2
+
+    def test_multiprocess_respects_host_concurrency_cap(self, http_server):
+        """fetch_multiprocess should gate submissions in the parent process."""
+        from src.task2_scraper import HostLimiter, fetch_multiprocess
+
+        limiter = HostLimiter(default={"max_concurrency": 1})
+        urls = [http_server.url(f"/delay/10?i={i}") for i in range(4)]
+        results = fetch_multiprocess(urls, max_workers=3, limiter=limiter)
+        assert [r["url"] for r in results] == urls
+        assert http_server.max_in_flight == 1
+
+    @pytest.mark.parametrize("strategy", ["threaded", "threaded_pooled", "multiprocess"])
+    def test_capped_host_does_not_stall_other_hosts(self, http_server, strategy):
+        """URLs for free hosts should go out while a capped host's URLs wait."""
+        from src.task2_scraper import HostLimiter, fetch_multiprocess, fetch_threaded
+
+        limiter = HostLimiter(per_host={"localhost": {"max_concurrency": 1}})
+        capped = [http_server.url(f"/delay/300?capped={i}").replace("127.0.0.1", "localhost")
+                  for i in range(2)]
+        free = [http_server.url(f"/?free={i}") for i in range(4)]
+        if strategy == "multiprocess":
+            results = fetch_multiprocess(capped + free, max_workers=2, limiter=limiter)
+        else:
+            results = fetch_threaded(capped + free, max_workers=2, limiter=limiter,
+                                     pooled=strategy == "threaded_pooled")
+        assert [r["status_code"] for r in results] == [200] * 6
+        arrival = http_server.arrival_order
+        assert arrival.index("/delay/300?capped=1") == len(arrival) - 1
+
+    def test_multiprocess_rate_holds_behind_a_busy_pool(self, http_server):
+        """Tokens should be spent when a worker can send, not while queued in the pool."""
+        import time
+        from src.task2_scraper import HostLimiter, fetch_multiprocess
+
+        limiter = HostLimiter(per_host={"127.0.0.1": {"rate": 10, "burst": 1}})
+        busy = http_server.url("/delay/300").replace("127.0.0.1", "localhost")
+        urls = [busy] + [http_server.url(f"/?i={i}") for i in range(4)]
+        start = time.monotonic()
+        fetch_multiprocess(urls, max_workers=1, limiter=limiter)
+        # 300 ms behind the busy URL, then 3 more tokens at 10 per second.
+        assert time.monotonic() - start >= 0.3 + 3 * 0.1 * 0.9
+
+    def test_try_acquire_never_blocks(self):
+        """try_acquire should report how long to wait instead of blocking."""
+        import math
+        from src.task2_scraper import HostLimiter
+
+        limiter = HostLimiter(per_host={"a.test": {"max_concurrency": 1},
+                                        "b.test": {"rate": 10, "burst": 1}})
+        assert limiter.try_acquire("http://a.test/") == 0
+        assert limiter.try_acquire("http://a.test/") == math.inf
+        limiter.release("http://a.test/")
+        assert limiter.try_acquire("http://a.test/") == 0
+        assert limiter.try_acquire("http://b.test/") == 0
+        assert 0 < limiter.try_acquire("http://b.test/") <= 0.1
+
+
+class TestResponseCache:
+    """Tests for the scraper's HTTP response cache."""
+
+    def test_fresh_hit_skips_network(self, http_server):
+        """A response with max-age should be served from memory while fresh."""
+        from src.task2_scraper import ResponseCache, fetch_sequential
+
+        cache = ResponseCache()
+        url = http_server.url("/etag/60")
+        first = fetch_sequential([url], cache=cache)
+        second = fetch_sequential([url], cache=cache)
+        assert first == [{"url": url, "status_code": 200, "cache": "miss"}]
+        assert second == [{"url": url, "status_code": 200, "cache": "hit"}]
+        assert http_server.request_count == 1
+
+    def test_stale_entry_is_revalidated(self, http_server):
+        """A stale entry with an ETag should be revalidated with a conditional GET."""
+        import asyncio
+        from src.task2_scraper import ResponseCache, fetch_async
+
+        cache = ResponseCache()
+        url = http_server.url("/etag/0")
+        asyncio.run(fetch_async([url], cache=cache))
+        results = asyncio.run(fetch_async([url], cache=cache))
+        assert results == [{"url": url, "status_code": 200, "cache": "revalidated"}]
+        assert http_server.request_count == 2
+
+    def test_no_validators_no_freshness_not_cached(self, http_server):
+        """Responses that can't be reused shouldn't occupy the cache."""
+        from src.task2_scraper import ResponseCache, fetch_threaded
+
+        cache = ResponseCache()
+        results = fetch_threaded([http_server.url("/plain")] * 2, cache=cache)
+        assert [r["cache"] for r in results] == ["miss", "miss"]
+        assert len(cache) == 0
+
+    def test_disk_layer_survives_new_cache(self, http_server, tmp_path):
+        """Entries written to disk should be reused by a fresh cache instance."""
+        from src.task2_scraper import ResponseCache, fetch_multiprocess
+
+        url = http_server.url("/etag/60")
+        fetch_multiprocess([url], max_workers=1, cache=ResponseCache(directory=str(tmp_path)))
+        results = fetch_multiprocess([url], max_workers=1,
+                                     cache=ResponseCache(directory=str(tmp_path)))
+        assert results == [{"url": url, "status_code": 200, "cache": "hit"}]
+        assert http_server.request_count == 1
+
+    def test_lru_and_ttl_eviction(self):
+        """The memory layer should respect max_entries, max_bytes and ttl."""
+        from src.task2_scraper import ResponseCache
+
+        cache = ResponseCache(max_entries=2, max_bytes=10, default_ttl=60)
+        for name in ("a", "b", "c"):
+            cache.update(name, 200, {}, b"xx")
+        assert cache.lookup("a") == (None, False)
+        assert cache.lookup("c")[1] is True
+        cache.update("big", 200, {}, b"x" * 9)
+        assert len(cache) == 1
+
+        expiring = ResponseCache(ttl=0, default_ttl=60)
+        expiring.update("a", 200, {"Cache-Control": "max-age=60"}, b"x")
+        assert expiring.lookup("a") == (None, False)
+
+    def test_disk_layer_budget(self, tmp_path):
+        """The disk layer should evict least recently used entries past its budget."""
+        from src.task2_scraper import ResponseCache
+
+        cache = ResponseCache(default_ttl=60, directory=str(tmp_path), max_disk_entries=2)
+        for name in ("a", "b", "c"):
+            cache.update(name, 200, {}, b"x" * 100)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+        reopened = ResponseCache(directory=str(tmp_path))
+        assert reopened.lookup("a") == (None, False)
+        assert reopened.lookup("c")[1] is True
+
+        ResponseCache(directory=str(tmp_path), max_disk_entries=1)
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        small = ResponseCache(default_ttl=60, directory=str(tmp_path / "small"),
+                              max_disk_bytes=500)
+        for name in ("a", "b", "c", "d"):
+            small.update(name, 200, {}, b"x" * 150)
+        total = sum(f.stat().st_size for f in (tmp_path / "small").iterdir())
+        assert 0 < total <= 500
+        small.update("huge", 200, {}, b"x" * 1000)
+        assert not ResponseCache(directory=str(tmp_path / "small")).lookup("huge")[0]
+
+    def test_disk_layer_sweeps_expired_entries(self, tmp_path):
+        """Expired disk entries should be deleted without being looked up again."""
+        import time
+        from src.task2_scraper import ResponseCache
+
+        cache = ResponseCache(ttl=0.1, default_ttl=60, directory=str(tmp_path))
+        cache.update("old", 200, {}, b"x")
+        time.sleep(0.15)
+        cache.update("new", 200, {}, b"x")
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        assert ResponseCache(directory=str(tmp_path)).lookup("new")[0] is not None
+
+    def test_async_disk_io_runs_off_the_event_loop(self, http_server, tmp_path, monkeypatch):
+        """Async fetches should load and save disk entries in an executor thread."""
+        import asyncio
+        import threading
+        from src.task2_scraper import ResponseCache, fetch_async
+
+        threads = []
+        for name in ("_load", "_save"):
+            original = getattr(ResponseCache, name)
+
+            def spy(self, *args, _original=original):
+                threads.append(threading.current_thread())
+                return _original(self, *args)
+            monkeypatch.setattr(ResponseCache, name, spy)
+
+        url = http_server.url("/etag/60")
+        asyncio.run(fetch_async([url], cache=ResponseCache(directory=str(tmp_path))))
+        results = asyncio.run(fetch_async([url], cache=ResponseCache(directory=str(tmp_path))))
+        assert results == [{"url": url, "status_code": 200, "cache": "hit"}]
+        assert len(threads) == 3
+        assert threading.main_thread() not in threads
+
+
+class TestFetchAuto:
+    """Tests for the adaptive fetch_auto strategy selector."""
+
+    def test_choose_strategy(self):
+        """The selector should follow the CPU-bound / concurrency heuristics."""
+        from src.task2_scraper import choose_strategy
+
+        assert choose_strategy(0.1, 0.09, 100, cpu_count=4) == \
+            {"strategy": "multiprocess", "workers": 4}
+        assert choose_strategy(0.1, 0.01, 100, max_workers=32) == \
+            {"strategy": "threaded", "workers": 11}
+        assert choose_strategy(0.5, 0.0001, 10_000, max_workers=32)["strategy"] == "async"
+        assert choose_strategy(0.5, 0.0001, 3, max_workers=32) == \
+            {"strategy": "threaded", "workers": 3}
+
+    def test_fetch_auto_preserves_order_and_records_decision(self, http_server):
+        """fetch_auto should return every result in order and report its choice."""
+        from src.task2_scraper import fetch_auto
+
+        urls = [http_server.url(f"/delay/5?i={i}") for i in range(20)]
+        decisions = []
+        results = fetch_auto(urls, sample_size=4, on_decision=decisions.append)
+        assert [r["url"] for r in results] == urls
+        assert all(r["status_code"] == 200 for r in results)
+        assert len(decisions) == 1
+        assert decisions[0]["strategy"] in {"threaded", "async", "multiprocess"}
+        assert decisions[0]["sample_size"] == 4
+        assert decisions[0]["remaining"] == 16
+
+    def test_fetch_auto_rejects_empty_sample(self, http_server):
+        """A non-positive sample_size should raise rather than drop every URL."""
+        from src.task2_scraper import fetch_auto
+
+        urls = [http_server.url(f"/?i={i}") for i in range(5)]
+        for sample_size in (0, -1):
+            with pytest.raises(ValueError):
+                fetch_auto(urls, sample_size=sample_size)
+        assert fetch_auto([]) == []
+        assert http_server.request_count == 0
+
+    def test_fetch_auto_async_path_keeps_order(self, http_server, monkeypatch):
+        """Results from the async path should be put back in input order."""
+        import src.task2_scraper as scraper
+
+        monkeypatch.setattr(scraper, "choose_strategy",
+                            lambda *args, **kwargs: {"strategy": "async", "workers": 5})
+        urls = [http_server.url(f"/delay/{(i * 7) % 20}?i={i}") for i in range(15)]
+        urls.append(urls[3])
+        results = scraper.fetch_auto(urls, sample_size=2)
+        assert [r["url"] for r in results] == urls
+
+
+class TestChunkedMultiprocess:
+    """Tests for chunked dispatch in fetch_multiprocess."""
+
+    @pytest.mark.parametrize("mode", ["threaded", "async"])
+    def test_chunked_fetch_preserves_order(self, http_server, mode):
+        """Chunks fetched inside workers should come back in input order."""
+        from src.task2_scraper import fetch_multiprocess
+
+        urls = [http_server.url(f"/status/{200 + i % 3}?i={i}") for i in range(23)]
+        results = fetch_multiprocess(urls, max_workers=2, chunk_size=5,
+                                     chunk_mode=mode, chunk_concurrency=4)
+        assert [r["url"] for r in results] == urls
+        assert [r["status_code"] for r in results] == [200 + i % 3 for i in range(23)]
+
+    def test_chunked_fetch_with_cache(self, http_server):
+        """Chunked mode should serve fresh hits from the parent's cache."""
+        from src.task2_scraper import ResponseCache, fetch_multiprocess
+
+        cache = ResponseCache()
+        urls = [http_server.url(f"/etag/60?i={i}") for i in range(4)]
+        fetch_multiprocess(urls, max_workers=2, cache=cache, chunk_size=2)
+        results = fetch_multiprocess(urls, max_workers=2, cache=cache, chunk_size=2)
+        assert [r["cache"] for r in results] == ["hit"] * 4
+        assert http_server.request_count == 4
+
+    def test_chunked_fetch_rejects_unknown_mode(self):
+        """An unknown chunk_mode should raise ValueError."""
+        from src.task2_scraper import fetch_multiprocess
+
+        with pytest.raises(ValueError):
+            fetch_multiprocess(["http://127.0.0.1:1/"], chunk_size=1, chunk_mode="fibers")
+
+    def test_limiter_scaled(self):
+        """scaled() should split rates and caps between processes."""
+        from src.task2_scraper import HostLimiter
+
+        limiter = HostLimiter(default={"rate": 10, "max_concurrency": 4},
+                              per_host={"a.com": {"rate": 2, "burst": 1}})
+        scaled = limiter.scaled(1 / 4)
+        assert scaled.default == {"rate": 2.5, "max_concurrency": 1}
+        assert scaled.per_host == {"a.com": {"rate": 0.5, "burst": 1}}
+
+
+class _StopAfterFirstChunk:
+    """Incremental parser that stops reading after the first chunk."""
+
+    def __init__(self):
+        self.chunks = 0
+
+    def update(self, chunk):
+        self.chunks += 1
+        return True
+
+    def result(self):
+        return self.chunks
+
+
+class TestStreamingBodies:
+    """Tests for BodyStream incremental body parsing."""
+
+    @staticmethod
+    def _body(n):
+        return (b"0123456789" * (n // 10 + 1))[:n]
+
+    def test_sequential_stream_hashes_body(self, http_server):
+        """A hash factory should see the whole body, chunk by chunk."""
+        import hashlib
+        from src.task2_scraper import BodyStream, fetch_sequential
+
+        stream = BodyStream(hashlib.sha256, chunk_size=1000)
+        [result] = fetch_sequential([http_server.url("/bytes/250000")], stream=stream)
+        assert result["status_code"] == 200
+        assert result["bytes_read"] == 250000
+        assert result["truncated"] is False
+        assert result["parsed"] == hashlib.sha256(self._body(250000)).hexdigest()
+
+    def test_async_stream_respects_max_bytes(self, http_server):
+        """Reading should stop at max_bytes."""
+        import asyncio
+        import hashlib
+        from src.task2_scraper import BodyStream, fetch_async
+
+        stream = BodyStream(hashlib.md5, max_bytes=12345, chunk_size=4096)
+        [result] = asyncio.run(fetch_async([http_server.url("/bytes/100000")], stream=stream))
+        assert result["bytes_read"] == 12345
+        assert result["truncated"] is True
+        assert result["parsed"] == hashlib.md5(self._body(12345)).hexdigest()
+
+    def test_parser_can_abort_early(self, http_server):
+        """A parser returning True from update() should end the read."""
+        from src.task2_scraper import BodyStream, fetch_threaded
+
+        stream = BodyStream(_StopAfterFirstChunk, chunk_size=1024)
+        results = fetch_threaded([http_server.url("/bytes/50000")] * 3, stream=stream)
+        assert all(r["parsed"] == 1 and r["truncated"] for r in results)
+        assert all(r["bytes_read"] == 1024 for r in results)
+
+    @pytest.mark.parametrize("chunk_size", [None, 2])
+    def test_multiprocess_stream(self, http_server, chunk_size):
+        """Streaming should also work inside worker processes."""
+        import hashlib
+        from src.task2_scraper import BodyStream, fetch_multiprocess
+
+        stream = BodyStream(hashlib.sha256, max_bytes=5000)
+        urls = [http_server.url(f"/bytes/{n}") for n in (10, 4000, 9000)]
+        results = fetch_multiprocess(urls, max_workers=2, stream=stream, chunk_size=chunk_size)
+        assert [r["bytes_read"] for r in results] == [10, 4000, 5000]
+        assert [r["truncated"] for r in results] == [False, False, True]
+
+    def test_body_of_exactly_max_bytes_is_not_truncated(self, http_server):
+        """Only data past max_bytes should mark a body truncated."""
+        import hashlib
+        from src.task2_scraper import BodyStream, fetch_threaded
+
+        stream = BodyStream(hashlib.sha256, max_bytes=100)
+        assert stream.consume([b"x" * 50, b"y" * 50])["truncated"] is False
+        assert stream.consume([b"x" * 50, b"y" * 50, b""])["truncated"] is False
+        assert stream.consume([b"x" * 100, b"z"])["truncated"] is True
+        urls = [http_server.url(f"/bytes/{n}") for n in (100, 101)]
+        results = fetch_threaded(urls, stream=BodyStream(hashlib.sha256, max_bytes=100,
+                                                         chunk_size=50))
+        assert [r["bytes_read"] for r in results] == [100, 100]
+        assert [r["truncated"] for r in results] == [False, True]
+        assert results[0]["parsed"] == hashlib.sha256(self._body(100)).hexdigest()
+
+    def test_stream_and_cache_are_exclusive(self):
+        """Combining a cache with streaming should be rejected."""
+        import hashlib
+        from src.task2_scraper import BodyStream, ResponseCache, fetch_sequential
+
+        with pytest.raises(ValueError):
+            fetch_sequential([], cache=ResponseCache(), stream=BodyStream(hashlib.sha256))
+
+
+class TestRetryPolicy:
+    """Tests for retries, timeouts, deadlines and hedging (RetryPolicy)."""
+
+    def test_retries_retryable_status(self, http_server):
+        """A 503 should be retried until the server recovers."""
+        from src.task2_scraper import RetryPolicy, fetch_sequential
+
+        policy = RetryPolicy(max_attempts=4, backoff=0.01)
+        [result] = fetch_sequential([http_server.url("/flaky/2")], retry=policy)
+        assert result["status_code"] == 200
+        assert result["attempts"] == 3
+
+    def test_gives_up_after_max_attempts(self, http_server):
+        """The last response should be returned once attempts run out."""
+        from src.task2_scraper import RetryPolicy, fetch_threaded
+
+        policy = RetryPolicy(max_attempts=2, backoff=0.01)
+        [result] = fetch_threaded([http_server.url("/status/503")], retry=policy)
+        assert result["status_code"] == 503
+        assert result["attempts"] == 2
+        assert http_server.request_count == 2
+
+    def test_failures_become_error_records(self, http_server):
+        """Timeouts should yield error records instead of raising."""
+        from src.task2_scraper import RetryPolicy, fetch_threaded
+
+        policy = RetryPolicy(max_attempts=2, backoff=0.01, timeout=0.1)
+        urls = [http_server.url("/"), http_server.url("/delay/1000")]
+        ok, failed = fetch_threaded(urls, retry=policy)
+        assert ok["status_code"] == 200 and "error" not in ok
+        assert failed["status_code"] is None
+        assert failed["attempts"] == 2
+        assert "Timeout" in failed["error"]
+
+    def test_async_error_records(self, http_server):
+        """The async fetchers should report failures the same way."""
+        import asyncio
+        from src.task2_scraper import RetryPolicy, fetch_async
+
+        policy = RetryPolicy(max_attempts=2, backoff=0.01, timeout=0.1)
+        urls = [http_server.url("/flaky/1"), http_server.url("/delay/1000")]
+        ok, failed = asyncio.run(fetch_async(urls, retry=policy))
+        assert ok["status_code"] == 200 and ok["attempts"] == 2
+        assert failed["status_code"] is None and failed["error"]
+
+    def test_deadline_bounds_whole_batch(self, http_server):
+        """No attempt should outlive the overall deadline."""
+        import time
+        from src.task2_scraper import RetryPolicy, fetch_sequential
+
+        policy = RetryPolicy(max_attempts=5, timeout=10, deadline=0.5)
+        urls = [http_server.url(f"/delay/300?i={i}") for i in range(5)]
+        start = time.perf_counter()
+        results = fetch_sequential(urls, retry=policy)
+        assert time.perf_counter() - start < 1.5
+        assert results[0]["status_code"] == 200
+        assert results[-1]["status_code"] is None
+        assert results[-1]["error"] == "deadline exceeded"
+
+    @pytest.mark.parametrize("mode", ["threaded", "async"])
+    def test_hedged_request_beats_slow_primary(self, http_server, mode):
+        """A duplicate request should win when the primary stalls."""
+        import asyncio
+        import time
+        from src.task2_scraper import RetryPolicy, fetch_async, fetch_threaded
+
+        policy = RetryPolicy(hedge=True, hedge_delay=0.05)
+        urls = [http_server.url("/slow-first/2000")]
+        start = time.perf_counter()
+        if mode == "async":
+            [result] = asyncio.run(fetch_async(urls, retry=policy))
+        else:
+            [result] = fetch_threaded(urls, retry=policy)
+        assert time.perf_counter() - start < 1.5
+        assert result["status_code"] == 200
+        assert result["attempts"] == 1
+
+    def test_hedge_delay_tracks_latency_percentile(self):
+        """Without a fixed delay, hedging should wait for enough samples."""
+        from src.task2_scraper import RetryPolicy
+
+        run = RetryPolicy(hedge=True, hedge_min_samples=10, hedge_percentile=90).start()
+        for i in range(9):
+            run.record(i / 100)
+        assert run.hedge_after() is None
+        run.record(0.5)
+        assert run.hedge_after() == 0.5
+
+    @pytest.mark.parametrize("chunk_size", [None, 2])
+    def test_multiprocess_with_cache_and_retry(self, http_server, chunk_size):
+        """Retry info should survive the trip back from worker processes."""
+        from src.task2_scraper import ResponseCache, RetryPolicy, fetch_multiprocess
+
+        policy = RetryPolicy(max_attempts=3, backoff=0.01)
+        urls = [http_server.url(f"/flaky/1?c={chunk_size}"), http_server.url("/")]
+        results = fetch_multiprocess(urls, max_workers=2, cache=ResponseCache(),
+                                     chunk_size=chunk_size, retry=policy)
+        assert [r["status_code"] for r in results] == [200, 200]
+        assert results[0]["attempts"] == 2
+        assert results[0]["cache"] == "miss"
+
+    @pytest.mark.parametrize("mode", ["threaded", "async"])
+    def test_limiter_wait_does_not_trigger_hedge(self, http_server, mode):
+        """The hedge clock should start when a request is sent, not while it queues."""
+        import asyncio
+        from src.task2_scraper import HostLimiter, RetryPolicy, fetch_async, fetch_threaded
+
+        limiter = HostLimiter(default={"max_concurrency": 1})
+        policy = RetryPolicy(hedge=True, hedge_delay=0.15)
+        urls = [http_server.url(f"/delay/100?{mode}={i}") for i in range(4)]
+        if mode == "async":
+            results = asyncio.run(fetch_async(urls, limiter=limiter, retry=policy))
+        else:
+            results = fetch_threaded(urls, max_workers=4, limiter=limiter, retry=policy)
+        assert [r["status_code"] for r in results] == [200] * 4
+        assert http_server.request_count == 4
+
+    def test_hedged_duplicate_uses_its_own_session(self, http_server, monkeypatch):
+        """A pooled worker's session should never carry two requests at once."""
+        import requests
+        from src.task2_scraper import RetryPolicy, fetch_threaded
+
+        in_flight = {}
+        overlapped = []
+        lock = threading.Lock()
+        send = requests.Session.send
+
+        def tracking_send(session, request, **kwargs):
+            with lock:
+                in_flight[id(session)] = in_flight.get(id(session), 0) + 1
+                overlapped.append(in_flight[id(session)] > 1)
+            try:
+                return send(session, request, **kwargs)
+            finally:
+                with lock:
+                    in_flight[id(session)] -= 1
+
+        monkeypatch.setattr(requests.Session, "send", tracking_send)
+        policy = RetryPolicy(hedge=True, hedge_delay=0.05)
+        urls = [http_server.url(f"/slow-first/500?i={i}") for i in range(3)]
+        results = fetch_threaded(urls, max_workers=1, pooled=True, retry=policy)
+        assert [r["status_code"] for r in results] == [200] * 3
+        assert len(overlapped) == 6
+        assert not any(overlapped)
+
+
+class TestScraperBenchmark:
+    """Tests for the local MockServer and the scraper benchmark runner."""
+
+    def test_mock_server_payload_and_errors(self):
+        """The server should honour payload size and the injected error rate."""
+        import requests
+        from src.task2_scraper import MockServer
+
+        with MockServer(payload_bytes=300, error_rate=0.5, seed=7) as server:
+            responses = [requests.get(url) for url in server.urls(40)]
+            stats = server.stats()
+        ok = [r for r in responses if r.status_code == 200]
+        assert all(len(r.content) == 300 for r in ok)
+        assert stats["requests"] == 40
+        assert stats["errors"] == 40 - len(ok)
+        assert 5 < stats["errors"] < 35
+
+    def test_mock_server_latency(self):
+        """Responses should take at least the fixed latency."""
+        import requests
+        from src.task2_scraper import MockServer
+
+        with MockServer(latency=0.05) as server:
+            requests.get(server.url())
+            assert server.stats()["p50_latency_ms"] >= 50
+
+    def test_unknown_distribution_rejected(self):
+        """An unknown latency distribution should be rejected."""
+        from src.task2_scraper import MockServer
+
+        with pytest.raises(ValueError):
+            MockServer(latency_distribution="pareto")
+
+    def test_benchmark_result_shape(self):
+        """A benchmark run should report throughput, latency, RSS and sockets."""
+        from src.task2_scraper import MockServer, benchmark_scraper
+
+        with MockServer(latency=0.01) as server:
+            result = benchmark_scraper(server, "threaded_pooled", workers=4, num_urls=20)
+        assert result["urls"] == 20 and result["workers"] == 4
+        assert result["errors"] == 0
+        assert result["requests_per_sec"] > 0
+        assert result["p99_latency_ms"] >= result["p50_latency_ms"] >= 10
+        assert 1 <= result["peak_connections"] <= 4
+
+    @pytest.mark.parametrize("strategy", ["sequential", "threaded", "async", "multiprocess"])
+    def test_latency_is_measured_on_the_client(self, strategy):
+        """Latency percentiles should be client round trips, not handler time."""
+        from src.task2_scraper import MockServer, benchmark_scraper
+
+        with MockServer(latency=0.02) as server:
+            result = benchmark_scraper(server, strategy, workers=2, num_urls=10)
+        assert result["server_p50_latency_ms"] >= 20
+        assert result["p50_latency_ms"] > result["server_p50_latency_ms"]
+        assert result["p99_latency_ms"] >= result["p50_latency_ms"]
+
+    @pytest.mark.parametrize("method", ["spawn", "forkserver"])
+    def test_multiprocess_latency_with_fresh_interpreters(self, method):
+        """Workers that re-import the module should still report client latency."""
+        import multiprocessing
+        from src.task2_scraper import MockServer, benchmark_scraper
+
+        if method not in multiprocessing.get_all_start_methods():
+            pytest.skip(f"{method} is not available here")
+        default = multiprocessing.get_start_method()
+        multiprocessing.set_start_method(method, force=True)
+        try:
+            with MockServer(latency=0.02) as server:
+                result = benchmark_scraper(server, "multiprocess", workers=2, num_urls=6)
+        finally:
+            multiprocessing.set_start_method(default, force=True)
+        assert result["p50_latency_ms"] > result["server_p50_latency_ms"] >= 20
+
+    def test_no_client_samples_reported_as_none(self, monkeypatch):
+        """A strategy whose results carry no timings should not report 0 ms."""
+        from src.task2_scraper import MockServer, SCRAPER_STRATEGIES, benchmark_scraper
+
+        monkeypatch.setitem(SCRAPER_STRATEGIES, "untimed",
+                            lambda urls, workers: [{"url": url, "status_code": 200}
+                                                   for url in urls])
+        with MockServer() as server:
+            result = benchmark_scraper(server, "untimed", num_urls=3)
+        assert result["p50_latency_ms"] is None and result["p99_latency_ms"] is None
+
+    @pytest.mark.parametrize("options", [{}, {"cache": True}, {"chunk_size": 2},
+                                         {"chunk_size": 2, "chunk_mode": "async"}])
+    def test_timed_multiprocess_results(self, http_server, tmp_path, options):
+        """timed=True should time every URL, including cache hits and chunks."""
+        from src.task2_scraper import ResponseCache, fetch_multiprocess
+
+        if options.pop("cache", False):
+            options["cache"] = ResponseCache(directory=str(tmp_path))
+            fetch_multiprocess([http_server.url("/etag/60")], max_workers=1, **options)
+        urls = [http_server.url("/delay/20"), http_server.url("/etag/60")]
+        results = fetch_multiprocess(urls, max_workers=2, timed=True, **options)
+        assert [r["url"] for r in results] == urls
+        assert results[0]["latency_seconds"] >= 0.02
+        assert all(r["latency_seconds"] >= 0 for r in results)
+
+    def test_sweep_runs_fixed_strategies_once(self):
+        """Strategies that ignore worker counts should run only once."""
+        from src.task2_scraper import run_scraper_benchmarks
+
+        results = run_scraper_benchmarks(["sequential", "async_stream"], (2, 8), num_urls=10)
+        assert [(r["strategy"], r["workers"]) for r in results] == [
+            ("sequential", None), ("async_stream", 2), ("async_stream", 8)]
+
+
+class TestDNSCache:
+    """Tests for the shared resolver cache and connection warm-up."""
+
+    @pytest.fixture
+    def lookups(self, monkeypatch):
+        """Count system lookups of 'localhost'."""
+        import socket
+
+        calls = []
+        real_getaddrinfo = socket.getaddrinfo
+
+        def counting_getaddrinfo(host, *args, **kwargs):
+            if host == "localhost":
+                calls.append(host)
+            return real_getaddrinfo(host, *args, **kwargs)
+
+        monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+        return calls
+
+    @staticmethod
+    def _localhost_urls(http_server, count):
+        port = http_server.base_url.rsplit(":", 1)[1]
+        return [f"http://localhost:{port}/item/{i}" for i in range(count)]
+
+    def test_answers_are_cached_until_ttl(self, lookups):
+        """A second lookup should be a hit; an expired one a miss again."""
+        import time
+        from src.task2_scraper import DNSCache
+
+        resolver = DNSCache(ttl=0.05)
+        first = resolver.resolve("localhost", 80)
+        assert resolver.resolve("LOCALHOST", 80) == first
+        assert len(lookups) == 1
+        time.sleep(0.06)
+        resolver.resolve("localhost", 80)
+        assert len(lookups) == 2
+        assert resolver.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+    def test_threaded_fetch_resolves_once(self, http_server, lookups):
+        """All workers should share one lookup per host."""
+        from src.task2_scraper import DNSCache, fetch_threaded
+
+        resolver = DNSCache()
+        urls = self._localhost_urls(http_server, 20)
+        results = fetch_threaded(urls, max_workers=5, resolver=resolver)
+        assert all(r["status_code"] == 200 for r in results)
+        assert len(lookups) == 1
+        assert http_server.connections == 20  # not pooled: one connection per URL
+
+    def test_async_fetch_uses_shared_cache(self, http_server, lookups):
+        """The async fetchers should resolve through the same cache."""
+        import asyncio
+        from src.task2_scraper import DNSCache, fetch_async, fetch_threaded
+
+        resolver = DNSCache()
+        urls = self._localhost_urls(http_server, 10)
+        fetch_threaded(urls[:1], resolver=resolver)
+        results = asyncio.run(fetch_async(urls, resolver=resolver))
+        assert all(r["status_code"] == 200 for r in results)
+        assert len(lookups) == 1
+
+    def test_unresolvable_host_raises_connection_error(self):
+        """Lookup failures should surface as a requests ConnectionError."""
+        import requests
+        from src.task2_scraper import DNSCache, fetch_threaded
+
+        with pytest.raises(requests.ConnectionError):
+            fetch_threaded(["http://does-not-exist.invalid/"], resolver=DNSCache())
+
+    def test_warm_up(self, http_server, lookups):
+        """warm_up should resolve before fetching and pre-open connections."""
+        import asyncio
+        from src.task2_scraper import DNSCache, fetch_async
+
+        resolver = DNSCache()
+        report = resolver.warm_up(["http://does-not-exist.invalid/a"]
+                                  + self._localhost_urls(http_server, 2))
+        assert report["localhost"] is None
+        assert "gaierror" in report["does-not-exist.invalid"]
+
+        urls = self._localhost_urls(http_server, 5)
+        results = asyncio.run(fetch_async(urls, resolver=resolver, warm_up=True))
+        assert all(r["status_code"] == 200 for r in results)
+        assert http_server.request_count == 6  # one HEAD per origin + the GETs
+        assert len(lookups) == 1
+
+
+class TestUrlDeduplication:
+    """Tests for URL normalization and deduplicated fetching."""
+
+    @pytest.mark.parametrize("url,expected", [
+        ("HTTP://Example.COM:80/a?b=2&a=1#frag", "http://example.com/a?a=1&b=2"),
+        ("https://example.com:443", "https://example.com/"),
+        ("http://example.com:8080/%7euser?&x=2&x=1", "http://example.com:8080/%7Euser?x=2&x=1"),
+        ("http://[::1]:80/", "http://[::1]/"),
+        ("http://example.com:bad/", "http://example.com:bad/"),
+    ])
+    def test_normalize_url(self, url, expected):
+        """Trivially equivalent URLs should share one canonical form."""
+        from src.task2_scraper import normalize_url
+
+        assert normalize_url(url) == expected
+
+    def _variants(self, http_server):
+        base = http_server.base_url
+        upper = base.replace("http://", "HTTP://")
+        return [f"{base}/a?x=1&y=2", f"{base}/b", f"{upper}/a?y=2&x=1#top",
+                f"{base}/b#section", f"{base}/a?x=1&y=2"]
+
+    @pytest.mark.parametrize("fetcher", ["sequential", "threaded", "multiprocess", "auto"])
+    def test_fetches_each_canonical_url_once(self, http_server, fetcher):
+        """Duplicates should be fetched once and fanned out in input order."""
+        from src import task2_scraper
+
+        urls = self._variants(http_server)
+        fetch = getattr(task2_scraper, f"fetch_{fetcher}")
+        results = fetch(urls, dedupe=True)
+        assert [r["url"] for r in results] == urls
+        assert all(r["status_code"] == 200 for r in results)
+        assert http_server.request_count == 2
+        results[0]["status_code"] = 0
+        assert results[2]["status_code"] == 200  # fanned-out results are copies
+
+    def test_async_dedupe(self, http_server):
+        """fetch_async should fan results out the same way."""
+        import asyncio
+        from src.task2_scraper import fetch_async
+
+        urls = self._variants(http_server)
+        results = asyncio.run(fetch_async(urls, dedupe=True))
+        assert [r["url"] for r in results] == urls
+        assert http_server.request_count == 2
+
+    def test_stream_dedupe(self, http_server):
+        """The streaming fetcher should answer later duplicates from memory."""
+        import asyncio
+        from src.task2_scraper import fetch_async_stream
+
+        urls = self._variants(http_server) * 3
+
+        async def collect():
+            return [r async for r in fetch_async_stream(iter(urls), concurrency=2, dedupe=True)]
+
+        results = asyncio.run(collect())
+        assert sorted(r["url"] for r in results) == sorted(urls)
+        assert http_server.request_count == 2
+
+
+class TestPipelineBackpressure:
+    """Tests for the task3 pipeline with bounded, backpressured queues."""
+
+    def test_pipeline_processes_every_item(self, num_stages, workers_per_stage, queue_size,
+                                           data_size):
+        """Every fed item should come out transformed by every stage."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: x + 1, "workers": workers_per_stage}
+                             for _ in range(num_stages)], queue_size=queue_size)
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == [i + num_stages for i in range(data_size)]
+
+    def test_feed_blocks_when_saturated(self):
+        """A stalled stage should push back all the way to feed()."""
+        import queue
+        from src.task3_pipeline import Pipeline
+
+        release = threading.Event()
+        pipeline = Pipeline([
+            {"func": lambda x: x, "workers": 1, "queue_size": 2},
+            {"func": lambda x: release.wait() and x, "workers": 1, "queue_size": 1},
+        ])
+        fed = 0
+        with pytest.raises(queue.Full):
+            for i in range(100):
+                pipeline.feed(i, timeout=0.2)
+                fed += 1
+        # 1 held by the stalled worker, 1 queued before it, 1 held by the
+        # upstream worker, 2 queued at the front.
+        assert fed == 5
+        assert pipeline.throttling_stage() == "Stage2"
+        release.set()
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == list(range(fed))
+
+    def test_backpressure_report(self):
+        """Blocked time should be attributed to the queue in front of the slow stage."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: x, "name": "fast", "workers": 2, "queue_size": 4},
+            {"func": lambda x: time.sleep(0.002) or x, "name": "slow", "queue_size": 4},
+        ])
+        for i in range(60):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        fast, slow = pipeline.backpressure()
+        assert (fast["stage"], slow["stage"]) == ("fast", "slow")
+        assert slow["maxsize"] == 4 and slow["blocked_puts"] > 0
+        assert pipeline.throttling_stage() == "slow"
+
+    def test_failing_items_are_recorded(self):
+        """An exception in a stage should drop the item, not the worker."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: 10 // x, "workers": 2}])
+        for x in (1, 0, 2):
+            pipeline.feed(x)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == [5, 10]
+        [(item, exc)] = pipeline.stages[0].errors
+        assert item == 0 and isinstance(exc, ZeroDivisionError)
+
+
+class TestPipelineBatching:
+    """Tests for micro-batching pipeline stages."""
+
+    def test_batched_stage_processes_every_item(self, workers_per_stage, data_size):
+        """Batch mode should hand lists to func and flatten its results."""
+        from src.task3_pipeline import Pipeline
+
+        sizes = []
+
+        def double_all(batch):
+            sizes.append(len(batch))
+            return [x * 2 for x in batch]
+
+        pipeline = Pipeline([
+            {"func": lambda x: x + 1, "workers": workers_per_stage},
+            {"func": double_all, "workers": workers_per_stage, "batch_size": 16},
+        ])
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == [(i + 1) * 2 for i in range(data_size)]
+        assert max(sizes) <= 16 and sum(sizes) == data_size
+
+    def test_max_wait_fills_batches(self):
+        """Waiting for a batch to fill should produce full batches."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        sizes = []
+        pipeline = Pipeline([{"func": lambda b: sizes.append(len(b)) or b,
+                              "batch_size": 5, "max_wait_ms": 500}])
+        for i in range(10):
+            pipeline.feed(i)
+            time.sleep(0.005)
+        pipeline.shutdown()
+        assert sizes == [5, 5]
+        assert pipeline.get_results() == list(range(10))
+
+    def test_batch_results_may_change_length(self):
+        """A batch function may filter items out."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda b: [x for x in b if x % 2], "workers": 3,
+                              "batch_size": 4}])
+        for i in range(20):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == list(range(1, 20, 2))
+
+    def test_bulk_queue_operations(self):
+        """produce_many/consume_many should respect bounds and order."""
+        import queue
+        from src.task3_pipeline import ProducerConsumer
+
+        pc = ProducerConsumer(maxsize=3)
+        with pytest.raises(queue.Full):
+            pc.produce_many([1, 2, 3, 4], timeout=0.05)
+        assert pc.consume_many(10) == [1, 2, 3]
+        with pytest.raises(queue.Empty):
+            pc.consume_many(10, timeout=0.01)
+
+    def test_bulk_and_single_operations_interleave(self):
+        """Blocked bulk producers should be woken by single consumes and vice versa."""
+        import threading
+        from src.task3_pipeline import ProducerConsumer
+
+        pc = ProducerConsumer(maxsize=4)
+        producers = [threading.Thread(target=pc.produce_many,
+                                      args=(list(range(i * 100, i * 100 + 100)),))
+                     for i in range(3)]
+        for producer in producers:
+            producer.start()
+        received = [pc.consume(timeout=5) for _ in range(150)]
+        while len(received) < 300:
+            received += pc.consume_many(7, timeout=5)
+        for producer in producers:
+            producer.join(timeout=5)
+        assert sorted(received) == list(range(300))
+        for i in range(3):
+            mine = [x for x in received if x // 100 == i]
+            assert mine == sorted(mine)
+        assert pc.qsize() == 0 and not pc.full()
+        assert pc.backpressure()["blocked_puts"] >= 1
+
+
+def _square_with_pid(x):
+    import os
+    return x * x, os.getpid()
+
+
+def _reciprocal(x):
+    return 1 / x
+
+
+def _sum_batch(batch):
+    return [sum(batch)]
+
+
+class TestProcessPipelineStages:
+    """Tests for process-pool-backed pipeline stages."""
+
+    def test_process_stage_runs_in_worker_processes(self, data_size):
+        """A process stage should run func outside this process, mixed with threads."""
+        import os
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: x + 1, "workers": 2},
+            {"func": _square_with_pid, "workers": 2, "executor": "process", "chunk_size": 8},
+            {"func": lambda pair: pair, "workers": 2},
+        ])
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        results = pipeline.get_results()
+        assert sorted(value for value, _ in results) == [(i + 1) ** 2 for i in range(data_size)]
+        pids = {pid for _, pid in results}
+        assert os.getpid() not in pids
+        assert 1 <= len(pids) <= 2
+
+    def test_process_stage_records_item_errors(self):
+        """A failing item should not lose the rest of its chunk."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": _reciprocal, "executor": "process", "chunk_size": 4}])
+        for x in (1, 2, 0, 4):
+            pipeline.feed(x)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == [0.25, 0.5, 1.0]
+        [(item, exc)] = pipeline.stages[0].errors
+        assert item == 0 and isinstance(exc, ZeroDivisionError)
+
+    def test_process_stage_with_batches(self):
+        """Batch mode should also work in a process pool."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": _sum_batch, "executor": "process", "workers": 2,
+                              "batch_size": 10, "max_wait_ms": 200}])
+        for i in range(40):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sum(pipeline.get_results()) == sum(range(40))
+
+    def test_process_stage_start_method(self):
+        """The 'mp_context' key should choose how worker processes start."""
+        import os
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: x, "workers": 2},
+            {"func": _square_with_pid, "executor": "process", "mp_context": "spawn"},
+        ])
+        for i in range(10):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        results = pipeline.get_results()
+        assert sorted(value for value, _ in results) == [i * i for i in range(10)]
+        assert os.getpid() not in {pid for _, pid in results}
+        assert pipeline.stages[1]._pool._mp_context.get_start_method() == "spawn"
+
+    def test_unknown_executor_rejected(self):
+        """Only 'thread' and 'process' executors should be accepted."""
+        from src.task3_pipeline import Pipeline
+
+        with pytest.raises(ValueError):
+            Pipeline([{"func": abs, "executor": "gpu"}])
+
+
+def _slow_for_small(x):
+    import time
+    time.sleep(0.02 if x % 4 == 0 else 0)
+    return x
+
+
+class TestOrderedPipeline:
+    """Tests for order-preserving pipelines."""
+
+    def test_results_come_out_in_feed_order(self, workers_per_stage, data_size):
+        """Parallel stages should not reorder results in ordered mode."""
+        import random
+        import time
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: time.sleep(random.random() / 500) or x + 1,
+             "workers": workers_per_stage},
+            {"func": lambda batch: [x * 2 for x in batch], "workers": workers_per_stage,
+             "batch_size": 4},
+        ], ordered=True)
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert pipeline.get_results() == [(i + 1) * 2 for i in range(data_size)]
+
+    def test_dropped_items_do_not_block(self):
+        """A failing item should leave a gap, not stall later results."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: 12 // x, "workers": 3}], ordered=True)
+        for x in (1, 0, 2, 3, 0, 4):
+            pipeline.feed(x)
+        pipeline.shutdown()
+        assert pipeline.get_results() == [12, 6, 4, 3]
+
+    def test_reorder_buffer_high_water_mark(self):
+        """Results finishing early should be held back and counted."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: _slow_for_small(x), "workers": 4,
+                              "name": "work"}], ordered=True, reorder_buffer=3)
+        for i in range(20):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert pipeline.get_results() == list(range(20))
+        assert 1 <= pipeline.reorder_high_water()["work"] <= 3
+
+    def test_ordered_process_stage(self):
+        """Process-pool stages should preserve order too."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": _slow_for_small, "workers": 2, "executor": "process",
+                              "chunk_size": 2}], ordered=True)
+        for i in range(16):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert pipeline.get_results() == list(range(16))
+
+
+class TestPipelineResultStream:
+    """Tests for Pipeline.results() and results_async()."""
+
+    def test_results_stream_before_feeding_ends(self):
+        """Results should be available while items are still being fed."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: x * 10, "workers": 2}], output_queue_size=2)
+        first_seen = threading.Event()
+
+        def producer():
+            pipeline.feed(0)
+            assert first_seen.wait(5)
+            for i in range(1, 50):
+                pipeline.feed(i)
+            pipeline.shutdown()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        results = []
+        for result in pipeline.results(timeout=5):
+            results.append(result)
+            first_seen.set()
+        thread.join()
+        assert sorted(results) == [i * 10 for i in range(50)]
+
+    def test_results_end_after_shutdown(self):
+        """Iterating after shutdown should yield the rest and stop, every time."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": str}], ordered=True)
+        for i in range(5):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        pipeline.shutdown()
+        assert list(pipeline.results()) == ["0", "1", "2", "3", "4"]
+        assert list(pipeline.results()) == []
+        assert pipeline.get_results() == []
+
+    def test_concurrent_consumers_all_terminate(self, data_size):
+        """Each result should go to exactly one of several consumers."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: x, "workers": 3}])
+        collected = [[] for _ in range(3)]
+        consumers = [threading.Thread(target=lambda out=out: out.extend(pipeline.results()))
+                     for out in collected]
+        for consumer in consumers:
+            consumer.start()
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        for consumer in consumers:
+            consumer.join(5)
+        assert not any(consumer.is_alive() for consumer in consumers)
+        assert sorted(sum(collected, [])) == list(range(data_size))
+
+    def test_async_results(self):
+        """results_async() should stream results into an event loop."""
+        import asyncio
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: x + 1, "workers": 2}], ordered=True)
+
+        async def consume():
+            feeder = asyncio.get_running_loop().run_in_executor(
+                None, lambda: [pipeline.feed(i) for i in range(30)] and pipeline.shutdown())
+            results = [r async for r in pipeline.results_async()]
+            await feeder
+            return results
+
+        assert asyncio.run(consume()) == list(range(1, 31))
+
+
+class TestPipelineMetrics:
+    """Tests for Pipeline.stats() and the periodic stats reporter."""
+
+    def test_counts_and_errors_per_stage(self, data_size):
+        """Items in/out and errors should be tallied under each stage name."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: 1 // (x % 10), "workers": 3, "name": "divide"},
+            {"func": lambda batch: [len(batch)], "batch_size": 8, "name": "count"},
+        ])
+        for i in range(data_size):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        stats = pipeline.stats()
+        assert list(stats) == ["divide", "count"]
+        failures = len([i for i in range(data_size) if i % 10 == 0])
+        divide = stats["divide"]
+        assert divide["workers"] == 3
+        assert divide["items_in"] == data_size
+        assert divide["items_out"] == data_size - failures
+        assert divide["errors"] == failures
+        assert divide["service_time"]["count"] == data_size
+        assert sum(w["items_in"] for w in divide["per_worker"].values()) == data_size
+        count = stats["count"]
+        assert count["items_in"] == data_size - failures
+        assert count["items_out"] == len(pipeline.get_results())
+
+    def test_service_time_and_utilization(self):
+        """A slow stage should show busy workers and millisecond service times."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: time.sleep(0.005) or x, "name": "slow"},
+            {"func": lambda x: x, "name": "fast"},
+        ])
+        for i in range(20):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        slow, fast = pipeline.stats()["slow"], pipeline.stats()["fast"]
+        service = slow["service_time"]
+        assert 0.004 <= service["mean"] <= service["max"]
+        assert 0.004 <= service["p50"] <= service["p99"]
+        assert sum(service["histogram"].values()) == 20
+        assert slow["busy_seconds"] >= 0.09
+        assert slow["utilization"] > 0.5
+        assert fast["utilization"] < slow["utilization"]
+        assert fast["idle_seconds"] > fast["busy_seconds"]
+        assert slow["throughput"] > 0
+
+    def test_reporter_samples_queue_depth(self):
+        """The reporter should sample depths and report until after shutdown."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        reports = []
+        pipeline = Pipeline([{"func": lambda x: time.sleep(0.002) or x, "name": "sleepy"}],
+                            stats_interval=0.01, on_stats=reports.append)
+        for i in range(50):
+            pipeline.feed(i)
+        time.sleep(0.05)
+        pipeline.shutdown()
+        report_count = len(reports)
+        assert report_count >= 2
+        assert reports[-1]["sleepy"]["items_out"] == 50
+        history = reports[-1]["sleepy"]["depth_history"]
+        assert max(depth for _, depth in history) > 0
+        assert [t for t, _ in history] == sorted(t for t, _ in history)
+        time.sleep(0.05)
+        assert len(reports) == report_count
+
+    def test_format_stats(self):
+        """format_stats() should render one line per stage."""
+        from src.task3_pipeline import Pipeline, format_stats
+
+        pipeline = Pipeline([{"func": str, "name": "a"}, {"func": len, "name": "b"}])
+        pipeline.feed(123)
+        pipeline.shutdown()
+        lines = format_stats(pipeline.stats()).splitlines()
+        assert [line.split(":")[0] for line in lines] == ["a", "b"]
+        assert "in=1 out=1" in lines[1]
+
+
+class TestPipelineAutoscaling:
+    """Tests for autoscaling stage workers between min_workers and max_workers."""
+
+    def test_slow_stage_grows_and_fast_stage_shrinks(self):
+        """Workers should move to the stage with a backlog."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"func": lambda x: x, "name": "fast", "workers": 4, "min_workers": 1,
+             "max_workers": 4},
+            {"func": lambda x: time.sleep(0.01) or x, "name": "slow", "max_workers": 6},
+        ], autoscale_interval=0.02)
+        for i in range(300):
+            pipeline.feed(i)
+        time.sleep(0.4)
+        stats = pipeline.stats()
+        assert stats["slow"]["workers"] == 6
+        assert stats["fast"]["workers"] == 1
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == list(range(300))
+
+    def test_bounded_queue_does_not_cap_growth(self):
+        """A full bounded input queue should count as a backlog."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([{"func": lambda x: time.sleep(0.05) or x, "name": "slow",
+                              "max_workers": 16}],
+                            queue_size=4, autoscale_interval=0.01)
+        peak = 0
+        for i in range(300):
+            pipeline.feed(i)  # blocks while the queue is full
+            peak = max(peak, pipeline.stages[0].thread_count)
+        pipeline.shutdown()
+        assert peak == 16
+        assert sorted(pipeline.get_results()) == list(range(300))
+
+    def test_max_threads_bounds_all_stages(self):
+        """Autoscaling stages together should stay within max_threads."""
+        import time
+        from src.task3_pipeline import Pipeline
+
+        slow = lambda x: time.sleep(0.005) or x
+        pipeline = Pipeline([
+            {"func": slow, "max_workers": 8},
+            {"func": slow, "workers": 2, "max_workers": 8},
+        ], autoscale_interval=0.01, max_threads=6)
+        peak = 0
+        for i in range(400):
+            pipeline.feed(i)
+            if i % 20 == 0:
+                peak = max(peak, sum(stage.thread_count for stage in pipeline.stages))
+                time.sleep(0.01)
+        pipeline.shutdown()
+        assert 3 <= peak <= 6
+        assert sorted(pipeline.get_results()) == list(range(400))
+
+    def test_ordered_pipeline_keeps_order_while_scaling(self):
+        """Adding and retiring workers should not reorder an ordered pipeline."""
+        import random
+        import time
+        from src.task3_pipeline import Pipeline
+
+        jitter = random.Random(3)
+        pipeline = Pipeline(
+            [{"func": lambda x: time.sleep(jitter.random() / 500) or x, "max_workers": 5}],
+            ordered=True, autoscale_interval=0.01)
+        for i in range(200):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert pipeline.get_results() == list(range(200))
+
+    def test_manual_scaling_limits(self):
+        """retire_worker() should respect min_workers; nothing scales after shutdown."""
+        from src.task3_pipeline import PipelineStage, ProducerConsumer
+
+        stage = PipelineStage(ProducerConsumer(), ProducerConsumer(), lambda x: x,
+                              num_workers=3, min_workers=2, max_workers=4)
+        assert stage.thread_count == 3
+        assert stage.retire_worker()
+        assert not stage.retire_worker()
+        assert stage.thread_count == 2
+        assert stage.add_worker()
+        stage.shutdown(timeout=5)
+        assert not stage.add_worker()
+        assert not any(worker.is_alive() for worker in stage._workers)
+
+    def test_invalid_autoscaling_configs(self):
+        """Bad ranges and process-pool stages should be rejected."""
+        from src.task3_pipeline import PipelineStage, ProducerConsumer
+
+        with pytest.raises(ValueError):
+            PipelineStage(ProducerConsumer(), ProducerConsumer(), abs,
+                          min_workers=3, max_workers=2)
+        with pytest.raises(ValueError):
+            PipelineStage(ProducerConsumer(), ProducerConsumer(), abs,
+                          executor="process", max_workers=2)
+
+
+class TestPipelineDAG:
+    """Tests for fan-out / fan-in pipeline topologies."""
+
+    def test_zip_join_runs_branches_concurrently(self, data_size):
+        """Both branches should work on an item at once, then be zipped back."""
+        from src.task3_pipeline import Pipeline
+
+        # Each branch waits for the other one, so serial branches would fail.
+        barrier = threading.Barrier(2, timeout=5)
+        pipeline = Pipeline([
+            {"name": "parse", "func": int},
+            {"name": "double", "func": lambda x: barrier.wait() and 0 or x * 2,
+             "inputs": ["parse"]},
+            {"name": "negate", "func": lambda x: barrier.wait() and 0 or -x,
+             "inputs": ["parse"]},
+            {"name": "combine", "func": lambda pair: pair, "inputs": ["double", "negate"],
+             "join": "zip"},
+        ], queue_size=4)
+        for i in range(data_size):
+            pipeline.feed(str(i))
+        pipeline.shutdown()
+        assert not any(stage.errors for stage in pipeline.stages)
+        assert sorted(pipeline.get_results()) == sorted((i * 2, -i) for i in range(data_size))
+
+    def test_broadcast_and_merge(self):
+        """A merge join should receive every result of every branch."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"name": "source", "func": lambda x: x},
+            {"name": "a", "func": lambda x: ("a", x), "inputs": ["source"], "workers": 2},
+            {"name": "b", "func": lambda x: ("b", x), "inputs": ["source"]},
+            {"name": "sink", "func": lambda pair: pair, "inputs": ["a", "b"]},
+        ])
+        for i in range(20):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results()) == sorted(
+            [("a", i) for i in range(20)] + [("b", i) for i in range(20)])
+        assert pipeline.stats()["sink"]["items_in"] == 40
+
+    def test_partition_routes_keys_consistently(self):
+        """Equal keys should always reach the same branch; sinks share the output."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"name": "split", "func": lambda x: x, "route": "partition",
+             "key": lambda word: word[0]},
+            {"name": "left", "func": lambda word: ("left", word), "inputs": "split"},
+            {"name": "right", "func": lambda word: ("right", word), "inputs": "split"},
+        ])
+        words = [f"{letter}{i}" for letter in "abcdef" for i in range(10)]
+        for word in words:
+            pipeline.feed(word)
+        pipeline.shutdown()
+        results = pipeline.get_results()
+        assert sorted(word for _, word in results) == sorted(words)
+        branches = {}
+        for branch, word in results:
+            assert branches.setdefault(word[0], branch) == branch
+
+    def test_partition_key_failures_are_recorded(self):
+        """Results that can't be partitioned should go to errors, not kill the worker."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"name": "enrich", "func": lambda x: {"id": x}, "route": "partition"},
+            {"name": "a", "func": lambda row: row, "inputs": "enrich"},
+            {"name": "b", "func": lambda row: row, "inputs": "enrich"},
+        ])
+        for i in range(5):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        errors = pipeline.stages[0].errors
+        assert [row for row, _ in errors] == [{"id": i} for i in range(5)]
+        assert all(isinstance(exc, TypeError) for _, exc in errors)
+
+        keyed = Pipeline([
+            {"name": "enrich", "func": lambda x: {"id": x}, "route": "partition",
+             "key": lambda row: 1 // (row["id"] % 2)},
+            {"name": "a", "func": lambda row: row["id"], "inputs": "enrich"},
+            {"name": "b", "func": lambda row: row["id"], "inputs": "enrich"},
+        ])
+        for i in range(6):
+            keyed.feed(i)
+        keyed.shutdown()
+        assert sorted(keyed.get_results()) == [1, 3, 5]
+        assert sorted(row["id"] for row, _ in keyed.stages[0].errors) == [0, 2, 4]
+
+    def test_zip_join_reports_unmatched_results(self):
+        """Items dropped by one branch should end up in the join stage's errors."""
+        from src.task3_pipeline import Pipeline
+
+        pipeline = Pipeline([
+            {"name": "inverse", "func": lambda x: 1 / x, "inputs": []},
+            {"name": "same", "func": lambda x: x, "inputs": []},
+            {"name": "pair", "func": lambda pair: pair, "inputs": ["inverse", "same"],
+             "join": "zip"},
+        ])
+        for i in range(5):
+            pipeline.feed(i)
+        pipeline.shutdown()
+        assert sorted(pipeline.get_results(), key=lambda pair: pair[1]) == [
+            (1 / i, i) for i in range(1, 5)]
+        errors = pipeline.stages[2].errors
+        assert len(errors) == 1
+        assert errors[0][0] == [[], [0]]
+        assert isinstance(errors[0][1], LookupError)
+
+    def test_invalid_topologies(self):
+        """Unknown inputs, bad modes and ordered DAGs should be rejected."""
+        from src.task3_pipeline import Pipeline
+
+        with pytest.raises(ValueError):
+            Pipeline([{"name": "a", "func": abs}, {"func": abs, "inputs": ["missing"]}])
+        with pytest.raises(ValueError):
+            Pipeline([{"name": "a", "func": abs, "inputs": ["b"]}, {"name": "b", "func": abs}])
+        with pytest.raises(ValueError):
+            Pipeline([{"name": "a", "func": abs}, {"func": abs, "inputs": ["a"], "join": "zip"}])
+        with pytest.raises(ValueError):
+            Pipeline([{"name": "a", "func": abs},
+                      {"func": abs, "inputs": ["a"]}, {"func": abs, "inputs": ["a"]}],
+                     ordered=True)